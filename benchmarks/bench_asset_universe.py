@@ -0,0 +1,83 @@
+import os
+import random
+import sys
+import timeit
+import uuid
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.asset_universe import AssetUniverse
+
+EXCHANGES = ("NASDAQ", "NYSE", "ARCA", "AMEX", "BATS", "OTC")
+
+
+def synthetic_assets(count: int) -> list[dict[str, any]]:
+    """
+    Returns:
+        list[dict[str, any]]: `count` asset records shaped like the `get_assets` response.
+    """
+    rng = random.Random(7)
+    return [
+        {
+            "id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "class": "us_equity",
+            "exchange": rng.choice(EXCHANGES),
+            "symbol": f"S{i:05d}",
+            "name": f"Synthetic Asset {i} Inc. Common Stock",
+            "status": "active" if rng.random() < 0.9 else "inactive",
+            "tradable": rng.random() < 0.8,
+            "marginable": rng.random() < 0.7,
+            "shortable": rng.random() < 0.6,
+            "easy_to_borrow": rng.random() < 0.5,
+            "fractionable": rng.random() < 0.4,
+            "maintenance_margin_requirement": 30,
+            "attributes": [],
+        }
+        for i in range(count)
+    ]
+
+
+def _report(label: str, seconds: float, runs: int) -> None:
+    print(f"{label:<44} {seconds / runs * 1e6:12.2f} us")
+
+
+def main(count: int = 30000) -> None:
+    assets = synthetic_assets(count)
+    symbols = [asset["symbol"] for asset in random.Random(1).sample(assets, 100)]
+
+    _report("AssetUniverse build", timeit.timeit(lambda: AssetUniverse(assets), number=5), 5)
+    universe = AssetUniverse(assets)
+
+    def naive_lookup() -> None:
+        for symbol in symbols:
+            next(asset for asset in assets if asset["symbol"] == symbol)["tradable"]
+
+    def indexed_lookup() -> None:
+        for symbol in symbols:
+            universe.is_tradable(symbol)
+
+    _report("100 x tradable check, list scan", timeit.timeit(naive_lookup, number=3), 3)
+    _report("100 x tradable check, AssetUniverse", timeit.timeit(indexed_lookup, number=1000), 1000)
+
+    def naive_filter() -> list[str]:
+        return [
+            asset["symbol"]
+            for asset in assets
+            if asset["tradable"] and asset["fractionable"] and asset["shortable"] and asset["exchange"] == "NASDAQ"
+        ]
+
+    def indexed_filter() -> list[str]:
+        return universe.select(exchange="NASDAQ", tradable=True, fractionable=True, shortable=True)
+
+    assert naive_filter() == indexed_filter()
+    _report("filter tradable+fractionable+shortable, list", timeit.timeit(naive_filter, number=50), 50)
+    _report("filter tradable+fractionable+shortable, bitmap", timeit.timeit(indexed_filter, number=50), 50)
+    _report(
+        "count tradable+shortable, bitmap",
+        timeit.timeit(lambda: universe.count(tradable=True, shortable=True), number=1000),
+        1000,
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
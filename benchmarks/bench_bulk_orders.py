@@ -0,0 +1,39 @@
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.stub_server import StubServer
+from core import http_client, rate_limiter, registry
+from endpoints import orders
+from services.bulk_orders import submit_orders
+
+
+def main(order_count: int = 400, latency: float = 0.02) -> None:
+    basket = [
+        {"symbol": f"SYM{i}", "qty": "1", "side": "buy", "type": "market", "time_in_force": "day"}
+        for i in range(order_count)
+    ]
+    rate_limiter.rate_limit_enabled = False  # the stub server has no rate limit to respect
+    with StubServer(latency=latency) as server:
+        registry.set_base_url(True, server.base_url)
+
+        start = time.perf_counter()
+        for order_data in basket[:50]:
+            orders.create_order(paper_trading=True, order_data=order_data)
+        sequential_rate = 50 / (time.perf_counter() - start)
+        print(f"{'sequential create_order':<32} {sequential_rate:8.1f} orders/s")
+
+        for concurrency in (10, 20):
+            start = time.perf_counter()
+            results = submit_orders(paper_trading=True, orders=basket, concurrency=concurrency)
+            elapsed = time.perf_counter() - start
+            failed = sum(not result.ok for result in results)
+            label = f"submit_orders(concurrency={concurrency})"
+            print(f"{label:<32} {order_count / elapsed:8.1f} orders/s  failed={failed}")
+        http_client.close_client()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
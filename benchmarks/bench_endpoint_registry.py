@@ -0,0 +1,178 @@
+import os
+import sys
+import timeit
+from dataclasses import dataclass
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import paper_trading_base_url
+from core import http_client, registry
+from core.http_client import ApiRequest
+from endpoints.option_contracts import get_option_contracts
+from endpoints.orders import get_all_orders, get_order_by_id
+
+
+@dataclass(frozen=True, slots=True)
+class _FrozenApiRequest:
+    """
+    `ApiRequest` as it was before the registry: frozen, so every field went through `object.__setattr__`.
+    """
+
+    endpoint: str
+    method: str
+    url: str
+    params: dict = None
+    json: dict = None
+    replay_probe: "ApiRequest" = None
+    typed: bool = False
+    as_models: bool = False
+
+
+# The hand-written builders the registry replaced, kept verbatim (paper branch only, building the frozen request they
+# built then) as the baseline.
+def _get_all_orders_request(
+    paper_trading: bool,
+    status: str = None,
+    limit: int = None,
+    nested: bool = None,
+    after: str = None,
+    until: str = None,
+    direction: str = None,
+    symbols: str = None,
+    typed: bool = False,
+    as_models: bool = False,
+) -> _FrozenApiRequest:
+    if paper_trading:
+        url = f"{paper_trading_base_url}/orders"
+    else:
+        pass
+
+    params = {}
+    if status:
+        params["status"] = status
+    if limit:
+        params["limit"] = limit
+    if nested is not None:
+        params["nested"] = nested
+    if after:
+        params["after"] = after
+    if until:
+        params["until"] = until
+    if direction:
+        params["direction"] = direction
+    if symbols:
+        params["symbols"] = symbols
+
+    return _FrozenApiRequest(
+        endpoint="get_all_orders", method="GET", url=url, params=params, typed=typed, as_models=as_models
+    )
+
+
+def _get_option_contracts_request(
+    paper_trading: bool,
+    underlying_symbols: str = None,
+    root_symbol: str = None,
+    strike_price: float = None,
+    expiration_date: str = None,
+    expiration_date_gte: str = None,
+    expiration_date_lte: str = None,
+    type: str = None,
+    style: str = None,
+    limit: int = None,
+    sort: str = None,
+    page_token: str = None,
+    typed: bool = False,
+) -> _FrozenApiRequest:
+    if paper_trading:
+        url = f"{paper_trading_base_url}/options/contracts"
+    else:
+        pass
+
+    params = {}
+    if underlying_symbols:
+        params["underlying_symbols"] = underlying_symbols
+    if root_symbol:
+        params["root_symbol"] = root_symbol
+    if strike_price:
+        params["strike_price"] = strike_price
+    if expiration_date:
+        params["expiration_date"] = expiration_date
+    if expiration_date_gte:
+        params["expiration_date.gte"] = expiration_date_gte
+    if expiration_date_lte:
+        params["expiration_date.lte"] = expiration_date_lte
+    if type:
+        params["type"] = type
+    if style:
+        params["style"] = style
+    if limit:
+        params["limit"] = limit
+    if sort:
+        params["sort"] = sort
+    if page_token:
+        params["page_token"] = page_token
+
+    return _FrozenApiRequest(endpoint="get_option_contracts", method="GET", url=url, params=params, typed=typed)
+
+
+def _get_order_by_id_request(paper_trading: bool, order_id: str, as_models: bool = False) -> _FrozenApiRequest:
+    if paper_trading:
+        url = f"{paper_trading_base_url}/orders/{order_id}"
+    else:
+        pass
+
+    return _FrozenApiRequest(endpoint="get_order_by_id", method="GET", url=url, as_models=as_models)
+
+
+class _PassThrough:
+    def before(self, paper_trading: bool, api_request: ApiRequest) -> any:
+        return None
+
+    def after(self, paper_trading: bool, api_request: ApiRequest, response_json: any) -> None:
+        pass
+
+
+def _ns_per_call(call, number: int) -> float:
+    return min(timeit.repeat(call, number=number, repeat=5)) / number * 1e9
+
+
+def main(number: int = 200000) -> None:
+    cases = {
+        "get_order_by_id": (
+            lambda: _get_order_by_id_request(True, "bench"),
+            lambda: get_order_by_id.build(True, "bench"),
+        ),
+        "get_all_orders (4 filters)": (
+            lambda: _get_all_orders_request(True, "all", 500, False, direction="asc"),
+            lambda: get_all_orders.build(True, "all", 500, False, direction="asc"),
+        ),
+        "get_option_contracts (5 filters)": (
+            lambda: _get_option_contracts_request(
+                True, "AAPL", expiration_date_gte="2025-01-01", type="call", limit=100, page_token="x"
+            ),
+            lambda: get_option_contracts.build(
+                True, "AAPL", expiration_date_gte="2025-01-01", type="call", limit=100, page_token="x"
+            ),
+        ),
+    }
+    print(f"{'request build':<36} {'hand-written':>14} {'registry':>14}")
+    for label, (hand_written, generated) in cases.items():
+        print(f"{label:<36} {_ns_per_call(hand_written, number):11.0f} ns {_ns_per_call(generated, number):11.0f} ns")
+
+    # Dispatch cost of the generated call itself, with the HTTP layer swapped for a constant.
+    execute = http_client.execute
+    http_client.execute = lambda api_request: {}
+    hook = _PassThrough()
+    try:
+        per_call = _ns_per_call(lambda: get_order_by_id(True, "bench"), number)
+        print(f"{'get_order_by_id call, no hooks':<36} {per_call:25.0f} ns")
+        registry.add_hook(hook, ("get_order_by_id",))
+        per_call = _ns_per_call(lambda: get_order_by_id(True, "bench"), number)
+        print(f"{'get_order_by_id call, one hook':<36} {per_call:25.0f} ns")
+    finally:
+        registry.remove_hook(hook)
+        http_client.execute = execute
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
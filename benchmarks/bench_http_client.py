@@ -0,0 +1,46 @@
+import os
+import statistics
+import sys
+import time
+
+import httpx
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.stub_server import StubServer
+from core import http_client, rate_limiter, registry
+from endpoints import orders
+
+
+def _per_call_ms(call, iterations: int) -> list[float]:
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _report(label: str, timings: list[float]) -> None:
+    timings = sorted(timings)
+    p50 = statistics.median(timings)
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    print(f"{label:<32} p50={p50:7.3f} ms  p99={p99:7.3f} ms  mean={statistics.fmean(timings):7.3f} ms")
+
+
+def main(iterations: int = 500) -> None:
+    rate_limiter.rate_limit_enabled = False  # the stub server has no rate limit to respect
+    with StubServer() as server:
+        registry.set_base_url(True, server.base_url)
+        url = f"{server.base_url}/orders/bench"
+
+        before = _per_call_ms(lambda: httpx.request(method="GET", url=url).json(), iterations)
+        after = _per_call_ms(lambda: orders.get_order_by_id(paper_trading=True, order_id="bench"), iterations)
+
+        _report("httpx.request (new client)", before)
+        _report("get_order_by_id (pooled)", after)
+        http_client.close_client()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
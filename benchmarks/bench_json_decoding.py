@@ -0,0 +1,134 @@
+import json
+import os
+import random
+import sys
+import time
+import uuid
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.bench_asset_universe import synthetic_assets
+from benchmarks.bench_snapshots import synthetic_option_contracts
+from core import codec
+
+
+def synthetic_orders(count: int) -> list[dict[str, any]]:
+    """
+    Returns:
+        list[dict[str, any]]: `count` order records shaped like the `get_all_orders` response.
+    """
+    rng = random.Random(3)
+    orders = []
+    for i in range(count):
+        qty = rng.randint(1, 500)
+        filled = rng.random() < 0.6
+        timestamp = f"2025-03-{rng.randint(1, 28):02d}T14:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}.123456Z"
+        orders.append(
+            {
+                "id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "client_order_id": uuid.UUID(int=rng.getrandbits(128)).hex,
+                "created_at": timestamp,
+                "updated_at": timestamp,
+                "submitted_at": timestamp,
+                "filled_at": timestamp if filled else None,
+                "expired_at": None,
+                "canceled_at": None,
+                "failed_at": None,
+                "replaced_at": None,
+                "replaced_by": None,
+                "replaces": None,
+                "asset_id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "symbol": f"S{rng.randint(0, 2000):05d}",
+                "asset_class": "us_equity",
+                "notional": None,
+                "qty": str(qty),
+                "filled_qty": str(qty if filled else 0),
+                "filled_avg_price": f"{rng.uniform(5, 500):.2f}" if filled else None,
+                "order_class": "",
+                "order_type": "limit",
+                "type": "limit",
+                "side": rng.choice(("buy", "sell")),
+                "position_intent": "buy_to_open",
+                "time_in_force": "day",
+                "limit_price": f"{rng.uniform(5, 500):.2f}",
+                "stop_price": None,
+                "status": "filled" if filled else "new",
+                "extended_hours": False,
+                "legs": None,
+                "trail_percent": None,
+                "trail_price": None,
+                "hwm": None,
+                "subtag": None,
+                "source": None,
+                "expires_at": None,
+            }
+        )
+    return orders
+
+
+def synthetic_activities(count: int) -> list[dict[str, any]]:
+    """
+    Returns:
+        list[dict[str, any]]: `count` FILL activity records shaped like the `get_account_activities` response.
+    """
+    rng = random.Random(5)
+    activities = []
+    for i in range(count):
+        qty = rng.randint(1, 500)
+        activities.append(
+            {
+                "id": f"20250301{i:09d}::{uuid.UUID(int=rng.getrandbits(128))}",
+                "activity_type": "FILL",
+                "transaction_time": f"2025-03-{rng.randint(1, 28):02d}T14:{rng.randint(0, 59):02d}:00.123456Z",
+                "type": "fill",
+                "price": f"{rng.uniform(5, 500):.2f}",
+                "qty": str(qty),
+                "side": rng.choice(("buy", "sell")),
+                "symbol": f"S{rng.randint(0, 2000):05d}",
+                "leaves_qty": "0",
+                "order_id": str(uuid.UUID(int=rng.getrandbits(128))),
+                "cum_qty": str(qty),
+                "order_status": "filled",
+            }
+        )
+    return activities
+
+
+def _best_ms(call, runs: int = 5) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(scale: int = 1) -> None:
+    payloads = {
+        "get_assets": json.dumps(synthetic_assets(30000 * scale)).encode(),
+        "get_all_orders": json.dumps(synthetic_orders(500 * scale)).encode(),
+        "get_option_contracts": json.dumps(
+            {"option_contracts": synthetic_option_contracts(10000 * scale), "next_page_token": None}
+        ).encode(),
+        "get_account_activities": json.dumps(synthetic_activities(10000 * scale)).encode(),
+    }
+    backends = [name for name in codec.BACKENDS if codec.backend_loads(name) is not None]
+    try:
+        from core import structs
+    except ImportError:
+        structs = None
+
+    for endpoint, payload in payloads.items():
+        print(f"{endpoint}: {len(payload) / 1e6:.2f} MB")
+        for name in backends:
+            loads = codec.backend_loads(name)
+            print(f"{'  ' + name + ' -> dicts':<40} {_best_ms(lambda: loads(payload)):8.2f} ms")
+        if structs is not None:
+            decoder = structs.decoder_for(endpoint)
+            print(f"{'  msgspec -> typed models':<40} {_best_ms(lambda: decoder.decode(payload)):8.2f} ms")
+        else:
+            print("  (install msgspec to benchmark the typed models)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
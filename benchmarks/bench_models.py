@@ -0,0 +1,98 @@
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.bench_json_decoding import synthetic_activities, synthetic_orders
+from core import models
+
+
+def synthetic_positions(count: int) -> list[dict[str, any]]:
+    """
+    Returns:
+        list[dict[str, any]]: `count` position records shaped like the `get_all_open_positions` response.
+    """
+    rng = random.Random(9)
+    positions = []
+    for i in range(count):
+        qty = rng.randint(1, 1000)
+        entry = rng.uniform(5, 500)
+        price = entry * rng.uniform(0.8, 1.2)
+        positions.append(
+            {
+                "asset_id": f"{i:08x}-0000-4000-8000-000000000000",
+                "symbol": f"S{i:05d}",
+                "exchange": "NASDAQ",
+                "asset_class": "us_equity",
+                "asset_marginable": True,
+                "qty": str(qty),
+                "qty_available": str(qty),
+                "avg_entry_price": f"{entry:.4f}",
+                "side": "long",
+                "market_value": f"{qty * price:.2f}",
+                "cost_basis": f"{qty * entry:.2f}",
+                "unrealized_pl": f"{qty * (price - entry):.2f}",
+                "unrealized_plpc": f"{price / entry - 1:.6f}",
+                "unrealized_intraday_pl": "0",
+                "unrealized_intraday_plpc": "0",
+                "current_price": f"{price:.2f}",
+                "lastday_price": f"{price:.2f}",
+                "change_today": "0",
+            }
+        )
+    return positions
+
+
+def _best_ms(call, runs: int = 5) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _bytes_per_record(build, count: int) -> float:
+    tracemalloc.start()
+    records = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return size / count
+
+
+def main(count: int = 20000) -> None:
+    datasets = {
+        "orders": (synthetic_orders(count), models.Order, "filled_qty"),
+        "positions": (synthetic_positions(count), models.Position, "market_value"),
+        "activities": (synthetic_activities(count), models.Activity, "qty"),
+    }
+    for label, (records, model, numeric_field) in datasets.items():
+        payload = json.dumps(records)
+        print(f"{label}: {count} records")
+        print(f"{'  memory, dicts':<44} {_bytes_per_record(lambda: json.loads(payload), count):10.0f} B/record")
+        print(
+            f"{'  memory, models':<44} "
+            f"{_bytes_per_record(lambda: list(map(model.from_dict, json.loads(payload))), count):10.0f} B/record"
+        )
+        dicts = json.loads(payload)
+        records = list(map(model.from_dict, dicts))
+        print(f"{'  parse, JSON -> dicts':<44} {_best_ms(lambda: json.loads(payload)):10.2f} ms")
+        print(f"{'  parse, dicts -> models':<44} {_best_ms(lambda: list(map(model.from_dict, dicts))):10.2f} ms")
+        print(
+            f"{'  sum ' + numeric_field + ', dicts (re-parses each time)':<44} "
+            f"{_best_ms(lambda: sum(Decimal(d[numeric_field]) for d in dicts)):10.2f} ms"
+        )
+        print(
+            f"{'  sum ' + numeric_field + ', models':<44} "
+            f"{_best_ms(lambda: sum(getattr(r, numeric_field) for r in records)):10.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,92 @@
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.bench_asset_universe import synthetic_assets
+from services.asset_universe import AssetUniverse
+from services.snapshots import load_asset_universe, load_option_contracts, save_asset_universe, save_option_contracts
+
+
+def synthetic_option_contracts(count: int) -> list[dict[str, any]]:
+    """
+    Returns:
+        list[dict[str, any]]: `count` option contract records shaped like the `get_option_contracts` response.
+    """
+    rng = random.Random(11)
+    contracts = []
+    for i in range(count):
+        underlying = f"U{i % 300:03d}"
+        expiration = f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        strike = round(rng.uniform(5, 500), 1)
+        option_type = rng.choice(("call", "put"))
+        symbol = f"{underlying}{expiration[2:].replace('-', '')}{option_type[0].upper()}{int(strike * 1000):08d}"
+        contracts.append(
+            {
+                "id": f"{i:08x}-0000-4000-8000-000000000000",
+                "symbol": symbol,
+                "name": f"{underlying} {expiration} {option_type} {strike}",
+                "status": "active",
+                "tradable": True,
+                "expiration_date": expiration,
+                "root_symbol": underlying,
+                "underlying_symbol": underlying,
+                "underlying_asset_id": f"{i % 300:08x}-0000-4000-8000-000000000000",
+                "type": option_type,
+                "style": "american",
+                "strike_price": str(strike),
+                "multiplier": "100",
+                "size": "100",
+                "open_interest": str(rng.randint(0, 5000)),
+                "close_price": str(round(rng.uniform(0.01, 50), 2)),
+            }
+        )
+    return contracts
+
+
+def _best_ms(call, runs: int = 5) -> float:
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(asset_count: int = 30000, contract_count: int = 100000) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        assets = synthetic_assets(asset_count)
+        payload = json.dumps(assets)
+        assets_path = os.path.join(directory, "assets.snapshot")
+        save_asset_universe(AssetUniverse(assets), assets_path)
+        print(
+            f"assets: {asset_count} rows, JSON {len(payload) / 1e6:.1f} MB, snapshot {os.path.getsize(assets_path) / 1e6:.1f} MB"
+        )
+        print(
+            f"{'  JSON decode + AssetUniverse build':<40} {_best_ms(lambda: AssetUniverse(json.loads(payload))):8.2f} ms"
+        )
+        print(f"{'  snapshot load':<40} {_best_ms(lambda: load_asset_universe(assets_path)):8.2f} ms")
+
+        contracts = synthetic_option_contracts(contract_count)
+        payload = json.dumps({"option_contracts": contracts, "next_page_token": None})
+        contracts_path = os.path.join(directory, "contracts.snapshot")
+        save_option_contracts(contracts, contracts_path)
+
+        def load_contract_columns() -> None:
+            with load_option_contracts(contracts_path) as snapshot:
+                snapshot.column("symbol")
+                snapshot.column("strike_price")
+
+        print(
+            f"option contracts: {contract_count} rows, JSON {len(payload) / 1e6:.1f} MB, snapshot {os.path.getsize(contracts_path) / 1e6:.1f} MB"
+        )
+        print(f"{'  JSON decode':<40} {_best_ms(lambda: json.loads(payload)):8.2f} ms")
+        print(f"{'  snapshot open + symbol/strike columns':<40} {_best_ms(load_contract_columns):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,51 @@
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.stub_stream import StubTradeStream
+from services.trade_stream import TradeUpdateStream
+
+
+async def _measure(events: int) -> list[float]:
+    latencies = []
+    sent_at: dict[str, float] = {}
+    received = asyncio.Event()
+    async with StubTradeStream() as stub:
+        stream = TradeUpdateStream(paper_trading=True, url=stub.url, backfill=False)
+
+        def on_update(update) -> None:
+            latencies.append(time.perf_counter() - sent_at[update.order.id])
+            if len(latencies) == events:
+                received.set()
+
+        stream.on_update(on_update)
+        task = asyncio.create_task(stream.run())
+        await stub.wait_for_clients()
+        for i in range(events):
+            order = {"id": f"order-{i}", "client_order_id": f"client-{i}", "symbol": "AAPL", "status": "filled"}
+            sent_at[order["id"]] = time.perf_counter()
+            await stub.push("fill", order, price="100.0", qty="1", position_qty="1")
+            await asyncio.sleep(0.001)
+        await asyncio.wait_for(received.wait(), 10)
+        await stream.close()
+        task.cancel()
+    return latencies
+
+
+def main(events: int = 1000, poll_interval: float = 1.0) -> None:
+    latencies = sorted(asyncio.run(_measure(events)))
+    print(f"stream delivery, {events} fills:")
+    print(f"{'  p50':<10} {statistics.median(latencies) * 1000:8.3f} ms")
+    print(f"{'  p99':<10} {latencies[int(len(latencies) * 0.99) - 1] * 1000:8.3f} ms")
+    print(
+        f"polling get_order_by_id every {poll_interval:g}s: ~{poll_interval / 2 * 1000:.0f} ms average detection delay "
+        f"plus one round trip, and {60 / poll_interval:.0f} requests/min per watched order"
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
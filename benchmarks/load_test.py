@@ -0,0 +1,195 @@
+"""
+Open-loop load test of the endpoint functions against `MockAlpacaServer`.
+
+The mock runs in a child process, so its HTTP threads do not compete with the client's event loop for the GIL. It is
+still a pure-Python ThreadingHTTPServer, and on a single core both processes share one CPU: past roughly 150 requests
+per second in total (30 per endpoint with the five default endpoints) the run measures the mock and the machine rather
+than the endpoint path, and calls start failing with timeouts. The default `--rps` of 20 per endpoint stays clear of
+that; raise it only on a machine with cores to spare, and read errors and long tails at high rates as the harness's
+limit.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+import uuid
+from typing import Awaitable, Callable
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.mock_alpaca import MockAlpacaServer, restore_base_urls, use_base_url
+from core import cache, http_client, rate_limiter, single_flight
+from core.errors import error_from_body
+from endpoints import (
+    account_activities,
+    account_configurations,
+    accounts,
+    assets,
+    calendar,
+    clock,
+    crypto_funding,
+    orders,
+    portfolio_history,
+    positions,
+    watchlists,
+)
+
+# Endpoint name -> coroutine factory with representative arguments; `ids` holds ids that exist on the mock server.
+SCENARIOS: dict[str, Callable[[dict[str, str]], Awaitable]] = {
+    "get_the_account": lambda ids: accounts.get_the_account_async(True),
+    "get_account_configurations": lambda ids: account_configurations.get_account_configurations_async(True),
+    "get_account_activities": lambda ids: account_activities.get_account_activities_async(True),
+    "get_account_portfolio_history": lambda ids: portfolio_history.get_account_portfolio_history_async(True),
+    "get_assets": lambda ids: assets.get_assets_async(True),
+    "get_asset_by_id_or_symbol": lambda ids: assets.get_asset_by_id_or_symbol_async(True, ids["asset_symbol"]),
+    "get_market_calendar": lambda ids: calendar.get_market_calendar_async(True),
+    "get_market_clock": lambda ids: clock.get_market_clock_async(True),
+    "get_all_orders": lambda ids: orders.get_all_orders_async(True, status="all", limit=500),
+    "get_order_by_id": lambda ids: orders.get_order_by_id_async(True, ids["order_id"]),
+    "create_order": lambda ids: orders.create_order_async(
+        True,
+        {
+            "symbol": "AAPL",
+            "qty": "1",
+            "side": "buy",
+            "type": "limit",
+            "limit_price": "100",
+            "time_in_force": "day",
+            "client_order_id": uuid.uuid4().hex,
+        },
+    ),
+    "get_all_open_positions": lambda ids: positions.get_all_open_positions_async(True),
+    "get_open_position": lambda ids: positions.get_open_position_async(True, ids["position_symbol"]),
+    "get_all_watchlists": lambda ids: watchlists.get_all_watchlists_async(True),
+    "get_crypto_funding_transfers": lambda ids: crypto_funding.get_crypto_funding_transfers_async(True),
+    "get_whitelisted_addresses": lambda ids: crypto_funding.get_whitelisted_addresses_async(True),
+}
+DEFAULT_SCENARIOS = ("get_the_account", "get_all_orders", "get_order_by_id", "create_order", "get_all_open_positions")
+
+
+class EndpointReport:
+    __slots__ = ("latencies", "errors", "first_start", "last_end")
+
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self.errors = 0
+        self.first_start: float = None
+        self.last_end: float = None
+
+    def add(self, start: float, end: float, ok: bool) -> None:
+        self.latencies.append(end - start)
+        self.errors += not ok
+        self.first_start = start if self.first_start is None else min(self.first_start, start)
+        self.last_end = end if self.last_end is None else max(self.last_end, end)
+
+    def line(self, name: str) -> str:
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        p50 = latencies[max(0, (count + 1) // 2 - 1)] * 1000
+        p99 = latencies[max(0, -(-count * 99 // 100) - 1)] * 1000
+        throughput = count / (self.last_end - self.first_start) if count > 1 else 0.0
+        return f"{name:<30} {count:7d} {self.errors:7d} {p50:9.2f} {p99:9.2f} {throughput:10.1f}"
+
+
+async def _call(name: str, ids: dict[str, str], report: EndpointReport) -> None:
+    start = time.perf_counter()
+    try:
+        ok = error_from_body(await SCENARIOS[name](ids)) is None
+    except Exception:
+        ok = False
+    report.add(start, time.perf_counter(), ok)
+
+
+async def drive(ids: dict[str, str], names: list[str], rps: float, duration: float) -> dict[str, EndpointReport]:
+    """
+    Open-loop load: calls are started on a fixed schedule of `rps` per endpoint, whether or not earlier calls have
+    returned, so a slow server shows up as latency instead of as a lower request rate.
+
+    Returns:
+        dict[str, EndpointReport]: Latencies, errors and timing per endpoint.
+    """
+    reports = {name: EndpointReport() for name in names}
+    tasks = []
+    start = time.perf_counter()
+    total = int(rps * duration)
+    for i in range(total):
+        delay = start + i / rps - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        for name in names:
+            tasks.append(asyncio.create_task(_call(name, ids, reports[name])))
+    await asyncio.gather(*tasks)
+    await http_client.close_async_client()
+    return reports
+
+
+def _serve(connection: any, latency: float, jitter: float, error_rate: float, rate_limit_per_minute: int) -> None:
+    """
+    Child-process entry point: runs the mock, reports its base URL and a few existing ids, and serves until told to
+    stop.
+    """
+    with MockAlpacaServer(latency, jitter, error_rate, rate_limit_per_minute) as server:
+        ids = {
+            "asset_symbol": server.assets[0]["symbol"],
+            "order_id": next(iter(server.orders)),
+            "position_symbol": next(iter(server.positions)),
+        }
+        connection.send((server.base_url, ids))
+        connection.recv()
+
+
+def main(argv: list[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Drive endpoint functions against the local mock Alpaca server.")
+    parser.add_argument("--endpoints", default=",".join(DEFAULT_SCENARIOS), help="comma-separated, or 'all'")
+    parser.add_argument("--rps", type=float, default=20.0, help="target requests per second, per endpoint")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds of load")
+    parser.add_argument("--latency", type=float, default=0.02, help="server latency per request, seconds")
+    parser.add_argument("--jitter", type=float, default=0.005, help="extra random latency, seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with a 500")
+    parser.add_argument("--server-rate-limit", type=int, default=None, help="server budget per minute (429 beyond)")
+    parser.add_argument("--client-rate-limit", action="store_true", help="keep the client-side rate limiter on")
+    parser.add_argument("--coalesce", action="store_true", help="keep single-flight and the response cache on")
+    args = parser.parse_args(argv)
+
+    names = list(SCENARIOS) if args.endpoints == "all" else args.endpoints.split(",")
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(unknown)} (choose from {', '.join(SCENARIOS)})")
+    rate_limiter.rate_limit_enabled = args.client_rate_limit
+    if not args.coalesce:
+        # Measure the server path: every scheduled call sends its own request.
+        single_flight.single_flight_enabled = False
+        cache.cache_enabled = False
+
+    parent, child = multiprocessing.Pipe()
+    process = multiprocessing.Process(
+        target=_serve, args=(child, args.latency, args.jitter, args.error_rate, args.server_rate_limit), daemon=True
+    )
+    process.start()
+    try:
+        base_url, ids = parent.recv()
+        previous = use_base_url(base_url)
+        try:
+            started = time.perf_counter()
+            reports = asyncio.run(drive(ids, names, args.rps, args.duration))
+            elapsed = time.perf_counter() - started
+        finally:
+            restore_base_urls(previous)
+    finally:
+        parent.send(None)
+        process.join(timeout=5)
+
+    print(f"{'endpoint':<30} {'calls':>7} {'errors':>7} {'p50 ms':>9} {'p99 ms':>9} {'req/s':>10}")
+    for name, report in reports.items():
+        print(report.line(name))
+    calls = sum(len(report.latencies) for report in reports.values())
+    print(
+        f"{'total':<30} {calls:7d} {sum(r.errors for r in reports.values()):7d} {'':>9} {'':>9} {calls / elapsed:10.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,622 @@
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.bench_asset_universe import synthetic_assets
+from benchmarks.bench_json_decoding import synthetic_activities, synthetic_orders
+from benchmarks.bench_models import synthetic_positions
+from core import registry
+
+# A handler gets the server, the path match, the query parameters and the JSON body, and returns (status, body).
+Route = Callable[["MockAlpacaServer", re.Match, dict[str, str], any], tuple[int, any]]
+
+_ROUTES: list[tuple[str, re.Pattern, Route]] = []
+
+
+def _route(method: str, pattern: str) -> Callable[[Route], Route]:
+    def register(handler: Route) -> Route:
+        _ROUTES.append((method, re.compile(f"^/v2{pattern}$"), handler))
+        return handler
+
+    return register
+
+
+def _now() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S.000000Z", time.gmtime())
+
+
+def _not_found(message: str) -> tuple[int, dict]:
+    return 404, {"code": 40410000, "message": message}
+
+
+@_route("GET", "/account")
+def _account(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    return 200, server.account
+
+
+@_route("GET", "/account/configurations")
+def _configurations(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    return 200, server.configurations
+
+
+@_route("PATCH", "/account/configurations")
+def _update_configurations(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    server.configurations.update(body or {})
+    return 200, server.configurations
+
+
+@_route("GET", "/account/activities(?:/(?P<activity_type>[A-Z]+))?")
+def _activities(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    activity_type = match["activity_type"] or query.get("activity_types")
+    activities = server.activities
+    if activity_type:
+        activities = [activity for activity in activities if activity["activity_type"] in activity_type.split(",")]
+    if "page_token" in query:
+        ids = [activity["id"] for activity in activities]
+        start = ids.index(query["page_token"]) + 1 if query["page_token"] in ids else len(ids)
+        activities = activities[start:]
+    return 200, activities[: int(query.get("page_size", 100))]
+
+
+@_route("GET", "/account/portfolio/history")
+def _portfolio_history(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    points = 390
+    start = int(time.time()) - points * 60
+    equity = [100000.0 + i * 3.5 for i in range(points)]
+    return 200, {
+        "timestamp": [start + i * 60 for i in range(points)],
+        "equity": equity,
+        "profit_loss": [value - 100000.0 for value in equity],
+        "profit_loss_pct": [value / 100000.0 - 1 for value in equity],
+        "base_value": 100000.0,
+        "timeframe": query.get("timeframe", "1Min"),
+    }
+
+
+@_route("GET", "/assets")
+def _assets(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    return 200, server.assets
+
+
+@_route("GET", "/assets/(?P<symbol>[^/]+)")
+def _asset(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    asset = server.assets_by_symbol.get(match["symbol"])
+    return (200, asset) if asset else _not_found("asset not found")
+
+
+@_route("GET", "/calendar")
+def _calendar(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    return 200, server.calendar
+
+
+@_route("GET", "/clock")
+def _clock(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    return 200, {"timestamp": _now(), "is_open": True, "next_open": _now(), "next_close": _now()}
+
+
+@_route("GET", "/corporate_actions/announcements")
+def _announcements(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    return 200, server.announcements
+
+
+@_route("GET", "/corporate_actions/announcements/(?P<id>[^/]+)")
+def _announcement(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    for announcement in server.announcements:
+        if announcement["id"] == match["id"]:
+            return 200, announcement
+    return _not_found("announcement not found")
+
+
+@_route("GET", "/options/contracts")
+def _option_contracts(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    return 200, {"option_contracts": server.option_contracts, "next_page_token": None}
+
+
+@_route("GET", "/options/contracts/(?P<symbol>[^/]+)")
+def _option_contract(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    for contract in server.option_contracts:
+        if match["symbol"] in (contract["symbol"], contract["id"]):
+            return 200, contract
+    return _not_found("option contract not found")
+
+
+@_route("GET", "/orders")
+def _orders(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    status = query.get("status", "open")
+    with server.lock:
+        orders = list(server.orders.values())
+    if status == "open":
+        orders = [order for order in orders if order["status"] in ("new", "accepted", "partially_filled")]
+    elif status == "closed":
+        orders = [order for order in orders if order["status"] not in ("new", "accepted", "partially_filled")]
+    if "symbols" in query:
+        symbols = set(query["symbols"].split(","))
+        orders = [order for order in orders if order["symbol"] in symbols]
+    orders.sort(key=lambda order: order["submitted_at"], reverse=query.get("direction", "desc") == "desc")
+    return 200, orders[: int(query.get("limit", 50))]
+
+
+@_route("POST", "/orders")
+def _create_order(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    body = body or {}
+    with server.lock:
+        client_order_id = body.get("client_order_id") or uuid.uuid4().hex
+        if client_order_id in server.client_order_ids:
+            return 422, {"code": 40010001, "message": "client_order_id must be unique"}
+        server.client_order_ids.add(client_order_id)
+        order = server.new_order(body, client_order_id)
+        server.orders[order["id"]] = order
+    return 200, order
+
+
+@_route("DELETE", "/orders")
+def _delete_orders(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    with server.lock:
+        cancelled = []
+        for order in server.orders.values():
+            if order["status"] in ("new", "accepted", "partially_filled"):
+                order["status"] = "canceled"
+                cancelled.append({"id": order["id"], "status": 200})
+    return 207, cancelled
+
+
+@_route("GET", "/orders:by_client_order_id")
+def _order_by_client_order_id(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    with server.lock:
+        for order in server.orders.values():
+            if order["client_order_id"] == query.get("client_order_id"):
+                return 200, order
+    return _not_found("order not found")
+
+
+@_route("GET", "/orders/(?P<id>[^/]+)")
+def _order(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    order = server.orders.get(match["id"])
+    return (200, order) if order else _not_found("order not found")
+
+
+@_route("PATCH", "/orders/(?P<id>[^/]+)")
+def _replace_order(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    with server.lock:
+        order = server.orders.get(match["id"])
+        if order is None:
+            return _not_found("order not found")
+        if order["status"] not in ("new", "accepted", "partially_filled"):
+            return 422, {"code": 42210000, "message": "order is not replaceable"}
+        order["status"] = "replaced"
+        replacement = server.new_order({**order, **(body or {})}, (body or {}).get("client_order_id"))
+        replacement["replaces"] = order["id"]
+        order["replaced_by"] = replacement["id"]
+        server.orders[replacement["id"]] = replacement
+    return 200, replacement
+
+
+@_route("DELETE", "/orders/(?P<id>[^/]+)")
+def _cancel_order(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    with server.lock:
+        order = server.orders.get(match["id"])
+        if order is None:
+            return _not_found("order not found")
+        if order["status"] not in ("new", "accepted", "partially_filled"):
+            return 422, {"code": 42210000, "message": "order is not cancelable"}
+        order["status"] = "canceled"
+    return 204, None
+
+
+@_route("GET", "/positions")
+def _positions(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    return 200, list(server.positions.values())
+
+
+@_route("DELETE", "/positions")
+def _close_positions(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    with server.lock:
+        closed = [
+            {"symbol": symbol, "status": 200, "body": server.new_order({"symbol": symbol, "side": "sell"})}
+            for symbol in server.positions
+        ]
+        server.positions.clear()
+    return 207, closed
+
+
+@_route("GET", "/positions/(?P<symbol>[^/]+)")
+def _position(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    position = server.positions.get(match["symbol"])
+    return (200, position) if position else _not_found("position does not exist")
+
+
+@_route("DELETE", "/positions/(?P<symbol>[^/]+)")
+def _close_position(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    position = server.positions.get(match["symbol"])
+    if position is None:
+        return _not_found("position does not exist")
+    qty = query.get("qty") or position["qty"]
+    return 200, server.new_order({"symbol": match["symbol"], "qty": qty, "side": "sell", "type": "market"})
+
+
+@_route("POST", "/positions/(?P<symbol>[^/]+)/exercise")
+def _exercise(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    return 200, {}
+
+
+@_route("GET", "/watchlists")
+def _watchlists(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    return 200, [
+        {key: value for key, value in watchlist.items() if key != "assets"} for watchlist in server.watchlists.values()
+    ]
+
+
+@_route("POST", "/watchlists")
+def _create_watchlist(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    body = body or {}
+    watchlist = server.new_watchlist(body.get("name", ""), body.get("symbols") or [])
+    return 200, watchlist
+
+
+def _watchlist(server: "MockAlpacaServer", match: re.Match, query: dict) -> dict:
+    if match["id"]:
+        return server.watchlists.get(match["id"])
+    return next((watchlist for watchlist in server.watchlists.values() if watchlist["name"] == query.get("name")), None)
+
+
+@_route("GET", "/watchlists(?::by_name|/(?P<id>[^/]+))")
+def _get_watchlist(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    watchlist = _watchlist(server, match, query)
+    return (200, watchlist) if watchlist else _not_found("watchlist not found")
+
+
+@_route("PUT", "/watchlists(?::by_name|/(?P<id>[^/]+))")
+def _update_watchlist(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    watchlist = _watchlist(server, match, query)
+    if watchlist is None:
+        return _not_found("watchlist not found")
+    body = body or {}
+    watchlist["name"] = body.get("name", watchlist["name"])
+    if "symbols" in body:
+        watchlist["assets"] = [server.assets_by_symbol.get(symbol, {"symbol": symbol}) for symbol in body["symbols"]]
+    return 200, watchlist
+
+
+@_route("POST", "/watchlists(?::by_name|/(?P<id>[^/]+))")
+def _add_to_watchlist(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    watchlist = _watchlist(server, match, query)
+    if watchlist is None:
+        return _not_found("watchlist not found")
+    symbol = (body or {}).get("symbol")
+    watchlist["assets"].append(server.assets_by_symbol.get(symbol, {"symbol": symbol}))
+    return 200, watchlist
+
+
+@_route("DELETE", "/watchlists(?::by_name|/(?P<id>[^/]+))")
+def _delete_watchlist(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    watchlist = _watchlist(server, match, query)
+    if watchlist is None:
+        return _not_found("watchlist not found")
+    server.watchlists.pop(watchlist["id"], None)
+    return 204, None
+
+
+@_route("DELETE", "/watchlists/(?P<id>[^/]+)/(?P<symbol>[^/]+)")
+def _delete_from_watchlist(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    watchlist = server.watchlists.get(match["id"])
+    if watchlist is None:
+        return _not_found("watchlist not found")
+    watchlist["assets"] = [asset for asset in watchlist["assets"] if asset.get("symbol") != match["symbol"]]
+    return 200, watchlist
+
+
+@_route("GET", "/wallet/crypto/fundings")
+def _wallets(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    return 200, {"asset_id": str(uuid.uuid4()), "address": "0x" + "ab" * 20, "created_at": _now()}
+
+
+@_route("GET", "/wallet/crypto/fundings/transfers")
+def _transfers(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    offset = int(query.get("offset", 0))
+    return 200, server.transfers[offset : offset + int(query.get("limit", 100))]
+
+
+@_route("GET", "/wallet/crypto/fundings/transfers/(?P<id>[^/]+)")
+def _transfer(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    transfer = next((transfer for transfer in server.transfers if transfer["id"] == match["id"]), None)
+    return (200, transfer) if transfer else _not_found("transfer not found")
+
+
+@_route("POST", "/wallet/crypto/fundings/withdrawals")
+def _withdraw(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    transfer = {**server.transfers[0], "id": str(uuid.uuid4()), "direction": "OUTGOING", **(body or {})}
+    return 200, transfer
+
+
+@_route("GET", "/wallet/crypto/fundings/estimate")
+def _estimate(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    return 200, {"fee": "0.00042"}
+
+
+@_route("GET", "/wallet/crypto/addresses")
+def _addresses(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    return 200, list(server.addresses.values())
+
+
+@_route("POST", "/wallet/crypto/addresses")
+def _create_address(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    address = {"id": str(uuid.uuid4()), "status": "PENDING", "created_at": _now(), **(body or {})}
+    server.addresses[address["id"]] = address
+    return 200, address
+
+
+@_route("DELETE", "/wallet/crypto/addresses/(?P<id>[^/]+)")
+def _delete_address(server: "MockAlpacaServer", match: re.Match, query: dict, body: any) -> tuple[int, any]:
+    if server.addresses.pop(match["id"], None) is None:
+        return _not_found("address not found")
+    return 204, None
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    mock: "MockAlpacaServer" = None
+
+    def _reply(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        status, body, headers = self.mock.handle(self.command, self.path, raw_body)
+        payload = b"" if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _reply
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 512
+
+
+class MockAlpacaServer:
+    """
+    In-process stand-in for the Alpaca trading API, serving every route the `endpoints/` modules call from in-memory
+    state seeded with realistically sized payloads (orders, positions, activities, assets, watchlists, crypto
+    funding). Orders can be created, replaced and cancelled; the rest is mostly read-only.
+
+    Use as a context manager and point the endpoint modules at it with `use_base_url(server.base_url)`. Every response
+    waits `latency` seconds (plus up to `jitter`); a share `error_rate` of requests fails with a 500, and with
+    `rate_limit_per_minute` set the server sends `X-RateLimit-*` headers and answers 429 once the minute's budget is
+    spent, like the real API.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_per_minute: int = None,
+        asset_count: int = 2000,
+        order_count: int = 200,
+        position_count: int = 50,
+        activity_count: int = 500,
+        seed: int = 1,
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_per_minute = rate_limit_per_minute
+        self.lock = threading.Lock()
+        self.requests: dict[str, int] = {}
+        self._rng = random.Random(seed)
+        self._window_start = time.time()
+        self._window_used = 0
+
+        self.account = {
+            "id": str(uuid.UUID(int=seed)),
+            "account_number": "PA0000000000",
+            "status": "ACTIVE",
+            "currency": "USD",
+            "cash": "100000",
+            "buying_power": "400000",
+            "equity": "100000",
+            "last_equity": "100000",
+            "long_market_value": "0",
+            "short_market_value": "0",
+            "multiplier": "4",
+            "pattern_day_trader": False,
+            "trading_blocked": False,
+            "created_at": "2024-01-02T14:30:00Z",
+        }
+        self.configurations = {
+            "dtbp_check": "entry",
+            "no_shorting": False,
+            "suspend_trade": False,
+            "fractional_trading": True,
+        }
+        self.assets = synthetic_assets(asset_count)
+        self.assets_by_symbol = {asset["symbol"]: asset for asset in self.assets}
+        self.orders = {order["id"]: order for order in synthetic_orders(order_count)}
+        self.client_order_ids = {order["client_order_id"] for order in self.orders.values()}
+        self._order_template = synthetic_orders(1)[0]
+        self.positions = {position["symbol"]: position for position in synthetic_positions(position_count)}
+        self.activities = synthetic_activities(activity_count)
+        self.calendar = [
+            {"date": f"2025-{month:02d}-{day:02d}", "open": "09:30", "close": "16:00", "session_open": "0400"}
+            for month in range(1, 13)
+            for day in range(1, 29)
+        ]
+        self.announcements = [
+            {
+                "id": str(uuid.UUID(int=self._rng.getrandbits(128))),
+                "ca_type": "dividend",
+                "ca_sub_type": "cash",
+                "initiating_symbol": asset["symbol"],
+                "ex_date": "2025-03-14",
+                "record_date": "2025-03-17",
+                "payable_date": "2025-03-31",
+                "cash": "0.25",
+            }
+            for asset in self.assets[:100]
+        ]
+        self.option_contracts = [
+            {
+                "id": str(uuid.UUID(int=self._rng.getrandbits(128))),
+                "symbol": f"AAPL250321C{strike:05d}000",
+                "name": f"AAPL Mar 21 2025 {strike} Call",
+                "status": "active",
+                "tradable": True,
+                "expiration_date": "2025-03-21",
+                "root_symbol": "AAPL",
+                "underlying_symbol": "AAPL",
+                "type": "call",
+                "style": "american",
+                "strike_price": str(strike),
+                "size": "100",
+                "open_interest": "100",
+            }
+            for strike in range(100, 300, 5)
+        ]
+        self.watchlists: dict[str, dict] = {}
+        self.new_watchlist("default", [asset["symbol"] for asset in self.assets[:20]])
+        self.transfers = [
+            {
+                "id": str(uuid.UUID(int=self._rng.getrandbits(128))),
+                "tx_hash": "0x" + "cd" * 32,
+                "direction": "INCOMING",
+                "status": "COMPLETE",
+                "amount": "0.5",
+                "usd_value": "1500",
+                "network_fee": "0.0001",
+                "fees": "0",
+                "chain": "ETH",
+                "asset": "ETH",
+                "created_at": _now(),
+            }
+            for _ in range(50)
+        ]
+        self.addresses: dict[str, dict] = {}
+
+        handler = type("MockHandler", (_MockHandler,), {"mock": self})
+        self._server = _MockHTTPServer(("127.0.0.1", 0), handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}/v2"
+
+    def __enter__(self) -> "MockAlpacaServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def new_order(self, order_data: dict, client_order_id: str = None) -> dict:
+        now = _now()
+        order_type = order_data.get("type", "market")
+        return {
+            **self._order_template,
+            "id": str(uuid.uuid4()),
+            "client_order_id": client_order_id or uuid.uuid4().hex,
+            "created_at": now,
+            "updated_at": now,
+            "submitted_at": now,
+            "filled_at": None,
+            "symbol": order_data.get("symbol"),
+            "qty": str(order_data.get("qty")) if order_data.get("qty") is not None else None,
+            "notional": order_data.get("notional"),
+            "filled_qty": "0",
+            "filled_avg_price": None,
+            "side": order_data.get("side", "buy"),
+            "type": order_type,
+            "order_type": order_type,
+            "time_in_force": order_data.get("time_in_force", "day"),
+            "limit_price": order_data.get("limit_price"),
+            "stop_price": order_data.get("stop_price"),
+            "status": "accepted",
+            "replaced_by": None,
+            "replaces": None,
+        }
+
+    def new_watchlist(self, name: str, symbols: list[str]) -> dict:
+        watchlist = {
+            "id": str(uuid.uuid4()),
+            "account_id": self.account["id"],
+            "name": name,
+            "created_at": _now(),
+            "updated_at": _now(),
+            "assets": [self.assets_by_symbol.get(symbol, {"symbol": symbol}) for symbol in symbols],
+        }
+        self.watchlists[watchlist["id"]] = watchlist
+        return watchlist
+
+    def _rate_limit(self) -> tuple[bool, dict[str, str]]:
+        """
+        Returns:
+            tuple[bool, dict[str, str]]: Whether the request is within the budget, and the rate-limit headers.
+        """
+        if not self.rate_limit_per_minute:
+            return True, {}
+        now = time.time()
+        with self.lock:
+            if now - self._window_start >= 60:
+                self._window_start, self._window_used = now, 0
+            allowed = self._window_used < self.rate_limit_per_minute
+            if allowed:
+                self._window_used += 1
+            remaining = self.rate_limit_per_minute - self._window_used
+        headers = {
+            "X-RateLimit-Limit": str(self.rate_limit_per_minute),
+            "X-RateLimit-Remaining": str(remaining),
+            "X-RateLimit-Reset": str(int(self._window_start + 60)),
+        }
+        return allowed, headers
+
+    def handle(self, method: str, path: str, raw_body: bytes) -> tuple[int, any, dict[str, str]]:
+        """
+        Returns:
+            tuple[int, any, dict[str, str]]: Status, JSON body (None for no content) and extra headers.
+        """
+        if self.latency or self.jitter:
+            time.sleep(self.latency + self._rng.random() * self.jitter)
+        allowed, headers = self._rate_limit()
+        if not allowed:
+            return 429, {"code": 42910000, "message": "rate limit exceeded"}, headers
+        if self.error_rate and self._rng.random() < self.error_rate:
+            return 500, {"code": 50010000, "message": "internal server error"}, headers
+        parts = urlsplit(path)
+        query = {name: values[-1] for name, values in parse_qs(parts.query).items()}
+        body = json.loads(raw_body) if raw_body else None
+        for route_method, pattern, handler in _ROUTES:
+            if route_method == method and (match := pattern.match(parts.path)):
+                with self.lock:
+                    self.requests[handler.__name__] = self.requests.get(handler.__name__, 0) + 1
+                status, response_body = handler(self, match, query, body)
+                return status, response_body, headers
+        return 404, {"code": 40400000, "message": f"no route for {method} {parts.path}"}, headers
+
+
+def use_base_url(base_url: str) -> dict[str, str]:
+    """
+    Points every endpoint's paper-trading calls at `base_url` (e.g. a `MockAlpacaServer`).
+
+    Returns:
+        dict[str, str]: The previous base URL, to restore with `restore_base_urls`.
+    """
+    return {"paper": registry.set_base_url(True, base_url)}
+
+
+def restore_base_urls(previous: dict[str, str]) -> None:
+    registry.set_base_url(True, previous["paper"])
@@ -0,0 +1,56 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    latency: float = 0.0
+
+    def _reply(self) -> None:
+        if self.latency:
+            time.sleep(self.latency)
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        body = json.dumps({"id": self.path.rsplit("/", 1)[-1], "status": "new", "symbol": "AAPL", "qty": "1"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _reply
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+class StubServer:
+    """
+    Minimal keep-alive HTTP server on localhost that answers every route with a small order-shaped JSON body.
+    Use as a context manager; `base_url` mimics the `/v2` prefix of the real API. `latency` (seconds) is added to
+    every response to emulate the network round trip to Alpaca.
+    """
+
+    def __init__(self, latency: float = 0.0) -> None:
+        handler = type("StubHandler", (_StubHandler,), {"latency": latency})
+        self._server = _StubHTTPServer(("127.0.0.1", 0), handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}/v2"
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import websockets
+
+
+class StubTradeStream:
+    """
+    Local stand-in for Alpaca's trade_updates websocket. It accepts any credentials (unless `authorized` is False),
+    confirms the `listen` subscription, and sends whatever `push` is given to every subscribed client as binary
+    frames, like the paper endpoint does. `drop_connections` closes every client to exercise reconnects.
+    Use as an async context manager; pass `url` to `TradeUpdateStream`.
+    """
+
+    def __init__(self, authorized: bool = True) -> None:
+        self.authorized = authorized
+        self.url: str = None
+        self.connections_accepted = 0
+        self._clients: set = set()
+        self._server = None
+
+    async def __aenter__(self) -> "StubTradeStream":
+        self._server = await websockets.serve(self._handle, "127.0.0.1", 0)
+        port = next(iter(self._server.sockets)).getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}/stream"
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, connection: any) -> None:
+        self.connections_accepted += 1
+        await connection.recv()
+        status = "authorized" if self.authorized else "unauthorized"
+        await connection.send(
+            json.dumps({"stream": "authorization", "data": {"status": status, "action": "authenticate"}}).encode()
+        )
+        if not self.authorized:
+            return
+        await connection.recv()
+        await connection.send(json.dumps({"stream": "listening", "data": {"streams": ["trade_updates"]}}).encode())
+        self._clients.add(connection)
+        try:
+            await connection.wait_closed()
+        finally:
+            self._clients.discard(connection)
+
+    async def wait_for_clients(self, count: int = 1, timeout: float = 5.0) -> None:
+        """
+        Waits until `count` clients have subscribed.
+        """
+        async with asyncio.timeout(timeout):
+            while len(self._clients) < count:
+                await asyncio.sleep(0.01)
+
+    async def push(self, event: str, order: dict[str, any], **fields: any) -> None:
+        """
+        Sends one trade_updates event, e.g. `push("fill", order, price="101.5", qty="10", position_qty="10")`.
+        """
+        message = json.dumps({"stream": "trade_updates", "data": {"event": event, "order": order, **fields}}).encode()
+        for connection in list(self._clients):
+            await connection.send(message)
+
+    async def drop_connections(self) -> None:
+        for connection in list(self._clients):
+            await connection.close()
@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 from dotenv import load_dotenv
 
@@ -10,3 +11,55 @@ headers: dict[str, str] = {
 }
 
 paper_trading_base_url: str = "https://paper-api.alpaca.markets/v2"
+paper_trading_stream_url: str = "wss://paper-api.alpaca.markets/stream"
+live_trading_base_url: str = "https://api.alpaca.markets/v2"
+live_trading_stream_url: str = "wss://api.alpaca.markets/stream"
+
+# Shared HTTP client tuning (see core/http_client.py)
+http2_enabled: bool = os.getenv("APCA_HTTP2", "true").lower() == "true"
+http_max_connections: int = int(os.getenv("APCA_HTTP_MAX_CONNECTIONS", "100"))
+http_max_keepalive_connections: int = int(os.getenv("APCA_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+http_keepalive_expiry: float = float(os.getenv("APCA_HTTP_KEEPALIVE_EXPIRY", "30"))
+http_connect_timeout: float = float(os.getenv("APCA_HTTP_CONNECT_TIMEOUT", "5"))
+http_read_timeout: float = float(os.getenv("APCA_HTTP_READ_TIMEOUT", "30"))
+http_pool_timeout: float = float(os.getenv("APCA_HTTP_POOL_TIMEOUT", "10"))
+
+# Client-side rate limiting (see core/rate_limiter.py)
+rate_limit_enabled: bool = os.getenv("APCA_RATE_LIMIT_ENABLED", "true").lower() == "true"
+rate_limit_per_minute: int = int(os.getenv("APCA_RATE_LIMIT_PER_MINUTE", "200"))
+
+# Retries for transient failures (see core/retry.py)
+retry_max_attempts: int = int(os.getenv("APCA_RETRY_MAX_ATTEMPTS", "3"))
+retry_base_delay: float = float(os.getenv("APCA_RETRY_BASE_DELAY", "0.1"))
+retry_max_delay: float = float(os.getenv("APCA_RETRY_MAX_DELAY", "5"))
+retry_budget_ratio: float = float(os.getenv("APCA_RETRY_BUDGET_RATIO", "0.2"))
+retry_budget_max: float = float(os.getenv("APCA_RETRY_BUDGET_MAX", "10"))
+
+# Reference-data response cache (see core/cache.py)
+cache_enabled: bool = os.getenv("APCA_CACHE_ENABLED", "true").lower() == "true"
+cache_max_entries: int = int(os.getenv("APCA_CACHE_MAX_ENTRIES", "4096"))
+
+# Sharing one request between concurrent identical reads (see core/single_flight.py)
+single_flight_enabled: bool = os.getenv("APCA_SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+# Per-endpoint latency, status and byte counters; off by default (see core/metrics.py)
+metrics_enabled: bool = os.getenv("APCA_METRICS_ENABLED", "false").lower() == "true"
+
+# On-disk universe snapshots for fast cold starts (see services/snapshots.py)
+snapshot_dir: str = os.getenv("APCA_SNAPSHOT_DIR", tempfile.gettempdir())
+
+# JSON decoding backend: auto (fastest installed), orjson, msgspec or json (see core/codec.py)
+json_backend: str = os.getenv("APCA_JSON_BACKEND", "auto").lower()
+
+# Local portfolio state (see services/portfolio_state.py)
+portfolio_resync_interval: float = float(os.getenv("APCA_PORTFOLIO_RESYNC_INTERVAL", "300"))
+
+# Local market clock: seconds between get_market_clock syncs (see services/trading_calendar.py)
+clock_sync_interval: float = float(os.getenv("APCA_CLOCK_SYNC_INTERVAL", "300"))
+
+# Local pre-trade checks: account data older than this many seconds is not trusted (see services/pre_trade_validator.py)
+pre_trade_max_age: float = float(os.getenv("APCA_PRE_TRADE_MAX_AGE", "120"))
+
+# Trade-updates stream reconnects (see services/trade_stream.py)
+stream_reconnect_base_delay: float = float(os.getenv("APCA_STREAM_RECONNECT_BASE_DELAY", "0.5"))
+stream_reconnect_max_delay: float = float(os.getenv("APCA_STREAM_RECONNECT_MAX_DELAY", "30"))
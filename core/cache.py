@@ -0,0 +1,270 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Awaitable, Callable, Protocol
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import cache_enabled, cache_max_entries
+from core.single_flight import SingleFlight
+
+if TYPE_CHECKING:
+    from core.http_client import ApiRequest
+
+# A loader performs the real call and returns (decoded body, whether the body may be cached).
+Loader = Callable[[], tuple[any, bool]]
+AsyncLoader = Callable[[], Awaitable[tuple[any, bool]]]
+
+
+@dataclass(frozen=True, slots=True)
+class CachePolicy:
+    """
+    `ttl` seconds fresh, then served stale for up to `stale_ttl` more seconds while a background refresh runs.
+    """
+
+    ttl: float
+    stale_ttl: float = 0.0
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    value: any
+    fresh_until: float
+    stale_until: float
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    refreshes: int = 0
+
+
+class CacheBackend(Protocol):
+    """
+    Storage used by `ResponseCache`. Implement these three methods to plug in another store.
+    """
+
+    def get(self, key: tuple) -> CacheEntry: ...
+
+    def set(self, key: tuple, entry: CacheEntry) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class LRUCacheBackend:
+    """
+    Thread-safe in-memory store that evicts the least recently used entry beyond `max_entries`.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._entries: OrderedDict[tuple, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple) -> CacheEntry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: tuple, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Reference data that changes rarely. The clock is only cached for a second and never served stale.
+ENDPOINT_CACHE_POLICIES: dict[str, CachePolicy] = {
+    "get_assets": CachePolicy(ttl=3600.0, stale_ttl=86400.0),
+    "get_asset_by_id_or_symbol": CachePolicy(ttl=300.0, stale_ttl=3600.0),
+    "get_market_calendar": CachePolicy(ttl=86400.0, stale_ttl=7 * 86400.0),
+    "get_market_clock": CachePolicy(ttl=1.0),
+    "get_option_contract_by_id_or_symbol": CachePolicy(ttl=300.0, stale_ttl=3600.0),
+}
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache for decoded endpoint responses. Concurrent misses for the same request share one fetch, and
+    stale entries are served immediately while a single background refresh replaces them.
+    Cached bodies are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, backend: CacheBackend, policies: dict[str, CachePolicy]) -> None:
+        self.backend = backend
+        self.policies = policies
+        self._stats: dict[str, CacheStats] = {}
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        self._background_tasks: set[asyncio.Task] = set()
+
+    def policy_for(self, api_request: "ApiRequest") -> CachePolicy:
+        """
+        Returns:
+            CachePolicy: The policy for the request's endpoint, or None if the request is not cacheable.
+        """
+        if api_request.method != "GET":
+            return None
+        return self.policies.get(api_request.endpoint)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """
+        Returns:
+            dict[str, dict[str, int]]: Hit, stale-hit, miss, coalesced and refresh counters per endpoint.
+        """
+        shared = self._flights.stats()
+        with self._lock:
+            stats = {endpoint: asdict(counters) for endpoint, counters in self._stats.items()}
+        for endpoint, counters in stats.items():
+            counters["coalesced"] = shared.get(endpoint, {}).get("shared", 0)
+        return stats
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def invalidate(self, endpoint: str) -> None:
+        """
+        Makes every cached response of `endpoint` unreachable, so the next call fetches fresh data. The old entries
+        are left for the LRU to evict.
+        """
+        with self._lock:
+            self._generations[endpoint] = self._generations.get(endpoint, 0) + 1
+
+    def request_key(self, api_request: "ApiRequest") -> tuple:
+        """
+        Returns:
+            tuple: Hashable identity of a request: endpoint generation, method, URL, sorted query parameters and
+                which form the body is decoded into.
+        """
+        params = tuple(sorted((api_request.params or {}).items()))
+        generation = self._generations.get(api_request.endpoint, 0)
+        return (
+            api_request.endpoint,
+            generation,
+            api_request.method,
+            api_request.url,
+            params,
+            api_request.typed,
+            api_request.as_models,
+        )
+
+    def _count(self, endpoint: str, counter: str) -> None:
+        with self._lock:
+            counters = self._stats.setdefault(endpoint, CacheStats())
+            setattr(counters, counter, getattr(counters, counter) + 1)
+
+    def _store(self, key: tuple, policy: CachePolicy, value: any) -> None:
+        now = time.monotonic()
+        self.backend.set(key, CacheEntry(value, now + policy.ttl, now + policy.ttl + policy.stale_ttl))
+
+    def _lookup(self, endpoint: str, key: tuple) -> tuple[CacheEntry, bool]:
+        """
+        Returns:
+            tuple[CacheEntry, bool]: The usable entry (or None) and whether it needs a background refresh.
+        """
+        entry = self.backend.get(key)
+        now = time.monotonic()
+        if entry is None or now >= entry.stale_until:
+            self._count(endpoint, "misses")
+            return None, False
+        if now < entry.fresh_until:
+            self._count(endpoint, "hits")
+            return entry, False
+        self._count(endpoint, "stale_hits")
+        return entry, True
+
+    def _load(self, endpoint: str, key: tuple, policy: CachePolicy, load: Loader) -> any:
+        def load_and_store() -> any:
+            value, cacheable = load()
+            if cacheable:
+                self._store(key, policy, value)
+            return value
+
+        return self._flights.do(endpoint, key, load_and_store)
+
+    def fetch(self, api_request: "ApiRequest", load: Loader) -> any:
+        """
+        Args:
+            api_request (ApiRequest): The request being served; its endpoint must have a policy.
+            load (Loader): Performs the real call on a miss or refresh.
+
+        Returns:
+            any: The decoded response body, from cache when possible.
+        """
+        policy = self.policies[api_request.endpoint]
+        key = self.request_key(api_request)
+        entry, refresh = self._lookup(api_request.endpoint, key)
+        if entry is None:
+            return self._load(api_request.endpoint, key, policy, load)
+        if refresh and not self._flights.in_flight(key):
+            self._count(api_request.endpoint, "refreshes")
+            threading.Thread(target=self._refresh, args=(api_request.endpoint, key, policy, load), daemon=True).start()
+        return entry.value
+
+    def _refresh(self, endpoint: str, key: tuple, policy: CachePolicy, load: Loader) -> None:
+        try:
+            self._load(endpoint, key, policy, load)
+        except Exception:
+            pass  # keep serving the stale entry; the next miss will surface the error
+
+    async def _load_async(self, endpoint: str, key: tuple, policy: CachePolicy, load: AsyncLoader) -> any:
+        async def load_and_store() -> any:
+            value, cacheable = await load()
+            if cacheable:
+                self._store(key, policy, value)
+            return value
+
+        return await self._flights.do_async(endpoint, key, load_and_store)
+
+    async def fetch_async(self, api_request: "ApiRequest", load: AsyncLoader) -> any:
+        """
+        Async twin of `fetch`; `load` is a coroutine function.
+        """
+        policy = self.policies[api_request.endpoint]
+        key = self.request_key(api_request)
+        entry, refresh = self._lookup(api_request.endpoint, key)
+        if entry is None:
+            return await self._load_async(api_request.endpoint, key, policy, load)
+        if refresh and not self._flights.in_flight(key):
+            self._count(api_request.endpoint, "refreshes")
+            task = asyncio.create_task(self._refresh_async(api_request.endpoint, key, policy, load))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+        return entry.value
+
+    async def _refresh_async(self, endpoint: str, key: tuple, policy: CachePolicy, load: AsyncLoader) -> None:
+        try:
+            await self._load_async(endpoint, key, policy, load)
+        except Exception:
+            pass  # keep serving the stale entry; the next miss will surface the error
+
+
+response_cache = ResponseCache(LRUCacheBackend(cache_max_entries), ENDPOINT_CACHE_POLICIES)
+
+
+def cacheable(api_request: "ApiRequest") -> bool:
+    """
+    Returns:
+        bool: True if caching is enabled and the request's endpoint has a cache policy.
+    """
+    return cache_enabled and response_cache.policy_for(api_request) is not None
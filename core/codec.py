@@ -0,0 +1,88 @@
+import json
+import os
+import sys
+from typing import Callable
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import json_backend
+
+# Tried in this order when the backend is "auto"; stdlib json is always available.
+BACKENDS = ("orjson", "msgspec", "json")
+
+backend: str = None
+_loads: Callable[[bytes], any] = None
+_typed_decoders: dict[str, any] = {}
+
+
+def backend_loads(name: str) -> Callable[[bytes], any]:
+    """
+    Returns:
+        Callable[[bytes], any]: The `loads` function of backend `name`, or None if its package is not installed.
+    """
+    if name == "orjson":
+        try:
+            import orjson
+        except ImportError:
+            return None
+        return orjson.loads
+    if name == "msgspec":
+        try:
+            import msgspec
+        except ImportError:
+            return None
+        return msgspec.json.Decoder().decode
+    if name == "json":
+        return json.loads
+    raise ValueError(f"Unknown JSON backend: {name} (expected auto, {', '.join(BACKENDS)})")
+
+
+def use_backend(name: str) -> str:
+    """
+    Selects the decoder behind `loads`. Every backend returns the same plain dicts and lists.
+    Args:
+        name (str): 'orjson', 'msgspec', 'json', or 'auto' for the first of those that is installed.
+
+    Returns:
+        str: The backend now in use.
+    """
+    global backend, _loads
+    for candidate in BACKENDS if name == "auto" else (name,):
+        loads = backend_loads(candidate)
+        if loads is not None:
+            backend, _loads = candidate, loads
+            return candidate
+    raise ImportError(f"The {name} JSON backend is not installed: pip install {name}")
+
+
+def loads(data: bytes) -> any:
+    """
+    Args:
+        data (bytes): A raw JSON response body.
+
+    Returns:
+        any: The decoded body as plain dicts and lists.
+    """
+    return _loads(data)
+
+
+def decode_typed(endpoint: str, data: bytes) -> any:
+    """
+    Decodes a successful response body straight into the `core.structs` models registered for `endpoint`.
+    Args:
+        endpoint (str): The endpoint name the body came from (e.g. 'get_assets').
+        data (bytes): The raw JSON response body.
+
+    Returns:
+        any: A model or list of models.
+    """
+    decoder = _typed_decoders.get(endpoint)
+    if decoder is None:
+        # Imported on first use only: typed models need the optional msgspec package.
+        from core import structs
+
+        decoder = _typed_decoders[endpoint] = structs.decoder_for(endpoint)
+    return decoder.decode(data)
+
+
+use_backend(json_backend)
@@ -0,0 +1,34 @@
+class AlpacaAPIError(Exception):
+    """
+    Raised (or returned in batch results) when Alpaca answers with its documented error body
+    `{"code": 40310000, "message": "..."}`. The first three digits of `code` are the HTTP status.
+    """
+
+    def __init__(self, code: int, message: str, body: dict = None) -> None:
+        super().__init__(f"{code}: {message}")
+        self.code = code
+        self.message = message
+        self.body = body
+
+    @property
+    def status_code(self) -> int:
+        """
+        Returns:
+            int: The HTTP status encoded in `code` (e.g. 403 for 40310000), or None if the code is not in that form.
+        """
+        if isinstance(self.code, int) and self.code >= 10000000:
+            return self.code // 100000
+        return None
+
+
+def error_from_body(body: any) -> AlpacaAPIError:
+    """
+    Args:
+        body (any): A decoded response body as returned by the endpoint functions.
+
+    Returns:
+        AlpacaAPIError: The error described by `body`, or None if `body` is a regular (successful) payload.
+    """
+    if isinstance(body, dict) and "code" in body and "message" in body and "id" not in body:
+        return AlpacaAPIError(code=body["code"], message=body["message"], body=body)
+    return None
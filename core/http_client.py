@@ -0,0 +1,351 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+import httpx
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import (
+    headers,
+    http2_enabled,
+    http_connect_timeout,
+    http_keepalive_expiry,
+    http_max_connections,
+    http_max_keepalive_connections,
+    http_pool_timeout,
+    http_read_timeout,
+)
+from core import cache, codec, metrics, models, rate_limiter, retry, single_flight
+
+_client: httpx.Client = None
+_client_lock = threading.Lock()
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+@dataclass(slots=True)
+class ApiRequest:
+    """
+    Everything needed to send one endpoint call. Built once by the endpoint module and shared by the sync and async
+    entry points, so both always send exactly the same request.
+
+    Treat it as read-only and derive variants with `dataclasses.replace`. It is not frozen because a frozen
+    dataclass sets every field through `object.__setattr__`, which made constructing it the costliest step of a call.
+    """
+
+    endpoint: str
+    method: str
+    url: str
+    params: dict = None
+    json: dict = None
+    # Non-idempotent calls only: a read that finds the result of an earlier attempt, so failures can be replayed.
+    replay_probe: "ApiRequest" = None
+    # False when replaying could repeat the effect even though the method is idempotent, e.g. a DELETE that makes the
+    # server submit closing orders.
+    idempotent: bool = True
+    # Decode a successful body into the endpoint's `core.structs` models instead of dicts (needs msgspec).
+    typed: bool = False
+    # Parse a successful body into the endpoint's `core.models` records instead of dicts.
+    as_models: bool = False
+
+
+def _http2_available() -> bool:
+    """
+    Returns:
+        bool: True if HTTP/2 is enabled in config and the optional `h2` package is installed.
+    """
+    if not http2_enabled:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _client_options() -> dict[str, any]:
+    """
+    Returns:
+        dict[str, any]: Keyword arguments shared by every pooled client (auth headers, HTTP/2, pool limits and timeouts).
+    """
+    return {
+        "headers": {name: value for name, value in headers.items() if value is not None},
+        "http2": _http2_available(),
+        "limits": httpx.Limits(
+            max_connections=http_max_connections,
+            max_keepalive_connections=http_max_keepalive_connections,
+            keepalive_expiry=http_keepalive_expiry,
+        ),
+        "timeout": httpx.Timeout(
+            connect=http_connect_timeout, read=http_read_timeout, write=http_read_timeout, pool=http_pool_timeout
+        ),
+    }
+
+
+def get_client() -> httpx.Client:
+    """
+    Returns the process-wide pooled client, creating it on first use. Connections are kept alive between
+    calls so only the first request to a host pays for DNS, TCP connect and the TLS handshake.
+
+    Returns:
+        httpx.Client: The shared client used by every endpoint module.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(**_client_options())
+    return _client
+
+
+def set_client(client: httpx.Client) -> None:
+    """
+    Replaces the shared client, closing the previous one (e.g. to point at a local stub server or a mock transport).
+    Args:
+        client (httpx.Client): The client every endpoint call should use from now on. None resets to the lazy default.
+    """
+    global _client
+    with _client_lock:
+        previous, _client = _client, client
+    if previous is not None and previous is not client:
+        previous.close()
+
+
+def close_client() -> None:
+    """
+    Closes the shared client and its pooled connections. The next call creates a fresh one.
+    """
+    set_client(None)
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Returns the pooled async client for the running event loop, creating it on first use. Async connection pools
+    are bound to the loop that opened them, so each loop gets its own client with the same settings.
+
+    Returns:
+        httpx.AsyncClient: The shared async client used by every `*_async` endpoint function.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _async_clients[loop] = httpx.AsyncClient(**_client_options())
+    return client
+
+
+def set_async_client(client: httpx.AsyncClient) -> None:
+    """
+    Replaces the async client for the running event loop. The previous client is left to the caller to close.
+    Args:
+        client (httpx.AsyncClient): The client every async endpoint call on this loop should use.
+    """
+    _async_clients[asyncio.get_running_loop()] = client
+
+
+async def close_async_client() -> None:
+    """
+    Closes the async client bound to the running event loop, if any.
+    """
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def request(method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    Drop-in replacement for `httpx.request` that goes through the shared pooled client and rate limiter.
+    Args:
+        method (str): HTTP method (GET, POST, PATCH, PUT, DELETE).
+        url (str): Absolute request URL.
+        **kwargs: Any other keyword accepted by `httpx.Client.request` (params, json, headers, ...).
+
+    Returns:
+        httpx.Response: The raw response.
+    """
+    rate_limiter.acquire(None)
+    if metrics.enabled:
+        return _measured(
+            None, method, url, lambda extensions: get_client().request(method, url, extensions=extensions, **kwargs)
+        )
+    response = get_client().request(method=method, url=url, **kwargs)
+    rate_limiter.observe(response)
+    return response
+
+
+def _measured(endpoint: str, method: str, url: str, send_with: Callable[[dict], httpx.Response]) -> httpx.Response:
+    started = metrics.start()
+    try:
+        response = send_with(started[1])
+    except Exception as exc:
+        metrics.record(endpoint, method, url, started, error=exc)
+        raise
+    metrics.record(endpoint, method, url, started, response)
+    rate_limiter.observe(response)
+    return response
+
+
+async def _measured_async(
+    endpoint: str, method: str, url: str, send_with: Callable[[dict], Awaitable[httpx.Response]]
+) -> httpx.Response:
+    started = metrics.start_async()
+    try:
+        response = await send_with(started[1])
+    except Exception as exc:
+        metrics.record(endpoint, method, url, started, error=exc)
+        raise
+    metrics.record(endpoint, method, url, started, response)
+    rate_limiter.observe(response)
+    return response
+
+
+def _send_once(api_request: ApiRequest) -> httpx.Response:
+    rate_limiter.acquire(api_request.endpoint)
+    if metrics.enabled:
+        return _measured(
+            api_request.endpoint,
+            api_request.method,
+            api_request.url,
+            lambda extensions: get_client().request(
+                method=api_request.method,
+                url=api_request.url,
+                params=api_request.params,
+                json=api_request.json,
+                extensions=extensions,
+            ),
+        )
+    response = get_client().request(
+        method=api_request.method, url=api_request.url, params=api_request.params, json=api_request.json
+    )
+    rate_limiter.observe(response)
+    return response
+
+
+async def _send_once_async(api_request: ApiRequest) -> httpx.Response:
+    await rate_limiter.acquire_async(api_request.endpoint)
+    if metrics.enabled:
+        return await _measured_async(
+            api_request.endpoint,
+            api_request.method,
+            api_request.url,
+            lambda extensions: get_async_client().request(
+                method=api_request.method,
+                url=api_request.url,
+                params=api_request.params,
+                json=api_request.json,
+                extensions=extensions,
+            ),
+        )
+    response = await get_async_client().request(
+        method=api_request.method, url=api_request.url, params=api_request.params, json=api_request.json
+    )
+    rate_limiter.observe(response)
+    return response
+
+
+def send(api_request: ApiRequest) -> httpx.Response:
+    """
+    Sends the request on the shared client. Every attempt waits for a rate-limiter token for its endpoint's lane,
+    and transient failures are retried according to `core.retry`.
+    Args:
+        api_request (ApiRequest): The request built by an endpoint module.
+
+    Returns:
+        httpx.Response: The raw response.
+    """
+    return retry.run(api_request, _send_once)
+
+
+async def send_async(api_request: ApiRequest) -> httpx.Response:
+    """
+    Async twin of `send`.
+    Args:
+        api_request (ApiRequest): The request built by an endpoint module.
+
+    Returns:
+        httpx.Response: The raw response.
+    """
+    return await retry.run_async(api_request, _send_once_async)
+
+
+def _decode(api_request: ApiRequest, response: httpx.Response) -> any:
+    """
+    Decodes the body with the configured `core.codec` backend, or into typed models or records when the request asks
+    for them. Error bodies are always plain dicts, so `core.errors.error_from_body` works on every form.
+    """
+    if metrics.enabled:
+        start = time.perf_counter()
+        body = _decode_body(api_request, response)
+        metrics.record_decode(api_request.endpoint, time.perf_counter() - start)
+        return body
+    return _decode_body(api_request, response)
+
+
+def _decode_body(api_request: ApiRequest, response: httpx.Response) -> any:
+    if not response.content:
+        # e.g. 204 No Content from `delete_order_by_id`.
+        return None
+    if api_request.typed and response.is_success:
+        return codec.decode_typed(api_request.endpoint, response.content)
+    body = codec.loads(response.content)
+    if api_request.as_models and response.is_success:
+        return models.from_body(api_request.endpoint, body)
+    return body
+
+
+def _decoded(api_request: ApiRequest, response: httpx.Response) -> tuple[any, bool]:
+    """
+    Returns:
+        tuple[any, bool]: The decoded body and whether it is a successful response that may be cached.
+    """
+    return _decode(api_request, response), response.status_code == 200
+
+
+def execute(api_request: ApiRequest) -> dict[str, any]:
+    """
+    Sends the request and decodes the JSON body, which is what every public endpoint function returns.
+    Reference-data endpoints with a policy in `core.cache` are served from the shared response cache; any other GET
+    joins an identical GET already in flight instead of sending its own (`core.single_flight`).
+    Args:
+        api_request (ApiRequest): The request built by an endpoint module.
+
+    Returns:
+        dict[str, any]: The decoded response body.
+    """
+    if cache.cacheable(api_request):
+        return cache.response_cache.fetch(api_request, lambda: _decoded(api_request, send(api_request)))
+    if single_flight.coalescable(api_request):
+        return single_flight.flights.do(
+            api_request.endpoint,
+            single_flight.request_key(api_request),
+            lambda: _decode(api_request, send(api_request)),
+        )
+    return _decode(api_request, send(api_request))
+
+
+async def execute_async(api_request: ApiRequest) -> dict[str, any]:
+    """
+    Async twin of `execute`.
+    Args:
+        api_request (ApiRequest): The request built by an endpoint module.
+
+    Returns:
+        dict[str, any]: The decoded response body.
+    """
+    if cache.cacheable(api_request):
+
+        async def load() -> tuple[any, bool]:
+            return _decoded(api_request, await send_async(api_request))
+
+        return await cache.response_cache.fetch_async(api_request, load)
+    if single_flight.coalescable(api_request):
+
+        async def call() -> any:
+            return _decode(api_request, await send_async(api_request))
+
+        return await single_flight.flights.do_async(api_request.endpoint, single_flight.request_key(api_request), call)
+    return _decode(api_request, await send_async(api_request))
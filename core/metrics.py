@@ -0,0 +1,394 @@
+import bisect
+import os
+import sys
+import threading
+import time
+from typing import Callable, NamedTuple
+
+import httpx
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import metrics_enabled
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is +Inf.
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+PHASES = ("total", "connect", "tls", "ttfb", "decode")
+
+# Checked before any timing work, so a disabled build only pays for this one lookup per call.
+enabled: bool = metrics_enabled
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram (cumulative on export, like Prometheus).
+    """
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, fraction: float) -> float:
+        """
+        Returns:
+            float: Upper bound of the bucket holding the `fraction` quantile (inf if it falls past the last bucket).
+        """
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip((*LATENCY_BUCKETS, float("inf")), self.counts):
+            seen += count
+            if seen >= target and count:
+                return bound
+        return 0.0
+
+
+class EndpointMetrics:
+    __slots__ = ("histograms", "statuses", "errors", "bytes_in", "bytes_out")
+
+    def __init__(self) -> None:
+        self.histograms = {phase: Histogram() for phase in PHASES}
+        self.statuses: dict[int, int] = {}
+        # Attempts that ended without a response (timeouts, connection errors).
+        self.errors = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+
+class CallRecord(NamedTuple):
+    """
+    One HTTP attempt, as passed to every hook. Phase durations are None when the transport did not go through that
+    phase (e.g. `connect` and `tls` on a reused keep-alive connection).
+    """
+
+    endpoint: str
+    method: str
+    url: str
+    status: int
+    # time.time_ns() at the start of the attempt, for exporters that need wall-clock timestamps.
+    start_ns: int
+    total: float
+    connect: float
+    tls: float
+    ttfb: float
+    bytes_in: int
+    bytes_out: int
+    error: Exception
+
+
+class _Timings:
+    """
+    Collects phase timings from httpcore's `trace` request extension.
+    """
+
+    __slots__ = ("marks",)
+
+    def __init__(self) -> None:
+        self.marks: dict[str, float] = {}
+
+    def trace(self, name: str, info: dict) -> None:
+        # e.g. "connection.connect_tcp.started", "http11.receive_response_headers.complete"
+        if name.endswith((".started", ".complete")):
+            self.marks.setdefault(name.split(".", 1)[1], time.perf_counter())
+
+    async def atrace(self, name: str, info: dict) -> None:
+        self.trace(name, info)
+
+    def between(self, start: str, end: str) -> float:
+        started, completed = self.marks.get(start), self.marks.get(end)
+        return None if started is None or completed is None else completed - started
+
+
+_lock = threading.Lock()
+_endpoints: dict[str, EndpointMetrics] = {}
+_hooks: list[Callable[[CallRecord], None]] = []
+# Last values seen in the X-RateLimit-* headers.
+rate_limit_limit: float = None
+rate_limit_remaining: float = None
+
+
+def enable() -> None:
+    global enabled
+    enabled = True
+
+
+def disable() -> None:
+    global enabled
+    enabled = False
+
+
+def reset() -> None:
+    with _lock:
+        _endpoints.clear()
+
+
+def add_hook(hook: Callable[[CallRecord], None]) -> Callable[[CallRecord], None]:
+    """
+    Registers a callable run after every HTTP attempt while metrics are enabled (e.g. to export spans or logs).
+    Exceptions raised by a hook are ignored. Usable as a decorator.
+    """
+    _hooks.append(hook)
+    return hook
+
+
+def remove_hook(hook: Callable[[CallRecord], None]) -> None:
+    _hooks.remove(hook)
+
+
+def _metrics_for(endpoint: str) -> EndpointMetrics:
+    metrics = _endpoints.get(endpoint)
+    if metrics is None:
+        with _lock:
+            metrics = _endpoints.setdefault(endpoint, EndpointMetrics())
+    return metrics
+
+
+def start() -> tuple[_Timings, dict, float, int]:
+    """
+    Starts timing one HTTP attempt.
+
+    Returns:
+        tuple[_Timings, dict, float, int]: The timing collector, the `extensions` to pass to httpx, and the
+            monotonic and wall-clock start times, to hand back to `record`.
+    """
+    timings = _Timings()
+    return timings, {"trace": timings.trace}, time.perf_counter(), time.time_ns()
+
+
+def start_async() -> tuple[_Timings, dict, float, int]:
+    """
+    Async twin of `start`; the returned extensions carry a coroutine trace callback as the async client requires.
+    """
+    timings = _Timings()
+    return timings, {"trace": timings.atrace}, time.perf_counter(), time.time_ns()
+
+
+def record(
+    endpoint: str,
+    method: str,
+    url: str,
+    started: tuple[_Timings, dict, float, int],
+    response: httpx.Response = None,
+    error: Exception = None,
+) -> None:
+    """
+    Records one HTTP attempt started with `start` or `start_async`.
+    Args:
+        endpoint (str): Endpoint function name (None for raw `http_client.request` calls).
+        method (str): HTTP method.
+        url (str): Request URL.
+        started (tuple): What `start` returned.
+        response (httpx.Response, optional): The response, if one arrived. Defaults to None.
+        error (Exception, optional): The exception that ended the attempt, if any. Defaults to None.
+    """
+    global rate_limit_limit, rate_limit_remaining
+    timings, _, start_time, start_ns = started
+    total = time.perf_counter() - start_time
+    connect = timings.between("connect_tcp.started", "connect_tcp.complete")
+    tls = timings.between("start_tls.started", "start_tls.complete")
+    ttfb = timings.between("send_request_headers.started", "receive_response_headers.complete")
+    status = bytes_in = bytes_out = 0
+    if response is not None:
+        status = response.status_code
+        bytes_in = len(response.content)
+        bytes_out = len(response.request.content)
+        limit = response.headers.get("X-RateLimit-Limit")
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if limit is not None and limit.isdigit():
+            rate_limit_limit = float(limit)
+        if remaining is not None and remaining.isdigit():
+            rate_limit_remaining = float(remaining)
+
+    metrics = _metrics_for(endpoint or "request")
+    with _lock:
+        histograms = metrics.histograms
+        histograms["total"].observe(total)
+        if connect is not None:
+            histograms["connect"].observe(connect)
+        if tls is not None:
+            histograms["tls"].observe(tls)
+        if ttfb is not None:
+            histograms["ttfb"].observe(ttfb)
+        if response is None:
+            metrics.errors += 1
+        else:
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+        metrics.bytes_in += bytes_in
+        metrics.bytes_out += bytes_out
+
+    if _hooks:
+        call = CallRecord(
+            endpoint, method, url, status, start_ns, total, connect, tls, ttfb, bytes_in, bytes_out, error
+        )
+        for hook in list(_hooks):
+            try:
+                hook(call)
+            except Exception:
+                pass
+
+
+def record_decode(endpoint: str, seconds: float) -> None:
+    metrics = _metrics_for(endpoint)
+    with _lock:
+        metrics.histograms["decode"].observe(seconds)
+
+
+def headroom() -> float:
+    """
+    Returns:
+        float: Share of the server-side rate-limit budget left according to the last response (0-1), or None before
+            any response carried the headers.
+    """
+    if not rate_limit_limit or rate_limit_remaining is None:
+        return None
+    return rate_limit_remaining / rate_limit_limit
+
+
+def snapshot() -> dict[str, dict[str, any]]:
+    """
+    Returns:
+        dict[str, dict[str, any]]: Per endpoint: call count, p50/p99 of each phase (bucket upper bounds, seconds),
+            status counters, errors and bytes in/out.
+    """
+    with _lock:
+        return {
+            endpoint: {
+                "calls": metrics.histograms["total"].count,
+                **{
+                    phase: {"p50": histogram.quantile(0.5), "p99": histogram.quantile(0.99), "count": histogram.count}
+                    for phase, histogram in metrics.histograms.items()
+                    if histogram.count
+                },
+                "statuses": dict(metrics.statuses),
+                "errors": metrics.errors,
+                "bytes_in": metrics.bytes_in,
+                "bytes_out": metrics.bytes_out,
+            }
+            for endpoint, metrics in _endpoints.items()
+        }
+
+
+def _format(value: float) -> str:
+    return "+Inf" if value == float("inf") else repr(float(value))
+
+
+def prometheus_text() -> str:
+    """
+    Renders every metric in the Prometheus text exposition format, ready to serve from a `/metrics` handler.
+
+    Returns:
+        str: The exposition text.
+    """
+    from core import rate_limiter
+
+    lines = [
+        "# HELP apca_request_duration_seconds Alpaca API call latency by endpoint and phase.",
+        "# TYPE apca_request_duration_seconds histogram",
+    ]
+    with _lock:
+        endpoints = list(_endpoints.items())
+        for endpoint, metrics in endpoints:
+            for phase, histogram in metrics.histograms.items():
+                if not histogram.count:
+                    continue
+                labels = f'endpoint="{endpoint}",phase="{phase}"'
+                cumulative = 0
+                for bound, count in zip((*LATENCY_BUCKETS, float("inf")), histogram.counts):
+                    cumulative += count
+                    lines.append(f'apca_request_duration_seconds_bucket{{{labels},le="{_format(bound)}"}} {cumulative}')
+                lines.append(f"apca_request_duration_seconds_sum{{{labels}}} {histogram.sum!r}")
+                lines.append(f"apca_request_duration_seconds_count{{{labels}}} {histogram.count}")
+        lines += [
+            "# HELP apca_responses_total Responses by endpoint and HTTP status.",
+            "# TYPE apca_responses_total counter",
+        ]
+        for endpoint, metrics in endpoints:
+            for status, count in sorted(metrics.statuses.items()):
+                lines.append(f'apca_responses_total{{endpoint="{endpoint}",status="{status}"}} {count}')
+        lines += [
+            "# HELP apca_request_errors_total Attempts that ended without a response.",
+            "# TYPE apca_request_errors_total counter",
+        ]
+        for endpoint, metrics in endpoints:
+            lines.append(f'apca_request_errors_total{{endpoint="{endpoint}"}} {metrics.errors}')
+        lines += ["# HELP apca_received_bytes_total Response body bytes.", "# TYPE apca_received_bytes_total counter"]
+        for endpoint, metrics in endpoints:
+            lines.append(f'apca_received_bytes_total{{endpoint="{endpoint}"}} {metrics.bytes_in}')
+        lines += ["# HELP apca_sent_bytes_total Request body bytes.", "# TYPE apca_sent_bytes_total counter"]
+        for endpoint, metrics in endpoints:
+            lines.append(f'apca_sent_bytes_total{{endpoint="{endpoint}"}} {metrics.bytes_out}')
+    lines += [
+        "# HELP apca_rate_limiter_tokens Tokens left in the client-side rate limiter.",
+        "# TYPE apca_rate_limiter_tokens gauge",
+        f"apca_rate_limiter_tokens {rate_limiter.limiter.tokens!r}",
+    ]
+    if rate_limit_remaining is not None:
+        lines += [
+            "# HELP apca_rate_limit_remaining X-RateLimit-Remaining from the last response.",
+            "# TYPE apca_rate_limit_remaining gauge",
+            f"apca_rate_limit_remaining {rate_limit_remaining!r}",
+        ]
+    if rate_limit_limit is not None:
+        lines += [
+            "# HELP apca_rate_limit_limit X-RateLimit-Limit from the last response.",
+            "# TYPE apca_rate_limit_limit gauge",
+            f"apca_rate_limit_limit {rate_limit_limit!r}",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+def opentelemetry_hook(tracer: any = None) -> Callable[[CallRecord], None]:
+    """
+    Builds a hook that turns every HTTP attempt into an OpenTelemetry client span. Register it with `add_hook`.
+    Args:
+        tracer (any, optional): An OpenTelemetry tracer. Defaults to the global provider's tracer for this package.
+
+    Returns:
+        Callable[[CallRecord], None]: The hook.
+    """
+    try:
+        from opentelemetry import trace
+    except ImportError as exc:  # optional dependency, see requirements-optional.txt
+        raise ImportError("OpenTelemetry spans need opentelemetry-api: pip install opentelemetry-api") from exc
+    tracer = tracer or trace.get_tracer("apiTrading")
+
+    def hook(call: CallRecord) -> None:
+        span = tracer.start_span(call.endpoint or "request", kind=trace.SpanKind.CLIENT, start_time=call.start_ns)
+        span.set_attribute("http.request.method", call.method)
+        span.set_attribute("url.full", call.url)
+        span.set_attribute("http.request.body.size", call.bytes_out)
+        span.set_attribute("http.response.body.size", call.bytes_in)
+        if call.status:
+            span.set_attribute("http.response.status_code", call.status)
+        for phase in ("connect", "tls", "ttfb"):
+            value = getattr(call, phase)
+            if value is not None:
+                span.set_attribute(f"apca.{phase}_seconds", value)
+        if call.error is not None:
+            span.record_exception(call.error)
+        if call.error is not None or call.status >= 500:
+            span.set_status(trace.Status(trace.StatusCode.ERROR))
+        span.end(end_time=call.start_ns + int(call.total * 1e9))
+
+    return hook
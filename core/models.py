@@ -0,0 +1,332 @@
+import datetime
+import sys
+from decimal import Decimal
+from typing import NamedTuple
+
+# Compact, immutable records for the order, position and activity endpoints. Each record is parsed once from the
+# decoded JSON: numeric strings become Decimal, timestamps become integer nanoseconds since the epoch (UTC), and
+# symbols and other short enumerations are interned so thousands of records share one string object. Records are
+# named tuples rather than frozen dataclasses: same fixed layout and immutability, several times cheaper to build.
+
+# Orders in any of these states can no longer fill.
+CLOSED_ORDER_STATUSES = frozenset({"filled", "canceled", "expired", "replaced", "rejected", "done_for_day"})
+
+_intern = sys.intern
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_EPOCH_ORDINAL = _EPOCH.toordinal()
+_SECOND = datetime.timedelta(seconds=1)
+
+# Short numeric strings ("0", "1", "100", ...) repeat across records, so their Decimal is built once and shared.
+_SHARED_DECIMAL_MAX_LENGTH = 4
+_shared_decimals: dict[str, Decimal] = {}
+# Epoch seconds at midnight UTC, by 'YYYY-MM-DD' prefix.
+_day_seconds: dict[str, int] = {}
+
+
+def decimal_or_none(value: any) -> Decimal:
+    """
+    Returns:
+        Decimal: `value` as a Decimal, or None for null and empty strings.
+    """
+    if value is None or value == "":
+        return None
+    if len(value) > _SHARED_DECIMAL_MAX_LENGTH:
+        return Decimal(value)
+    shared = _shared_decimals.get(value)
+    if shared is None:
+        shared = _shared_decimals[value] = Decimal(value)
+    return shared
+
+
+def intern_or_none(value: str) -> str:
+    return _intern(value) if value else value
+
+
+def epoch_ns(value: str) -> int:
+    """
+    Args:
+        value (str): An RFC 3339 timestamp such as '2025-03-01T14:30:00.123456789Z' (any precision, any offset).
+
+    Returns:
+        int: Nanoseconds since the Unix epoch, or None for null and empty strings.
+    """
+    if not value:
+        return None
+    if value[-1] == "Z" and len(value) >= 20 and value[10] == "T" and value[19] in ".Z":
+        # Fast path for Alpaca's usual 'YYYY-MM-DDTHH:MM:SS[.fffffffff]Z' form.
+        day = _day_seconds.get(value[:10])
+        if day is None:
+            day = _day_seconds[value[:10]] = (
+                datetime.date.fromisoformat(value[:10]).toordinal() - _EPOCH_ORDINAL
+            ) * 86400
+        seconds = day + int(value[11:13]) * 3600 + int(value[14:16]) * 60 + int(value[17:19])
+        fraction = value[20:-1]
+        return seconds * 1_000_000_000 + (int(fraction[:9].ljust(9, "0")) if fraction else 0)
+    whole, dot, rest = value.partition(".")
+    fraction = ""
+    if dot:
+        digits = len(rest) - len(rest.lstrip("0123456789"))
+        fraction, whole = rest[:digits], whole + rest[digits:]
+    moment = datetime.datetime.fromisoformat(whole)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.timezone.utc)
+    seconds = (moment - _EPOCH) // _SECOND
+    return seconds * 1_000_000_000 + (int(fraction[:9].ljust(9, "0")) if fraction else 0)
+
+
+class Order(NamedTuple):
+    id: str
+    client_order_id: str
+    symbol: str
+    asset_id: str
+    asset_class: str
+    side: str
+    type: str
+    time_in_force: str
+    status: str
+    order_class: str
+    position_intent: str
+    extended_hours: bool
+    qty: Decimal
+    notional: Decimal
+    filled_qty: Decimal
+    filled_avg_price: Decimal
+    limit_price: Decimal
+    stop_price: Decimal
+    trail_price: Decimal
+    trail_percent: Decimal
+    hwm: Decimal
+    created_at: int
+    updated_at: int
+    submitted_at: int
+    filled_at: int
+    expired_at: int
+    canceled_at: int
+    failed_at: int
+    replaced_at: int
+    replaced_by: str
+    replaces: str
+    legs: tuple["Order", ...]
+
+    @classmethod
+    def from_dict(cls, order: dict[str, any]) -> "Order":
+        """
+        Args:
+            order (dict[str, any]): One order as returned by the orders endpoints.
+
+        Returns:
+            Order: The parsed order; bracket/OCO `legs` are parsed recursively.
+        """
+        get = order.get
+        legs = get("legs")
+        return cls(
+            order["id"],
+            get("client_order_id"),
+            intern_or_none(get("symbol")),
+            get("asset_id"),
+            intern_or_none(get("asset_class")),
+            intern_or_none(get("side")),
+            intern_or_none(get("type") or get("order_type")),
+            intern_or_none(get("time_in_force")),
+            intern_or_none(get("status")),
+            intern_or_none(get("order_class")),
+            intern_or_none(get("position_intent")),
+            bool(get("extended_hours")),
+            decimal_or_none(get("qty")),
+            decimal_or_none(get("notional")),
+            decimal_or_none(get("filled_qty")),
+            decimal_or_none(get("filled_avg_price")),
+            decimal_or_none(get("limit_price")),
+            decimal_or_none(get("stop_price")),
+            decimal_or_none(get("trail_price")),
+            decimal_or_none(get("trail_percent")),
+            decimal_or_none(get("hwm")),
+            epoch_ns(get("created_at")),
+            epoch_ns(get("updated_at")),
+            epoch_ns(get("submitted_at")),
+            epoch_ns(get("filled_at")),
+            epoch_ns(get("expired_at")),
+            epoch_ns(get("canceled_at")),
+            epoch_ns(get("failed_at")),
+            epoch_ns(get("replaced_at")),
+            get("replaced_by"),
+            get("replaces"),
+            tuple(map(cls.from_dict, legs)) if legs else (),
+        )
+
+
+class Position(NamedTuple):
+    asset_id: str
+    symbol: str
+    exchange: str
+    asset_class: str
+    side: str
+    asset_marginable: bool
+    qty: Decimal
+    qty_available: Decimal
+    avg_entry_price: Decimal
+    market_value: Decimal
+    cost_basis: Decimal
+    unrealized_pl: Decimal
+    unrealized_plpc: Decimal
+    unrealized_intraday_pl: Decimal
+    unrealized_intraday_plpc: Decimal
+    current_price: Decimal
+    lastday_price: Decimal
+    change_today: Decimal
+
+    @classmethod
+    def from_dict(cls, position: dict[str, any]) -> "Position":
+        """
+        Args:
+            position (dict[str, any]): One position as returned by the positions endpoints.
+
+        Returns:
+            Position: The parsed position.
+        """
+        get = position.get
+        return cls(
+            get("asset_id"),
+            intern_or_none(position["symbol"]),
+            intern_or_none(get("exchange")),
+            intern_or_none(get("asset_class")),
+            intern_or_none(get("side")),
+            bool(get("asset_marginable")),
+            decimal_or_none(get("qty")),
+            decimal_or_none(get("qty_available")),
+            decimal_or_none(get("avg_entry_price")),
+            decimal_or_none(get("market_value")),
+            decimal_or_none(get("cost_basis")),
+            decimal_or_none(get("unrealized_pl")),
+            decimal_or_none(get("unrealized_plpc")),
+            decimal_or_none(get("unrealized_intraday_pl")),
+            decimal_or_none(get("unrealized_intraday_plpc")),
+            decimal_or_none(get("current_price")),
+            decimal_or_none(get("lastday_price")),
+            decimal_or_none(get("change_today")),
+        )
+
+
+class Activity(NamedTuple):
+    """
+    Trade (FILL) and non-trade activities share this record; fields an activity type does not carry are None.
+    `date` stays a 'YYYY-MM-DD' string since it is a calendar day rather than a point in time.
+    """
+
+    id: str
+    activity_type: str
+    transaction_time: int
+    date: str
+    type: str
+    symbol: str
+    side: str
+    qty: Decimal
+    price: Decimal
+    cum_qty: Decimal
+    leaves_qty: Decimal
+    order_id: str
+    order_status: str
+    net_amount: Decimal
+    per_share_amount: Decimal
+    description: str
+    status: str
+
+    @classmethod
+    def from_dict(cls, activity: dict[str, any]) -> "Activity":
+        """
+        Args:
+            activity (dict[str, any]): One activity as returned by the account activities endpoints.
+
+        Returns:
+            Activity: The parsed activity.
+        """
+        get = activity.get
+        return cls(
+            activity["id"],
+            intern_or_none(get("activity_type")),
+            epoch_ns(get("transaction_time")),
+            get("date"),
+            intern_or_none(get("type")),
+            intern_or_none(get("symbol")),
+            intern_or_none(get("side")),
+            decimal_or_none(get("qty")),
+            decimal_or_none(get("price")),
+            decimal_or_none(get("cum_qty")),
+            decimal_or_none(get("leaves_qty")),
+            get("order_id"),
+            intern_or_none(get("order_status")),
+            decimal_or_none(get("net_amount")),
+            decimal_or_none(get("per_share_amount")),
+            get("description"),
+            intern_or_none(get("status")),
+        )
+
+
+class TradeUpdate(NamedTuple):
+    """
+    One event of the trade_updates stream: what happened (`event`, e.g. 'new', 'partial_fill', 'fill', 'canceled')
+    and the order as it stands afterwards. `previous_status` is the order's status before the event when it was
+    known locally; `backfilled` marks updates reconstructed from `get_all_orders` after a stream gap.
+    """
+
+    event: str
+    order: Order
+    timestamp: int
+    execution_id: str
+    price: Decimal
+    qty: Decimal
+    position_qty: Decimal
+    previous_status: str
+    backfilled: bool
+
+    @classmethod
+    def from_dict(cls, update: dict[str, any], previous_status: str = None) -> "TradeUpdate":
+        """
+        Args:
+            update (dict[str, any]): The `data` object of a trade_updates message.
+            previous_status (str, optional): The order's status before this event. Defaults to None.
+
+        Returns:
+            TradeUpdate: The parsed event.
+        """
+        get = update.get
+        return cls(
+            _intern(update["event"]),
+            Order.from_dict(update["order"]),
+            epoch_ns(get("timestamp")),
+            get("execution_id"),
+            decimal_or_none(get("price")),
+            decimal_or_none(get("qty")),
+            decimal_or_none(get("position_qty")),
+            previous_status,
+            False,
+        )
+
+
+ENDPOINT_MODELS: dict[str, type] = {
+    "create_order": Order,
+    "get_all_orders": Order,
+    "get_order_by_client_order_id": Order,
+    "get_order_by_id": Order,
+    "replace_order_by_id": Order,
+    "get_all_open_positions": Position,
+    "get_open_position": Position,
+    "close_position": Order,
+    "get_account_activities": Activity,
+    "get_account_activities_by_type": Activity,
+}
+
+
+def from_body(endpoint: str, body: any) -> any:
+    """
+    Args:
+        endpoint (str): The endpoint name the body came from (e.g. 'get_all_orders').
+        body (any): The decoded, successful response body: one record or a list of records.
+
+    Returns:
+        any: The matching model, or a list of models for list responses.
+    """
+    model = ENDPOINT_MODELS[endpoint]
+    if isinstance(body, list):
+        return list(map(model.from_dict, body))
+    return model.from_dict(body)
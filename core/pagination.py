@@ -0,0 +1,105 @@
+import asyncio
+import queue
+import threading
+from typing import AsyncIterator, Awaitable, Callable, Iterator
+
+# A page fetcher takes the cursor of the page to load and returns (records, cursor of the next page or None).
+PageFetcher = Callable[[any], tuple[list, any]]
+AsyncPageFetcher = Callable[[any], Awaitable[tuple[list, any]]]
+
+_DONE = object()
+
+
+class _Failure:
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def iterate(fetch_page: PageFetcher, cursor: any, prefetch: int = 1) -> Iterator[any]:
+    """
+    Streams every record across pages. A background thread loads up to `prefetch` pages ahead while the caller
+    consumes the current one, so memory stays bounded to `prefetch + 1` pages however long the history is.
+    Args:
+        fetch_page (PageFetcher): Loads one page for a cursor.
+        cursor (any): Cursor of the first page.
+        prefetch (int, optional): Number of pages to load ahead. 0 disables the background thread. Defaults to 1.
+
+    Yields:
+        any: Each record, in the order the API returned them.
+    """
+    if prefetch <= 0:
+        while cursor is not None:
+            records, cursor = fetch_page(cursor)
+            yield from records
+        return
+
+    pages: queue.Queue = queue.Queue(maxsize=prefetch)
+    stopped = threading.Event()
+
+    def put(item: any) -> bool:
+        while not stopped.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce(next_cursor: any) -> None:
+        try:
+            while next_cursor is not None:
+                records, next_cursor = fetch_page(next_cursor)
+                if not put(records):
+                    return
+        except BaseException as exc:
+            put(_Failure(exc))
+            return
+        put(_DONE)
+
+    producer = threading.Thread(target=produce, args=(cursor,), daemon=True)
+    producer.start()
+    try:
+        while (item := pages.get()) is not _DONE:
+            if isinstance(item, _Failure):
+                raise item.error
+            yield from item
+    finally:
+        stopped.set()
+
+
+async def iterate_async(fetch_page: AsyncPageFetcher, cursor: any, prefetch: int = 1) -> AsyncIterator[any]:
+    """
+    Async twin of `iterate`; the next pages are loaded by a background task on the running event loop.
+    """
+    if prefetch <= 0:
+        while cursor is not None:
+            records, cursor = await fetch_page(cursor)
+            for record in records:
+                yield record
+        return
+
+    pages: asyncio.Queue = asyncio.Queue(maxsize=prefetch)
+
+    async def produce(next_cursor: any) -> None:
+        try:
+            while next_cursor is not None:
+                records, next_cursor = await fetch_page(next_cursor)
+                await pages.put(records)
+        except asyncio.CancelledError:
+            raise
+        except BaseException as exc:
+            await pages.put(_Failure(exc))
+            return
+        await pages.put(_DONE)
+
+    producer = asyncio.create_task(produce(cursor))
+    try:
+        while (item := await pages.get()) is not _DONE:
+            if isinstance(item, _Failure):
+                raise item.error
+            for record in item:
+                yield record
+    finally:
+        producer.cancel()
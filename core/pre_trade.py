@@ -0,0 +1,82 @@
+import os
+import sys
+from typing import Protocol
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core import registry
+from core.http_client import ApiRequest
+
+# Code and source marker of the error bodies returned for orders rejected locally. `error_from_body` turns them into
+# `AlpacaAPIError`s like any server-side rejection; the "source" key tells the two apart.
+LOCAL_SOURCE = "pre_trade"
+
+
+class OrderValidator(Protocol):
+    """
+    What `install` expects; `services.pre_trade_validator.PreTradeValidator` is the stock implementation.
+    """
+
+    def check(self, order_data: dict) -> dict: ...
+
+    def record(self, order_data: dict, response_json: any) -> None: ...
+
+
+_validators: dict[bool, OrderValidator] = {}
+
+
+def rejection(code: int, message: str) -> dict[str, any]:
+    """
+    Returns:
+        dict[str, any]: An error body in Alpaca's format, marked as a local rejection.
+    """
+    return {"code": code, "message": message, "source": LOCAL_SOURCE}
+
+
+class _Hook:
+    """
+    The `core.registry` hook on `create_order` (`create_order_async` alike) that runs the installed validators.
+    """
+
+    def before(self, paper_trading: bool, api_request: ApiRequest) -> dict[str, any]:
+        return check(paper_trading, api_request.json)
+
+    def after(self, paper_trading: bool, api_request: ApiRequest, response_json: any) -> None:
+        record(paper_trading, api_request.json, response_json)
+
+
+_hook = _Hook()
+
+
+def install(paper_trading: bool, validator: OrderValidator) -> None:
+    """
+    Runs `validator` before every `create_order` of the paper (True) or live (False) account, so orders it can tell
+    are invalid are rejected without a round trip.
+    """
+    if not _validators:
+        registry.add_hook(_hook, ("create_order",))
+    _validators[paper_trading] = validator
+
+
+def uninstall(paper_trading: bool) -> None:
+    _validators.pop(paper_trading, None)
+    if not _validators:
+        registry.remove_hook(_hook)
+
+
+def check(paper_trading: bool, order_data: dict) -> dict[str, any]:
+    """
+    Returns:
+        dict[str, any]: The error body to return instead of sending the order, or None to send it.
+    """
+    validator = _validators.get(paper_trading)
+    return None if validator is None else validator.check(order_data)
+
+
+def record(paper_trading: bool, order_data: dict, response_json: any) -> None:
+    """
+    Lets the installed validator account for a submitted order (e.g. reserve its buying power).
+    """
+    validator = _validators.get(paper_trading)
+    if validator is not None:
+        validator.record(order_data, response_json)
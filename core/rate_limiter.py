@@ -0,0 +1,160 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import httpx
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import rate_limit_enabled, rate_limit_per_minute
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+# Order placement and cancels must never starve behind bulk reads.
+ENDPOINT_PRIORITIES: dict[str, int] = {
+    "create_order": PRIORITY_HIGH,
+    "replace_order_by_id": PRIORITY_HIGH,
+    "delete_order_by_id": PRIORITY_HIGH,
+    "delete_all_orders": PRIORITY_HIGH,
+    "close_position": PRIORITY_HIGH,
+    "close_all_positions": PRIORITY_HIGH,
+    "exercise_options_position": PRIORITY_HIGH,
+    "get_assets": PRIORITY_LOW,
+    "get_asset_by_id_or_symbol": PRIORITY_LOW,
+    "get_all_watchlists": PRIORITY_LOW,
+    "create_watchlist": PRIORITY_LOW,
+    "get_watchlist_by_id": PRIORITY_LOW,
+    "update_watchlist_by_id": PRIORITY_LOW,
+    "add_asset_to_watchlist": PRIORITY_LOW,
+    "delete_watchlist_by_id": PRIORITY_LOW,
+    "get_watchlist_by_name": PRIORITY_LOW,
+    "update_watchlist_by_name": PRIORITY_LOW,
+    "add_asset_to_watchlist_by_name": PRIORITY_LOW,
+    "delete_watchlist_by_name": PRIORITY_LOW,
+    "delete_symbol_from_watchlist": PRIORITY_LOW,
+}
+
+# Share of the bucket each lane must leave untouched for the lanes above it.
+LANE_RESERVES: dict[int, float] = {PRIORITY_HIGH: 0.0, PRIORITY_NORMAL: 0.05, PRIORITY_LOW: 0.2}
+
+
+def _header_number(response_headers: httpx.Headers, name: str) -> float:
+    value = response_headers.get(name)
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket usable from both blocking and async code. Each lane may only spend tokens above its
+    reserve, so when the bucket runs low the remaining tokens go to higher-priority calls first.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float, reserves: dict[int, float] = None) -> None:
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._reserves = reserves or {}
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    def _take(self, priority: int) -> float:
+        """
+        Returns:
+            float: 0 if a token was taken, otherwise the number of seconds to wait before trying again.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            self._refill(now)
+            floor = self._reserves.get(priority, 0.0) * self.capacity
+            if self._tokens - 1 >= floor:
+                self._tokens -= 1
+                return 0.0
+            return (floor + 1 - self._tokens) / self.refill_per_second
+
+    def acquire(self, priority: int = PRIORITY_NORMAL) -> None:
+        """
+        Blocks until a token is available for `priority`.
+        """
+        while (wait := self._take(priority)) > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, priority: int = PRIORITY_NORMAL) -> None:
+        """
+        Async twin of `acquire`.
+        """
+        while (wait := self._take(priority)) > 0:
+            await asyncio.sleep(wait)
+
+    def observe(self, response: httpx.Response) -> None:
+        """
+        Re-aligns the bucket with the server's view from the `X-RateLimit-*` headers. A 429 or an exhausted budget
+        blocks every lane until `X-RateLimit-Reset`.
+        Args:
+            response (httpx.Response): Any response from the Alpaca API.
+        """
+        limit = _header_number(response.headers, "X-RateLimit-Limit")
+        remaining = _header_number(response.headers, "X-RateLimit-Remaining")
+        reset = _header_number(response.headers, "X-RateLimit-Reset")
+        now = time.monotonic()
+        with self._lock:
+            self._refill(now)
+            if limit:
+                self.capacity = limit
+                self.refill_per_second = limit / 60.0
+            if remaining is not None:
+                self._tokens = min(self._tokens, remaining)
+            if response.status_code == 429 or remaining == 0:
+                wait = reset - time.time() if reset else 1.0
+                self._tokens = 0.0
+                self._blocked_until = max(self._blocked_until, now + min(max(wait, 0.0), 60.0))
+
+
+limiter = TokenBucket(
+    capacity=rate_limit_per_minute, refill_per_second=rate_limit_per_minute / 60.0, reserves=LANE_RESERVES
+)
+
+
+def acquire(endpoint: str) -> None:
+    """
+    Waits on the shared limiter before calling `endpoint`. No-op when rate limiting is disabled in config.
+    Args:
+        endpoint (str): Endpoint function name, used to pick the priority lane.
+    """
+    if rate_limit_enabled:
+        limiter.acquire(ENDPOINT_PRIORITIES.get(endpoint, PRIORITY_NORMAL))
+
+
+async def acquire_async(endpoint: str) -> None:
+    """
+    Async twin of `acquire`.
+    """
+    if rate_limit_enabled:
+        await limiter.acquire_async(ENDPOINT_PRIORITIES.get(endpoint, PRIORITY_NORMAL))
+
+
+def observe(response: httpx.Response) -> None:
+    """
+    Feeds a response's rate-limit headers back into the shared limiter.
+    """
+    if rate_limit_enabled:
+        limiter.observe(response)
@@ -0,0 +1,482 @@
+import dataclasses
+import datetime
+import inspect
+import os
+import string
+import sys
+from typing import AsyncIterator, Callable, Iterable, Iterator, Protocol
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import live_trading_base_url, paper_trading_base_url
+from core import http_client, pagination
+from core.errors import error_from_body
+from core.http_client import ApiRequest
+from core.models import epoch_ns
+
+# When an optional query or body argument is sent: when truthy (what most endpoints did by hand), or whenever it is
+# not None (booleans such as `nested`, where False is meaningful).
+TRUTHY = "truthy"
+NOT_NONE = "not_none"
+
+PAGINATION_STYLES = ("next_page_token", "last_id", "offset", "time_window")
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Arg:
+    """
+    One argument of an endpoint function, in signature order, and where it goes in the request.
+    """
+
+    name: str
+    # "path" (template placeholder), "query", "body" (one field of the JSON body) or "json" (the whole JSON body)
+    location: str
+    type: type = str
+    required: bool = False
+    default: any = None
+    # Query/body key when it differs from the argument name (e.g. 'expiration_date.gte').
+    wire: str = None
+    send: str = TRUTHY
+
+
+def path(name: str, type: type = str) -> Arg:
+    return Arg(name, "path", type, required=True)
+
+
+def query(
+    name: str, type: type = str, required: bool = False, default: any = None, wire: str = None, send: str = TRUTHY
+) -> Arg:
+    return Arg(name, "query", type, required, default, wire, send)
+
+
+def body(name: str, type: type = str, required: bool = False, default: any = None, send: str = TRUTHY) -> Arg:
+    return Arg(name, "body", type, required, default, send=send)
+
+
+def json_body(name: str) -> Arg:
+    return Arg(name, "json", dict, required=True)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Pagination:
+    """
+    How `paginate` walks an endpoint page by page:
+
+    - "next_page_token": the body is `{items_key: [...], "next_page_token": ...}`; `page_token` is the cursor.
+    - "last_id": the body is a list; the id of its last record is the next `page_token`.
+    - "offset": the body is a list; `offset` advances by the records received.
+    - "time_window": the body is a list of orders; the next page starts at the last `submitted_at` (`after` when
+      ascending, `until` when descending) and skips the orders already yielded at that instant.
+
+    A list page shorter than the `size` argument (`default_size` when it is passed as None) ends the walk.
+    """
+
+    style: str
+    # Argument carrying the page size, and its default in the iterator.
+    size: str = None
+    default_size: int = None
+    items_key: str = None
+    doc: str = None
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Endpoint:
+    """
+    Declarative description of one API call; `define` turns it into the sync and async endpoint functions.
+    """
+
+    name: str
+    method: str
+    # Relative to the base URL, with `{placeholders}` for "path" arguments, e.g. '/orders/{order_id}'.
+    path: str
+    args: tuple[Arg, ...] = ()
+    # Accept the `typed` / `as_models` flags of `ApiRequest`.
+    typed: bool = False
+    as_models: bool = False
+    # False for calls that must not be replayed after an ambiguous failure although their method allows it.
+    idempotent: bool = True
+    # Last touch on the built request, for what a schema cannot express (e.g. adding a client_order_id).
+    prepare: Callable[[bool, ApiRequest], ApiRequest] = None
+    doc: str = None
+
+
+class BaseUrls:
+    """
+    Where paper (True) and live (False) calls go. Every generated function reads these at call time, so
+    `set_base_url` redirects all endpoints at once (e.g. to a local mock server).
+    """
+
+    __slots__ = ("paper", "live")
+
+    def __init__(self, paper: str, live: str) -> None:
+        self.paper = paper
+        self.live = live
+
+
+base_urls = BaseUrls(paper_trading_base_url, live_trading_base_url)
+
+
+def set_base_url(paper_trading: bool, url: str) -> str:
+    """
+    Returns:
+        str: The previous base URL of the paper (True) or live (False) account, to restore later.
+    """
+    previous = base_urls.paper if paper_trading else base_urls.live
+    if paper_trading:
+        base_urls.paper = url
+    else:
+        base_urls.live = url
+    return previous
+
+
+class Hook(Protocol):
+    """
+    Cross-cutting layer run around every endpoint call it is registered for (see `add_hook`).
+    """
+
+    def before(self, paper_trading: bool, api_request: ApiRequest) -> any:
+        """
+        Returns:
+            any: A response to return without sending the request, or None to go on.
+        """
+
+    def after(self, paper_trading: bool, api_request: ApiRequest, response_json: any) -> None: ...
+
+
+# (hook, endpoint names or None for all); the generated functions skip hook handling entirely while it is empty.
+_hooks: list[tuple[Hook, frozenset]] = []
+
+
+def add_hook(hook: Hook, endpoints: Iterable[str] = None) -> None:
+    """
+    Args:
+        hook (Hook): Runs `before` each matching call (and may answer it) and `after` each response.
+        endpoints (Iterable[str], optional): Endpoint names it applies to. Defaults to None (all).
+    """
+    _hooks.append((hook, None if endpoints is None else frozenset(endpoints)))
+
+
+def remove_hook(hook: Hook) -> None:
+    _hooks[:] = [(registered, names) for registered, names in _hooks if registered is not hook]
+
+
+def _matching(api_request: ApiRequest) -> list[Hook]:
+    return [hook for hook, names in _hooks if names is None or api_request.endpoint in names]
+
+
+def _execute_hooked(paper_trading: bool, api_request: ApiRequest) -> any:
+    hooks = _matching(api_request)
+    for hook in hooks:
+        response_json = hook.before(paper_trading, api_request)
+        if response_json is not None:
+            return response_json
+    response_json = http_client.execute(api_request)
+    for hook in hooks:
+        hook.after(paper_trading, api_request, response_json)
+    return response_json
+
+
+async def _execute_hooked_async(paper_trading: bool, api_request: ApiRequest) -> any:
+    hooks = _matching(api_request)
+    for hook in hooks:
+        response_json = hook.before(paper_trading, api_request)
+        if response_json is not None:
+            return response_json
+    response_json = await http_client.execute_async(api_request)
+    for hook in hooks:
+        hook.after(paper_trading, api_request, response_json)
+    return response_json
+
+
+# Every defined endpoint, by name.
+ENDPOINTS: dict[str, Endpoint] = {}
+
+
+def _parameters(endpoint: Endpoint) -> list[inspect.Parameter]:
+    kind = inspect.Parameter.POSITIONAL_OR_KEYWORD
+    parameters = [inspect.Parameter("paper_trading", kind, annotation=bool)]
+    for arg in endpoint.args:
+        default = inspect.Parameter.empty if arg.required else arg.default
+        parameters.append(inspect.Parameter(arg.name, kind, default=default, annotation=arg.type))
+    for flag in ("typed", "as_models"):
+        if getattr(endpoint, flag):
+            parameters.append(inspect.Parameter(flag, kind, default=False, annotation=bool))
+    return parameters
+
+
+def _assignments(target: str, args: list[Arg]) -> list[str]:
+    """
+    Returns:
+        list[str]: Source lines filling the `target` dict from `args`, required keys in the literal.
+    """
+    required = ", ".join(f"{arg.wire or arg.name!r}: {arg.name}" for arg in args if arg.required)
+    lines = [f"    {target} = {{{required}}}"]
+    for arg in args:
+        if arg.required:
+            continue
+        condition = arg.name if arg.send == TRUTHY else f"{arg.name} is not None"
+        lines.append(f"    if {condition}:")
+        lines.append(f"        {target}[{arg.wire or arg.name!r}] = {arg.name}")
+    return lines
+
+
+def _builder_source(endpoint: Endpoint) -> tuple[str, list[str]]:
+    """
+    Returns:
+        tuple[str, list[str]]: The parameter list and the statements that leave the built request in `api_request`;
+            the precompiled form of the endpoint, equivalent to the hand-written request builders it replaces.
+    """
+    parameters = ["paper_trading"]
+    for arg in endpoint.args:
+        parameters.append(arg.name if arg.required else f"{arg.name}=_defaults[{arg.name!r}]")
+    flags = [flag for flag in ("typed", "as_models") if getattr(endpoint, flag)]
+    parameters += [f"{flag}=False" for flag in flags]
+
+    lines = [f"    url = f'{{_base.paper if paper_trading else _base.live}}{endpoint.path}'"]
+    query_args = [arg for arg in endpoint.args if arg.location == "query"]
+    body_args = [arg for arg in endpoint.args if arg.location == "body"]
+    json_args = [arg for arg in endpoint.args if arg.location == "json"]
+    params = "None"
+    if query_args:
+        lines += _assignments("params", query_args)
+        params = "params"
+    data = json_args[0].name if json_args else "None"
+    if body_args:
+        lines += _assignments("data", body_args)
+        data = "data"
+    keywords = [f"endpoint={endpoint.name!r}", f"method={endpoint.method!r}", "url=url"]
+    if params != "None":
+        keywords.append(f"params={params}")
+    if data != "None":
+        keywords.append(f"json={data}")
+    if not endpoint.idempotent:
+        keywords.append("idempotent=False")
+    keywords += [f"{flag}={flag}" for flag in flags]
+    lines.append(f"    api_request = _ApiRequest({', '.join(keywords)})")
+    if endpoint.prepare is not None:
+        lines.append("    api_request = _prepare(paper_trading, api_request)")
+    return ", ".join(parameters), lines
+
+
+def define(endpoint: Endpoint) -> tuple[Callable[..., dict[str, any]], Callable[..., dict[str, any]]]:
+    """
+    Generates the endpoint functions from `endpoint`: the URL template and the query/body encoders are compiled into
+    straight-line code once, ending in the same `ApiRequest(...)` call the hand-written builders made. Paper calls go
+    to `base_urls.paper`, live calls to `base_urls.live`, and registered hooks run around both.
+
+    The sync function also carries `build(...)`, which takes the same arguments and returns the `ApiRequest` without
+    sending it.
+
+    Returns:
+        tuple[Callable, Callable]: The sync function and its async twin.
+    """
+    placeholders = {arg.name for arg in endpoint.args if arg.location == "path"}
+    if placeholders != set(_template_fields(endpoint.path)):
+        raise ValueError(f"{endpoint.name}: path arguments {sorted(placeholders)} do not match {endpoint.path!r}")
+    if endpoint.name in ENDPOINTS:
+        raise ValueError(f"endpoint {endpoint.name!r} is already defined")
+
+    parameters, lines = _builder_source(endpoint)
+    statements = "\n".join(lines)
+    source = f"""
+def build({parameters}):
+{statements}
+    return api_request
+
+def {endpoint.name}({parameters}):
+{statements}
+    if _hooks:
+        return _execute_hooked(paper_trading, api_request)
+    return _http_client.execute(api_request)
+
+async def {endpoint.name}_async({parameters}):
+{statements}
+    if _hooks:
+        return await _execute_hooked_async(paper_trading, api_request)
+    return await _http_client.execute_async(api_request)
+"""
+    namespace = {
+        "_ApiRequest": ApiRequest,
+        "_base": base_urls,
+        "_defaults": {arg.name: arg.default for arg in endpoint.args},
+        "_http_client": http_client,
+        "_execute_hooked": _execute_hooked,
+        "_execute_hooked_async": _execute_hooked_async,
+        "_hooks": _hooks,
+        "_prepare": endpoint.prepare,
+    }
+    exec(compile(source, f"<endpoint {endpoint.name}>", "exec"), namespace)
+    sync_function, async_function, build = (
+        namespace[endpoint.name],
+        namespace[f"{endpoint.name}_async"],
+        namespace["build"],
+    )
+
+    signature = inspect.Signature(_parameters(endpoint), return_annotation=dict[str, any])
+    module = sys._getframe(1).f_globals.get("__name__")
+    for function, name, doc in (
+        (sync_function, endpoint.name, endpoint.doc),
+        (async_function, f"{endpoint.name}_async", _async_doc(endpoint.name)),
+        (build, f"build_{endpoint.name}", f"Builds the `ApiRequest` of `{endpoint.name}` without sending it."),
+    ):
+        function.__signature__ = signature if function is not build else signature.replace(return_annotation=ApiRequest)
+        function.__annotations__ = {
+            parameter.name: parameter.annotation for parameter in function.__signature__.parameters.values()
+        }
+        function.__annotations__["return"] = function.__signature__.return_annotation
+        function.__doc__ = inspect.cleandoc(doc) if doc else None
+        function.__name__ = function.__qualname__ = name
+        function.__module__ = module
+    sync_function.build = build
+    sync_function.endpoint = async_function.endpoint = endpoint
+    ENDPOINTS[endpoint.name] = endpoint
+    return sync_function, async_function
+
+
+def _async_doc(name: str) -> str:
+    return f"Async twin of `{name}`; takes the same arguments and returns the same value."
+
+
+def _template_fields(template: str) -> list[str]:
+    return [field for _, field, _, _ in string.Formatter().parse(template) if field]
+
+
+# Pagination
+
+
+def _checked(response_json: any) -> any:
+    error = error_from_body(response_json)
+    if error is not None:
+        raise error
+    return response_json
+
+
+def _page(style: Pagination, values: dict[str, any], cursor: tuple, response_json: any) -> tuple[list, tuple]:
+    """
+    Returns:
+        tuple[list, tuple]: The records of one page and the cursor of the next one (None after the last page).
+    """
+    response_json = _checked(response_json)
+    if style.style == "next_page_token":
+        next_page_token = response_json.get("next_page_token")
+        return response_json.get(style.items_key) or [], (next_page_token,) if next_page_token else None
+    if style.style == "time_window":
+        return _time_window_page(values, values[style.size] or style.default_size, cursor, response_json)
+    if len(response_json) < (values[style.size] or style.default_size):
+        return response_json, None
+    if style.style == "last_id":
+        return response_json, (response_json[-1]["id"],)
+    return response_json, (cursor[0] + len(response_json),)
+
+
+def _shifted(timestamp: str, nanoseconds: int) -> str:
+    seconds, fraction = divmod(epoch_ns(timestamp) + nanoseconds, 1_000_000_000)
+    moment = datetime.datetime.fromtimestamp(seconds, datetime.timezone.utc)
+    return f"{moment:%Y-%m-%dT%H:%M:%S}.{fraction:09d}Z"
+
+
+def _time_window_page(values: dict[str, any], size: int, cursor: tuple, response_json: list) -> tuple[list, tuple]:
+    """
+    Several orders can share the last submission time of a page, and `after`/`until` are exclusive, so the next page
+    starts one nanosecond inside the boundary instead and drops the orders already yielded there. The cursor is
+    (after, until, ids seen at the boundary); only the first two are sent.
+
+    Returns:
+        tuple[list, tuple]: The new orders of the page and the cursor of the next one (None after the last page).
+    """
+    seen = cursor[2] if len(cursor) > 2 else frozenset()
+    records = [record for record in response_json if record["id"] not in seen] if seen else response_json
+    if len(response_json) < size:
+        return records, None
+    boundary = response_json[-1]["submitted_at"]
+    ascending = values.get("direction") == "asc"
+    if records:
+        at_boundary = frozenset(record["id"] for record in response_json if record["submitted_at"] == boundary)
+        boundary = _shifted(boundary, -1 if ascending else 1)
+    else:
+        # A full page of orders already seen, all submitted at the same instant: step past it rather than loop.
+        at_boundary = frozenset()
+    if ascending:
+        return records, (boundary, cursor[1], at_boundary)
+    return records, (cursor[0], boundary, at_boundary)
+
+
+def _cursor_arguments(style: Pagination) -> tuple[str, ...]:
+    return {
+        "next_page_token": ("page_token",),
+        "last_id": ("page_token",),
+        "offset": ("offset",),
+        "time_window": ("after", "until"),
+    }[style.style]
+
+
+def paginate(
+    function: Callable[..., dict[str, any]], async_function: Callable[..., dict[str, any]], style: Pagination
+) -> tuple[Callable[..., Iterator[dict[str, any]]], Callable[..., AsyncIterator[dict[str, any]]]]:
+    """
+    Generates the `iter_<name>` streaming functions of a defined endpoint: the endpoint's arguments (minus a
+    `page_token` cursor and the decoding flags) plus `prefetch`, walking pages with `core.pagination`.
+
+    Returns:
+        tuple[Callable, Callable]: The iterator function and its async twin.
+    """
+    if style.style not in PAGINATION_STYLES:
+        raise ValueError(f"pagination style must be one of {', '.join(PAGINATION_STYLES)}, not {style.style!r}")
+    cursor_names = _cursor_arguments(style)
+    hidden = {"typed", "as_models"} | ({"page_token"} if cursor_names == ("page_token",) else set())
+    parameters = []
+    for parameter in inspect.signature(function).parameters.values():
+        if parameter.name in hidden:
+            continue
+        if parameter.name == style.size and style.default_size is not None:
+            parameter = parameter.replace(default=style.default_size)
+        elif parameter.name == "offset" and style.style == "offset":
+            parameter = parameter.replace(default=0)
+        parameters.append(parameter)
+    parameters.append(inspect.Parameter("prefetch", inspect.Parameter.POSITIONAL_OR_KEYWORD, default=1, annotation=int))
+    signature = inspect.Signature(parameters, return_annotation=Iterator[dict[str, any]])
+
+    def start(args: tuple, kwargs: dict) -> tuple[dict[str, any], tuple, int]:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        values = dict(bound.arguments)
+        prefetch = values.pop("prefetch")
+        if style.size in values and values[style.size] is None:
+            # An explicit None would leave the page size to the server and break the short-page check in `_page`.
+            values[style.size] = style.default_size
+        cursor = tuple(values.get(name) for name in cursor_names)
+        return values, cursor, prefetch
+
+    def iterate(*args: any, **kwargs: any) -> Iterator[dict[str, any]]:
+        values, cursor, prefetch = start(args, kwargs)
+
+        def fetch_page(cursor: tuple) -> tuple[list, tuple]:
+            response_json = function(**{**values, **dict(zip(cursor_names, cursor))})
+            return _page(style, values, cursor, response_json)
+
+        return pagination.iterate(fetch_page, cursor, prefetch)
+
+    def iterate_async(*args: any, **kwargs: any) -> AsyncIterator[dict[str, any]]:
+        values, cursor, prefetch = start(args, kwargs)
+
+        async def fetch_page(cursor: tuple) -> tuple[list, tuple]:
+            response_json = await async_function(**{**values, **dict(zip(cursor_names, cursor))})
+            return _page(style, values, cursor, response_json)
+
+        return pagination.iterate_async(fetch_page, cursor, prefetch)
+
+    name = f"iter_{function.__name__.removeprefix('get_')}"
+    for generated, generated_name, doc, returns in (
+        (iterate, name, style.doc, Iterator[dict[str, any]]),
+        (
+            iterate_async,
+            f"{name}_async",
+            f"Async twin of `{name}`; use with `async for`.",
+            AsyncIterator[dict[str, any]],
+        ),
+    ):
+        generated.__signature__ = signature.replace(return_annotation=returns)
+        generated.__doc__ = inspect.cleandoc(doc) if doc else None
+        generated.__name__ = generated.__qualname__ = generated_name
+        generated.__module__ = function.__module__
+    return iterate, iterate_async
@@ -0,0 +1,211 @@
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Callable
+
+import httpx
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import retry_base_delay, retry_budget_max, retry_budget_ratio, retry_max_attempts, retry_max_delay
+
+if TYPE_CHECKING:
+    from core.http_client import ApiRequest
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Failures where the request provably never reached Alpaca, so replaying is safe for any method.
+NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+MAX_RETRY_AFTER = 60.0
+
+_FINAL = 0
+_RETRY = 1
+_PROBE_THEN_RETRY = 2
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter: attempt n waits a random time in [0, min(max_delay, base_delay * 2**n)].
+    """
+
+    max_attempts: int = retry_max_attempts
+    base_delay: float = retry_base_delay
+    max_delay: float = retry_max_delay
+
+    def backoff(self, attempt: int) -> float:
+        return random.uniform(0.0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+class RetryBudget:
+    """
+    Caps retries to a share of the traffic an endpoint actually sends: each call deposits `ratio` tokens (up to
+    `maximum`) and each retry spends one, so a hard outage cannot multiply load by `max_attempts`.
+    """
+
+    def __init__(self, ratio: float = retry_budget_ratio, maximum: float = retry_budget_max) -> None:
+        self.ratio = ratio
+        self.maximum = maximum
+        self._balance = maximum
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._balance = min(self.maximum, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+DEFAULT_POLICY = RetryPolicy()
+
+# The order path is latency sensitive: retry quickly rather than waiting out long backoffs.
+ENDPOINT_POLICIES: dict[str, RetryPolicy] = {
+    "create_order": RetryPolicy(max_delay=1.0),
+    "replace_order_by_id": RetryPolicy(max_delay=1.0),
+    "delete_order_by_id": RetryPolicy(max_delay=1.0),
+}
+
+_budgets: dict[str, RetryBudget] = {}
+_budgets_lock = threading.Lock()
+
+
+def budget_for(endpoint: str) -> RetryBudget:
+    """
+    Returns:
+        RetryBudget: The retry budget of `endpoint`, created on first use.
+    """
+    budget = _budgets.get(endpoint)
+    if budget is None:
+        with _budgets_lock:
+            budget = _budgets.setdefault(endpoint, RetryBudget())
+    return budget
+
+
+def _retry_after(response: httpx.Response) -> float:
+    """
+    Returns:
+        float: Seconds requested by the `Retry-After` header (delta-seconds or HTTP-date), or None if absent.
+    """
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return min(MAX_RETRY_AFTER, max(0.0, float(value)))
+    except ValueError:
+        pass
+    try:
+        return min(MAX_RETRY_AFTER, max(0.0, parsedate_to_datetime(value).timestamp() - time.time()))
+    except (TypeError, ValueError):
+        return None
+
+
+def _classify(api_request: "ApiRequest", response: httpx.Response, error: Exception) -> int:
+    if error is not None:
+        if isinstance(error, NOT_SENT_ERRORS):
+            return _RETRY
+    elif response.status_code == 429:
+        # Rejected by the rate limiter before any processing.
+        return _RETRY
+    elif response.status_code not in RETRYABLE_STATUS_CODES:
+        return _FINAL
+    if api_request.method in IDEMPOTENT_METHODS and api_request.idempotent:
+        return _RETRY
+    if api_request.replay_probe is not None:
+        return _PROBE_THEN_RETRY
+    return _FINAL
+
+
+def _delay(policy: RetryPolicy, attempt: int, response: httpx.Response) -> float:
+    retry_after = _retry_after(response)
+    backoff = policy.backoff(attempt)
+    return backoff if retry_after is None else max(backoff, retry_after)
+
+
+def run(api_request: "ApiRequest", send_once: Callable) -> httpx.Response:
+    """
+    Sends `api_request` through `send_once`, retrying transient failures (transport errors, 429, 5xx).
+    Idempotent requests are replayed directly. Other methods, and requests built with `idempotent=False`, are only
+    replayed when the request never reached Alpaca, or when it carries a `replay_probe`: the probe is sent first and,
+    if it finds the result of an earlier attempt (e.g. the order with the same `client_order_id`), that response is
+    returned instead.
+    Args:
+        api_request (ApiRequest): The request built by an endpoint module.
+        send_once (Callable): Sends one attempt and returns the httpx.Response.
+
+    Returns:
+        httpx.Response: The final response. The last transport error is re-raised if every attempt failed.
+    """
+    policy = ENDPOINT_POLICIES.get(api_request.endpoint, DEFAULT_POLICY)
+    budget = budget_for(api_request.endpoint)
+    budget.deposit()
+    attempt = 0
+    while True:
+        response = error = None
+        try:
+            response = send_once(api_request)
+        except httpx.TransportError as exc:
+            error = exc
+        step = _classify(api_request, response, error)
+        attempt += 1
+        if step == _FINAL or attempt >= policy.max_attempts or not budget.withdraw():
+            if error is not None:
+                raise error
+            return response
+        time.sleep(_delay(policy, attempt, response))
+        if step == _PROBE_THEN_RETRY:
+            try:
+                probe = send_once(api_request.replay_probe)
+            except httpx.TransportError:
+                probe = None
+            if probe is not None and probe.status_code == 200:
+                return probe
+            if probe is None or probe.status_code != 404:
+                # Unknown whether the earlier attempt took effect: never risk a duplicate.
+                if error is not None:
+                    raise error
+                return response
+
+
+async def run_async(api_request: "ApiRequest", send_once: Callable) -> httpx.Response:
+    """
+    Async twin of `run`; `send_once` is a coroutine function.
+    """
+    policy = ENDPOINT_POLICIES.get(api_request.endpoint, DEFAULT_POLICY)
+    budget = budget_for(api_request.endpoint)
+    budget.deposit()
+    attempt = 0
+    while True:
+        response = error = None
+        try:
+            response = await send_once(api_request)
+        except httpx.TransportError as exc:
+            error = exc
+        step = _classify(api_request, response, error)
+        attempt += 1
+        if step == _FINAL or attempt >= policy.max_attempts or not budget.withdraw():
+            if error is not None:
+                raise error
+            return response
+        await asyncio.sleep(_delay(policy, attempt, response))
+        if step == _PROBE_THEN_RETRY:
+            try:
+                probe = await send_once(api_request.replay_probe)
+            except httpx.TransportError:
+                probe = None
+            if probe is not None and probe.status_code == 200:
+                return probe
+            if probe is None or probe.status_code != 404:
+                # Unknown whether the earlier attempt took effect: never risk a duplicate.
+                if error is not None:
+                    raise error
+                return response
@@ -0,0 +1,175 @@
+import asyncio
+import os
+import sys
+import threading
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import single_flight_enabled
+
+if TYPE_CHECKING:
+    from core.http_client import ApiRequest
+
+
+@dataclass(slots=True)
+class FlightStats:
+    # Calls that went to the network.
+    requests: int = 0
+    # Calls that joined a request already in flight instead of sending their own, i.e. requests saved.
+    shared: int = 0
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class _AsyncFlight:
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Lets concurrent identical calls share one execution: the first caller for a key runs the call, callers that
+    arrive while it is in flight wait for it and receive the same result (or exception). Nothing is kept once the
+    call completes, so the next call after that runs again. Shared results are the same object for every waiter and
+    must be treated as read-only.
+    Threads share flights with threads, and coroutines with coroutines on the same event loop.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: dict[tuple, _Flight] = {}
+        self._async_flights: dict[tuple, _AsyncFlight] = {}
+        self._stats: dict[str, FlightStats] = {}
+
+    def _count(self, endpoint: str, counter: str) -> None:
+        with self._lock:
+            counters = self._stats.setdefault(endpoint, FlightStats())
+            setattr(counters, counter, getattr(counters, counter) + 1)
+
+    def in_flight(self, key: tuple) -> bool:
+        """
+        Returns:
+            bool: True if a call for `key` is running, in a thread or on the running event loop.
+        """
+        if key in self._flights:
+            return True
+        try:
+            return (id(asyncio.get_running_loop()), key) in self._async_flights
+        except RuntimeError:
+            return False
+
+    def do(self, endpoint: str, key: tuple, call: Callable[[], any]) -> any:
+        """
+        Args:
+            endpoint (str): Name the call is counted under in `stats()`.
+            key (tuple): Identity of the call; concurrent calls with equal keys are shared.
+            call (Callable[[], any]): Performs the call.
+
+        Returns:
+            any: The result of the call, possibly one started by another thread.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            self._count(endpoint, "shared")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+        self._count(endpoint, "requests")
+        try:
+            flight.value = call()
+            return flight.value
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def do_async(self, endpoint: str, key: tuple, call: Callable[[], Awaitable[any]]) -> any:
+        """
+        Async twin of `do`; `call` is a coroutine function. It runs in its own task, so a cancelled caller leaves the
+        call running for the others; the call itself is cancelled only when every caller waiting on it has been.
+        """
+        flight_key = (id(asyncio.get_running_loop()), key)
+        flight = self._async_flights.get(flight_key)
+        if flight is None or flight.task.done():
+            self._count(endpoint, "requests")
+            flight = self._async_flights[flight_key] = _AsyncFlight(asyncio.ensure_future(call()))
+            flight.task.add_done_callback(lambda task: self._land(flight_key, flight))
+        else:
+            self._count(endpoint, "shared")
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1:
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _land(self, flight_key: tuple, flight: _AsyncFlight) -> None:
+        if self._async_flights.get(flight_key) is flight:
+            del self._async_flights[flight_key]
+        if not flight.task.cancelled():
+            flight.task.exception()  # mark retrieved when every caller was cancelled
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """
+        Returns:
+            dict[str, dict[str, int]]: Requests sent and requests saved (`shared`) per endpoint.
+        """
+        with self._lock:
+            return {endpoint: asdict(counters) for endpoint, counters in self._stats.items()}
+
+    def saved_requests(self) -> int:
+        """
+        Returns:
+            int: Total number of calls served by joining a request already in flight.
+        """
+        with self._lock:
+            return sum(counters.shared for counters in self._stats.values())
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+def request_key(api_request: "ApiRequest") -> tuple:
+    """
+    Returns:
+        tuple: Hashable identity of a request: method, URL, sorted query parameters and the form the body is decoded
+            into.
+    """
+    params = tuple(sorted((api_request.params or {}).items()))
+    return (api_request.method, api_request.url, params, api_request.typed, api_request.as_models)
+
+
+def coalescable(api_request: "ApiRequest") -> bool:
+    """
+    Returns:
+        bool: True if single-flight is enabled and the request is a read (GET).
+    """
+    return single_flight_enabled and api_request.method == "GET"
+
+
+# Shared by every endpoint call that is not served by the response cache (which coalesces its own misses).
+flights = SingleFlight()
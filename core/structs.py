@@ -0,0 +1,167 @@
+try:
+    import msgspec
+except ImportError as exc:  # optional dependency, see requirements-optional.txt
+    raise ImportError("Typed response models need msgspec: pip install msgspec") from exc
+
+# Typed views of the large list endpoints, decoded straight from the response bytes by msgspec. Only the fields
+# declared here are materialized; anything else in the payload is skipped during decoding, and nested fields that
+# are rarely read are kept as undecoded `msgspec.Raw` bytes until `decode_raw` is called on them. Values keep the
+# API's own types (quantities and prices stay strings), so a typed model and the dict form always agree.
+
+
+class Asset(msgspec.Struct, frozen=True, gc=False):
+    id: str
+    symbol: str
+    name: str | None = None
+    exchange: str | None = None
+    asset_class: str | None = msgspec.field(default=None, name="class")
+    status: str | None = None
+    tradable: bool = False
+    marginable: bool = False
+    shortable: bool = False
+    easy_to_borrow: bool = False
+    fractionable: bool = False
+    maintenance_margin_requirement: float | None = None
+    attributes: msgspec.Raw = msgspec.Raw()
+
+
+class Order(msgspec.Struct, frozen=True, gc=False):
+    id: str
+    client_order_id: str
+    symbol: str | None = None
+    asset_id: str | None = None
+    asset_class: str | None = None
+    created_at: str | None = None
+    updated_at: str | None = None
+    submitted_at: str | None = None
+    filled_at: str | None = None
+    expired_at: str | None = None
+    canceled_at: str | None = None
+    failed_at: str | None = None
+    replaced_at: str | None = None
+    replaced_by: str | None = None
+    replaces: str | None = None
+    notional: str | None = None
+    qty: str | None = None
+    filled_qty: str | None = None
+    filled_avg_price: str | None = None
+    order_class: str | None = None
+    order_type: str | None = None
+    type: str | None = None
+    side: str | None = None
+    position_intent: str | None = None
+    time_in_force: str | None = None
+    limit_price: str | None = None
+    stop_price: str | None = None
+    trail_price: str | None = None
+    trail_percent: str | None = None
+    hwm: str | None = None
+    status: str | None = None
+    extended_hours: bool = False
+    # Bracket / OCO child orders; decode with `decode_raw(order.legs, list[Order])` when needed.
+    legs: msgspec.Raw = msgspec.Raw()
+
+
+class Position(msgspec.Struct, frozen=True, gc=False):
+    asset_id: str
+    symbol: str
+    exchange: str | None = None
+    asset_class: str | None = None
+    asset_marginable: bool = False
+    qty: str | None = None
+    qty_available: str | None = None
+    avg_entry_price: str | None = None
+    side: str | None = None
+    market_value: str | None = None
+    cost_basis: str | None = None
+    unrealized_pl: str | None = None
+    unrealized_plpc: str | None = None
+    unrealized_intraday_pl: str | None = None
+    unrealized_intraday_plpc: str | None = None
+    current_price: str | None = None
+    lastday_price: str | None = None
+    change_today: str | None = None
+
+
+class OptionContract(msgspec.Struct, frozen=True, gc=False):
+    id: str
+    symbol: str
+    name: str | None = None
+    status: str | None = None
+    tradable: bool = False
+    expiration_date: str | None = None
+    root_symbol: str | None = None
+    underlying_symbol: str | None = None
+    underlying_asset_id: str | None = None
+    type: str | None = None
+    style: str | None = None
+    strike_price: str | None = None
+    multiplier: str | None = None
+    size: str | None = None
+    open_interest: str | None = None
+    open_interest_date: str | None = None
+    close_price: str | None = None
+    close_price_date: str | None = None
+
+
+class OptionContractsPage(msgspec.Struct, frozen=True, gc=False):
+    option_contracts: list[OptionContract]
+    next_page_token: str | None = None
+
+
+class Activity(msgspec.Struct, frozen=True, gc=False):
+    """
+    Union of the trade (FILL) and non-trade activity shapes; fields a given activity type does not carry are None.
+    """
+
+    id: str
+    activity_type: str
+    transaction_time: str | None = None
+    date: str | None = None
+    type: str | None = None
+    symbol: str | None = None
+    side: str | None = None
+    qty: str | None = None
+    price: str | None = None
+    cum_qty: str | None = None
+    leaves_qty: str | None = None
+    order_id: str | None = None
+    order_status: str | None = None
+    net_amount: str | None = None
+    per_share_amount: str | None = None
+    description: str | None = None
+    status: str | None = None
+
+
+RESPONSE_TYPES: dict[str, any] = {
+    "get_assets": list[Asset],
+    "get_all_orders": list[Order],
+    "get_all_open_positions": list[Position],
+    "get_option_contracts": OptionContractsPage,
+    "get_account_activities": list[Activity],
+}
+
+
+def decoder_for(endpoint: str) -> "msgspec.json.Decoder":
+    """
+    Returns:
+        msgspec.json.Decoder: A reusable decoder for the response type registered for `endpoint`.
+    """
+    if endpoint not in RESPONSE_TYPES:
+        raise ValueError(f"No typed model is registered for {endpoint}")
+    return msgspec.json.Decoder(RESPONSE_TYPES[endpoint])
+
+
+def decode_raw(raw: msgspec.Raw, type: any = None) -> any:
+    """
+    Materializes a lazily kept field such as `Order.legs` or `Asset.attributes`.
+    Args:
+        raw (msgspec.Raw): The undecoded field.
+        type (any, optional): Model to decode into (e.g. `list[Order]`). Defaults to plain dicts and lists.
+
+    Returns:
+        any: The decoded value, or None if the field was absent.
+    """
+    if not raw:
+        return None
+    return msgspec.json.decode(raw) if type is None else msgspec.json.decode(raw, type=type)
@@ -1,103 +1,101 @@
 import os
 import sys
 
-import httpx
-
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from config import headers, paper_trading_base_url
-
-
-def get_account_activities(
-    paper_trading: bool,
-    activity_type: str = None,
-    date: str = None,
-    until: str = None,
-    after: str = None,
-    direction: str = None,
-    page_size: int = None,
-) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/getaccountactivities
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        activity_type (str, optional): Filter by activity type (e.g., 'FILL', 'TRANS', 'DIV', etc.). Defaults to None.
-        date (str, optional): Filter activities for a specific date (YYYY-MM-DD format). Defaults to None.
-        until (str, optional): Filter activities up to this date (ISO 8601 format). Defaults to None.
-        after (str, optional): Filter activities after this date (ISO 8601 format). Defaults to None.
-        direction (str, optional): The chronological order of response based on the submission time. 'asc' or 'desc'. Defaults to None.
-        page_size (int, optional): Maximum number of entries in the response. Defaults to None.
-
-    Returns:
-        dict[str, any]: A dictionary containing account activities data.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/account/activities"
-    else:
-        pass
-
-    params = {}
-    if activity_type:
-        params["activity_type"] = activity_type
-    if date:
-        params["date"] = date
-    if until:
-        params["until"] = until
-    if after:
-        params["after"] = after
-    if direction:
-        params["direction"] = direction
-    if page_size:
-        params["page_size"] = page_size
-
-    response_json = httpx.request(method="GET", url=url, headers=headers, params=params).json()
-
-    return response_json
-
-
-def get_account_activities_by_type(
-    paper_trading: bool,
-    activity_type: str,
-    date: str = None,
-    until: str = None,
-    after: str = None,
-    direction: str = None,
-    page_size: int = None,
-) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/getaccountactivitiesactivitytype
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        activity_type (str): The specific activity type to filter by (e.g., 'FILL', 'TRANS', 'DIV', etc.).
-        date (str, optional): Filter activities for a specific date (YYYY-MM-DD format). Defaults to None.
-        until (str, optional): Filter activities up to this date (ISO 8601 format). Defaults to None.
-        after (str, optional): Filter activities after this date (ISO 8601 format). Defaults to None.
-        direction (str, optional): The chronological order of response based on the submission time. 'asc' or 'desc'. Defaults to None.
-        page_size (int, optional): Maximum number of entries in the response. Defaults to None.
-
-    Returns:
-        dict[str, any]: A dictionary containing account activities data for the specified activity type.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/account/activities/{activity_type}"
-    else:
-        pass
-
-    params = {}
-    if date:
-        params["date"] = date
-    if until:
-        params["until"] = until
-    if after:
-        params["after"] = after
-    if direction:
-        params["direction"] = direction
-    if page_size:
-        params["page_size"] = page_size
-
-    response_json = httpx.request(method="GET", url=url, headers=headers, params=params).json()
-
-    return response_json
+from core.registry import Endpoint, Pagination, define, paginate, path, query
+
+get_account_activities, get_account_activities_async = define(
+    Endpoint(
+        name="get_account_activities",
+        method="GET",
+        path="/account/activities",
+        args=(
+            query("activity_type"),
+            query("date"),
+            query("until"),
+            query("after"),
+            query("direction"),
+            query("page_size", int),
+            query("page_token"),
+        ),
+        typed=True,
+        as_models=True,
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/getaccountactivities
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            activity_type (str, optional): Filter by activity type (e.g., 'FILL', 'TRANS', 'DIV', etc.). Defaults to None.
+            date (str, optional): Filter activities for a specific date (YYYY-MM-DD format). Defaults to None.
+            until (str, optional): Filter activities up to this date (ISO 8601 format). Defaults to None.
+            after (str, optional): Filter activities after this date (ISO 8601 format). Defaults to None.
+            direction (str, optional): The chronological order of response based on the submission time. 'asc' or 'desc'. Defaults to None.
+            page_size (int, optional): Maximum number of entries in the response. Defaults to None.
+            page_token (str, optional): The ID of the end of your current page of results, to retrieve the next page. Defaults to None.
+            typed (bool, optional): Decode the response straight into a list of `core.structs.Activity` models instead of dicts (requires msgspec). Defaults to False.
+            as_models (bool, optional): Parse the response into a list of `core.models.Activity` records instead of dicts. Defaults to False.
+
+        Returns:
+            dict[str, any]: A dictionary containing account activities data.
+        """,
+    )
+)
+
+iter_account_activities, iter_account_activities_async = paginate(
+    get_account_activities,
+    get_account_activities_async,
+    Pagination(
+        style="last_id",
+        size="page_size",
+        default_size=100,
+        doc="""
+        Streams every account activity matching the filters, following `page_token` across pages of
+        `get_account_activities`.
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            activity_type, date, until, after, direction: Same filters as `get_account_activities`.
+            page_size (int, optional): Page size (max 100). Defaults to 100.
+            prefetch (int, optional): Number of pages loaded ahead in the background. Defaults to 1.
+
+        Yields:
+            dict[str, any]: Each activity, in the requested chronological direction.
+        """,
+    ),
+)
+
+get_account_activities_by_type, get_account_activities_by_type_async = define(
+    Endpoint(
+        name="get_account_activities_by_type",
+        method="GET",
+        path="/account/activities/{activity_type}",
+        args=(
+            path("activity_type"),
+            query("date"),
+            query("until"),
+            query("after"),
+            query("direction"),
+            query("page_size", int),
+            query("page_token"),
+        ),
+        as_models=True,
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/getaccountactivitiesactivitytype
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            activity_type (str): The specific activity type to filter by (e.g., 'FILL', 'TRANS', 'DIV', etc.).
+            date (str, optional): Filter activities for a specific date (YYYY-MM-DD format). Defaults to None.
+            until (str, optional): Filter activities up to this date (ISO 8601 format). Defaults to None.
+            after (str, optional): Filter activities after this date (ISO 8601 format). Defaults to None.
+            direction (str, optional): The chronological order of response based on the submission time. 'asc' or 'desc'. Defaults to None.
+            page_size (int, optional): Maximum number of entries in the response. Defaults to None.
+            page_token (str, optional): The ID of the end of your current page of results, to retrieve the next page. Defaults to None.
+            as_models (bool, optional): Parse the response into a list of `core.models.Activity` records instead of dicts. Defaults to False.
+
+        Returns:
+            dict[str, any]: A dictionary containing account activities data for the specified activity type.
+        """,
+    )
+)
 
 
 if __name__ == "__main__":
@@ -1,30 +1,25 @@
 import os
 import sys
 
-import httpx
-
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from config import headers, paper_trading_base_url
-
-
-def get_the_account(paper_trading: bool) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/getaccount-1
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-
-    Returns:
-        dict[str, any]: A dictionary containing account details including account status, buying power, cash, portfolio value, and trading permissions.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/account"
-    else:
-        pass
-
-    response_json = httpx.request(method="GET", url=url, headers=headers).json()
-
-    return response_json
+from core.registry import Endpoint, define
+
+get_the_account, get_the_account_async = define(
+    Endpoint(
+        name="get_the_account",
+        method="GET",
+        path="/account",
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/getaccount-1
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+
+        Returns:
+            dict[str, any]: A dictionary containing account details including account status, buying power, cash, portfolio value, and trading permissions.
+        """,
+    )
+)
 
 
 if __name__ == "__main__":
@@ -1,180 +1,177 @@
 import os
 import sys
 
-import httpx
-
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from config import headers, paper_trading_base_url
-
-
-def get_crypto_funding_wallets(paper_trading: bool) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/getwalletcryptofundings
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-
-    Returns:
-        dict[str, any]: A dictionary containing crypto funding wallet information.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/wallet/crypto/fundings"
-    else:
-        pass
-
-    response_json = httpx.request(method="GET", url=url, headers=headers).json()
-
-    return response_json
-
-
-def get_crypto_funding_transfers(paper_trading: bool, limit: int = None, offset: int = None) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/getwalletcryptofundingstransfers
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        limit (int, optional): Maximum number of transfers to return. Defaults to None.
-        offset (int, optional): Number of transfers to skip before returning results. Defaults to None.
-
-    Returns:
-        dict[str, any]: A dictionary containing a list of crypto funding transfers.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/wallet/crypto/fundings/transfers"
-    else:
-        pass
-
-    params = {}
-    if limit:
-        params["limit"] = limit
-    if offset:
-        params["offset"] = offset
-
-    response_json = httpx.request(method="GET", url=url, headers=headers, params=params).json()
-
-    return response_json
-
-
-def create_crypto_withdrawal(paper_trading: bool, withdrawal_data: dict) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/postwalletcryptofundingswithdrawals
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        withdrawal_data (dict): Dictionary containing withdrawal parameters such as symbol, amount, destination_address, etc.
-
-    Returns:
-        dict[str, any]: A dictionary containing information about the created crypto withdrawal request.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/wallet/crypto/fundings/withdrawals"
-    else:
-        pass
-
-    response_json = httpx.request(method="POST", url=url, headers=headers, json=withdrawal_data).json()
-
-    return response_json
-
-
-def get_crypto_funding_transfer_by_id(paper_trading: bool, transfer_id: str) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/getwalletcryptofundingstransferstransferid
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        transfer_id (str): The unique identifier for the crypto funding transfer.
-
-    Returns:
-        dict[str, any]: A dictionary containing the detailed crypto funding transfer information.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/wallet/crypto/fundings/transfers/{transfer_id}"
-    else:
-        pass
-
-    response_json = httpx.request(method="GET", url=url, headers=headers).json()
-
-    return response_json
-
-
-def get_whitelisted_addresses(paper_trading: bool) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/getwalletcryptoaddresses
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-
-    Returns:
-        dict[str, any]: A dictionary containing a list of whitelisted crypto addresses.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/wallet/crypto/addresses"
-    else:
-        pass
-
-    response_json = httpx.request(method="GET", url=url, headers=headers).json()
-
-    return response_json
-
-
-def create_whitelisted_address(paper_trading: bool, address_data: dict) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/postwalletcryptoaddresses
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        address_data (dict): Dictionary containing address parameters such as symbol, address, label, etc.
-
-    Returns:
-        dict[str, any]: A dictionary containing information about the created whitelisted address.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/wallet/crypto/addresses"
-    else:
-        pass
-
-    response_json = httpx.request(method="POST", url=url, headers=headers, json=address_data).json()
-
-    return response_json
-
-
-def delete_whitelisted_address(paper_trading: bool, address_id: str) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/deletewalletcryptoaddressesaddressid
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        address_id (str): The unique identifier for the whitelisted address to delete.
-
-    Returns:
-        dict[str, any]: A dictionary containing confirmation of the deleted whitelisted address.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/wallet/crypto/addresses/{address_id}"
-    else:
-        pass
-
-    response_json = httpx.request(method="DELETE", url=url, headers=headers).json()
-
-    return response_json
-
-
-def get_estimated_gas_fee(paper_trading: bool, symbol: str, destination_address: str, amount: str) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/getwalletcryptofundingestimate
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        symbol (str): The cryptocurrency symbol (e.g., 'BTC', 'ETH').
-        destination_address (str): The destination crypto address for the withdrawal.
-        amount (str): The amount of cryptocurrency to withdraw.
-
-    Returns:
-        dict[str, any]: A dictionary containing the estimated gas fee for the proposed crypto withdrawal.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/wallet/crypto/fundings/estimate"
-    else:
-        pass
-
-    params = {"symbol": symbol, "destination_address": destination_address, "amount": amount}
-
-    response_json = httpx.request(method="GET", url=url, headers=headers, params=params).json()
-
-    return response_json
+from core.registry import Endpoint, Pagination, define, json_body, paginate, path, query
+
+get_crypto_funding_wallets, get_crypto_funding_wallets_async = define(
+    Endpoint(
+        name="get_crypto_funding_wallets",
+        method="GET",
+        path="/wallet/crypto/fundings",
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/getwalletcryptofundings
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+
+        Returns:
+            dict[str, any]: A dictionary containing crypto funding wallet information.
+        """,
+    )
+)
+
+get_crypto_funding_transfers, get_crypto_funding_transfers_async = define(
+    Endpoint(
+        name="get_crypto_funding_transfers",
+        method="GET",
+        path="/wallet/crypto/fundings/transfers",
+        args=(query("limit", int), query("offset", int)),
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/getwalletcryptofundingstransfers
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            limit (int, optional): Maximum number of transfers to return. Defaults to None.
+            offset (int, optional): Number of transfers to skip before returning results. Defaults to None.
+
+        Returns:
+            dict[str, any]: A dictionary containing a list of crypto funding transfers.
+        """,
+    )
+)
+
+iter_crypto_funding_transfers, iter_crypto_funding_transfers_async = paginate(
+    get_crypto_funding_transfers,
+    get_crypto_funding_transfers_async,
+    Pagination(
+        style="offset",
+        size="limit",
+        default_size=100,
+        doc="""
+        Streams every crypto funding transfer, advancing `offset` across pages of `get_crypto_funding_transfers`.
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            limit (int, optional): Page size. Defaults to 100.
+            offset (int, optional): Number of transfers to skip before the first page. Defaults to 0.
+            prefetch (int, optional): Number of pages loaded ahead in the background. Defaults to 1.
+
+        Yields:
+            dict[str, any]: Each crypto funding transfer.
+        """,
+    ),
+)
+
+create_crypto_withdrawal, create_crypto_withdrawal_async = define(
+    Endpoint(
+        name="create_crypto_withdrawal",
+        method="POST",
+        path="/wallet/crypto/fundings/withdrawals",
+        args=(json_body("withdrawal_data"),),
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/postwalletcryptofundingswithdrawals
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            withdrawal_data (dict): Dictionary containing withdrawal parameters such as symbol, amount, destination_address, etc.
+
+        Returns:
+            dict[str, any]: A dictionary containing information about the created crypto withdrawal request.
+        """,
+    )
+)
+
+get_crypto_funding_transfer_by_id, get_crypto_funding_transfer_by_id_async = define(
+    Endpoint(
+        name="get_crypto_funding_transfer_by_id",
+        method="GET",
+        path="/wallet/crypto/fundings/transfers/{transfer_id}",
+        args=(path("transfer_id"),),
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/getwalletcryptofundingstransferstransferid
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            transfer_id (str): The unique identifier for the crypto funding transfer.
+
+        Returns:
+            dict[str, any]: A dictionary containing the detailed crypto funding transfer information.
+        """,
+    )
+)
+
+get_whitelisted_addresses, get_whitelisted_addresses_async = define(
+    Endpoint(
+        name="get_whitelisted_addresses",
+        method="GET",
+        path="/wallet/crypto/addresses",
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/getwalletcryptoaddresses
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+
+        Returns:
+            dict[str, any]: A dictionary containing a list of whitelisted crypto addresses.
+        """,
+    )
+)
+
+create_whitelisted_address, create_whitelisted_address_async = define(
+    Endpoint(
+        name="create_whitelisted_address",
+        method="POST",
+        path="/wallet/crypto/addresses",
+        args=(json_body("address_data"),),
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/postwalletcryptoaddresses
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            address_data (dict): Dictionary containing address parameters such as symbol, address, label, etc.
+
+        Returns:
+            dict[str, any]: A dictionary containing information about the created whitelisted address.
+        """,
+    )
+)
+
+delete_whitelisted_address, delete_whitelisted_address_async = define(
+    Endpoint(
+        name="delete_whitelisted_address",
+        method="DELETE",
+        path="/wallet/crypto/addresses/{address_id}",
+        args=(path("address_id"),),
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/deletewalletcryptoaddressesaddressid
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            address_id (str): The unique identifier for the whitelisted address to delete.
+
+        Returns:
+            dict[str, any]: A dictionary containing confirmation of the deleted whitelisted address.
+        """,
+    )
+)
+
+get_estimated_gas_fee, get_estimated_gas_fee_async = define(
+    Endpoint(
+        name="get_estimated_gas_fee",
+        method="GET",
+        path="/wallet/crypto/fundings/estimate",
+        args=(
+            query("symbol", required=True),
+            query("destination_address", required=True),
+            query("amount", required=True),
+        ),
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/getwalletcryptofundingestimate
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            symbol (str): The cryptocurrency symbol (e.g., 'BTC', 'ETH').
+            destination_address (str): The destination crypto address for the withdrawal.
+            amount (str): The amount of cryptocurrency to withdraw.
+
+        Returns:
+            dict[str, any]: A dictionary containing the estimated gas fee for the proposed crypto withdrawal.
+        """,
+    )
+)
 
 
 if __name__ == "__main__":
@@ -1,183 +1,211 @@
+import dataclasses
 import os
 import sys
-
-import httpx
+import uuid
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from config import headers, paper_trading_base_url
+from core.http_client import ApiRequest
+from core.registry import NOT_NONE, Endpoint, Pagination, define, json_body, paginate, path, query
 
 
-def create_order(paper_trading: bool, order_data: dict) -> dict[str, any]:
+def with_client_order_id(order_data: dict) -> dict:
     """
-    Link to Documentation: https://docs.alpaca.markets/reference/postorder
     Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        order_data (dict): Dictionary containing order parameters such as symbol, qty, side, type, time_in_force, etc.
+        order_data (dict): Order parameters as accepted by `create_order`.
 
     Returns:
-        dict[str, any]: A dictionary containing the created order details including order ID, status, and order information.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/orders"
-    else:
-        pass
-
-    response_json = httpx.request(method="POST", url=url, headers=headers, json=order_data).json()
-
-    return response_json
-
-
-def get_all_orders(
-    paper_trading: bool,
-    status: str = None,
-    limit: int = None,
-    nested: bool = None,
-    after: str = None,
-    until: str = None,
-    direction: str = None,
-    symbols: str = None,
-) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/getorders
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        status (str, optional): Filter orders by status (e.g., 'open', 'closed', 'all'). Defaults to None.
-        limit (int, optional): Maximum number of orders to return. Defaults to None.
-        nested (bool, optional): If true, returns nested objects. Defaults to None.
-        after (str, optional): Filter orders submitted after this date (ISO 8601 format). Defaults to None.
-        until (str, optional): Filter orders submitted until this date (ISO 8601 format). Defaults to None.
-        direction (str, optional): The chronological order of response based on the submission time. 'asc' or 'desc'. Defaults to None.
-        symbols (str, optional): Comma-separated list of symbols to filter by. Defaults to None.
-
-    Returns:
-        dict[str, any]: A dictionary containing a list of orders matching the filter criteria.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/orders"
-    else:
-        pass
-
-    params = {}
-    if status:
-        params["status"] = status
-    if limit:
-        params["limit"] = limit
-    if nested is not None:
-        params["nested"] = nested
-    if after:
-        params["after"] = after
-    if until:
-        params["until"] = until
-    if direction:
-        params["direction"] = direction
-    if symbols:
-        params["symbols"] = symbols
-
-    response_json = httpx.request(method="GET", url=url, headers=headers, params=params).json()
-
-    return response_json
-
-
-def delete_all_orders(paper_trading: bool) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/deleteorders
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-
-    Returns:
-        dict[str, any]: A dictionary containing information about the cancelled orders.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/orders"
-    else:
-        pass
-
-    response_json = httpx.request(method="DELETE", url=url, headers=headers).json()
-
-    return response_json
-
-
-def get_order_by_client_order_id(paper_trading: bool, client_order_id: str) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/getorderbyclientorderid
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        client_order_id (str): The client order ID used when placing the order.
-
-    Returns:
-        dict[str, any]: A dictionary containing the order details for the specified client order ID.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/orders:by_client_order_id"
-    else:
-        pass
-
-    params = {"client_order_id": client_order_id}
-    response_json = httpx.request(method="GET", url=url, headers=headers, params=params).json()
-
-    return response_json
-
-
-def get_order_by_id(paper_trading: bool, order_id: str) -> dict[str, any]:
+        dict: `order_data` itself if it carries a `client_order_id`, otherwise a copy with a random one.
     """
-    Link to Documentation: https://docs.alpaca.markets/reference/getorderbyid
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        order_id (str): The unique identifier for the order.
-
-    Returns:
-        dict[str, any]: A dictionary containing the order details including status, symbol, quantity, and execution information.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/orders/{order_id}"
-    else:
-        pass
-
-    response_json = httpx.request(method="GET", url=url, headers=headers).json()
-
-    return response_json
-
-
-def replace_order_by_id(paper_trading: bool, order_id: str, order_data: dict) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/patchorderbyid
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        order_id (str): The unique identifier for the order to replace.
-        order_data (dict): Dictionary containing the updated order parameters (qty, limit_price, stop_price, etc.).
-
-    Returns:
-        dict[str, any]: A dictionary containing the updated order details.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/orders/{order_id}"
-    else:
-        pass
-
-    response_json = httpx.request(method="PATCH", url=url, headers=headers, json=order_data).json()
-
-    return response_json
-
-
-def delete_order_by_id(paper_trading: bool, order_id: str) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/deleteorderbyid
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        order_id (str): The unique identifier for the order to cancel.
-
-    Returns:
-        dict[str, any]: A dictionary containing information about the cancelled order.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/orders/{order_id}"
-    else:
-        pass
-
-    response_json = httpx.request(method="DELETE", url=url, headers=headers).json()
-
-    return response_json
+    if order_data.get("client_order_id"):
+        return order_data
+    return {**order_data, "client_order_id": uuid.uuid4().hex}
+
+
+def _with_client_order_id(paper_trading: bool, api_request: ApiRequest) -> ApiRequest:
+    # A client_order_id lets a failed submission be replayed without risking a duplicate order.
+    order_data = with_client_order_id(api_request.json)
+    probe = get_order_by_client_order_id.build(paper_trading, order_data["client_order_id"])
+    return dataclasses.replace(api_request, json=order_data, replay_probe=probe)
+
+
+create_order, create_order_async = define(
+    Endpoint(
+        name="create_order",
+        method="POST",
+        path="/orders",
+        args=(json_body("order_data"),),
+        as_models=True,
+        prepare=_with_client_order_id,
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/postorder
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            order_data (dict): Dictionary containing order parameters such as symbol, qty, side, type, time_in_force, etc.
+                A random client_order_id is added when missing so transient failures can be retried safely.
+            as_models (bool, optional): Parse the response into a `core.models.Order` instead of a dict. Defaults to False.
+
+        Returns:
+            dict[str, any]: A dictionary containing the created order details including order ID, status, and order information.
+                When a pre-trade validator is installed (`core.pre_trade`), an order it rejects is not sent and an error
+                body with `"source": "pre_trade"` is returned instead.
+        """,
+    )
+)
+
+get_all_orders, get_all_orders_async = define(
+    Endpoint(
+        name="get_all_orders",
+        method="GET",
+        path="/orders",
+        args=(
+            query("status"),
+            query("limit", int),
+            query("nested", bool, send=NOT_NONE),
+            query("after"),
+            query("until"),
+            query("direction"),
+            query("symbols"),
+        ),
+        typed=True,
+        as_models=True,
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/getorders
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            status (str, optional): Filter orders by status (e.g., 'open', 'closed', 'all'). Defaults to None.
+            limit (int, optional): Maximum number of orders to return. Defaults to None.
+            nested (bool, optional): If true, returns nested objects. Defaults to None.
+            after (str, optional): Filter orders submitted after this date (ISO 8601 format). Defaults to None.
+            until (str, optional): Filter orders submitted until this date (ISO 8601 format). Defaults to None.
+            direction (str, optional): The chronological order of response based on the submission time. 'asc' or 'desc'. Defaults to None.
+            symbols (str, optional): Comma-separated list of symbols to filter by. Defaults to None.
+            typed (bool, optional): Decode the response straight into a list of `core.structs.Order` models instead of dicts (requires msgspec). Defaults to False.
+            as_models (bool, optional): Parse the response into a list of `core.models.Order` records instead of dicts. Defaults to False.
+
+        Returns:
+            dict[str, any]: A dictionary containing a list of orders matching the filter criteria.
+        """,
+    )
+)
+
+iter_all_orders, iter_all_orders_async = paginate(
+    get_all_orders,
+    get_all_orders_async,
+    Pagination(
+        style="time_window",
+        size="limit",
+        default_size=500,
+        doc="""
+        Streams every order matching the filters, following `after`/`until` across pages of `get_all_orders`.
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            status, nested, after, until, direction, symbols: Same filters as `get_all_orders`.
+            limit (int, optional): Page size (max 500). Defaults to 500.
+            prefetch (int, optional): Number of pages loaded ahead in the background. Defaults to 1.
+
+        Yields:
+            dict[str, any]: Each order, in the requested chronological direction.
+        """,
+    ),
+)
+
+delete_all_orders, delete_all_orders_async = define(
+    Endpoint(
+        name="delete_all_orders",
+        method="DELETE",
+        path="/orders",
+        # Would also cancel orders submitted between the attempts.
+        idempotent=False,
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/deleteorders
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+
+        Returns:
+            dict[str, any]: A dictionary containing information about the cancelled orders.
+        """,
+    )
+)
+
+get_order_by_client_order_id, get_order_by_client_order_id_async = define(
+    Endpoint(
+        name="get_order_by_client_order_id",
+        method="GET",
+        path="/orders:by_client_order_id",
+        args=(query("client_order_id", required=True),),
+        as_models=True,
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/getorderbyclientorderid
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            client_order_id (str): The client order ID used when placing the order.
+            as_models (bool, optional): Parse the response into a `core.models.Order` instead of a dict. Defaults to False.
+
+        Returns:
+            dict[str, any]: A dictionary containing the order details for the specified client order ID.
+        """,
+    )
+)
+
+get_order_by_id, get_order_by_id_async = define(
+    Endpoint(
+        name="get_order_by_id",
+        method="GET",
+        path="/orders/{order_id}",
+        args=(path("order_id"),),
+        as_models=True,
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/getorderbyid
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            order_id (str): The unique identifier for the order.
+            as_models (bool, optional): Parse the response into a `core.models.Order` instead of a dict. Defaults to False.
+
+        Returns:
+            dict[str, any]: A dictionary containing the order details including status, symbol, quantity, and execution information.
+        """,
+    )
+)
+
+replace_order_by_id, replace_order_by_id_async = define(
+    Endpoint(
+        name="replace_order_by_id",
+        method="PATCH",
+        path="/orders/{order_id}",
+        args=(path("order_id"), json_body("order_data")),
+        as_models=True,
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/patchorderbyid
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            order_id (str): The unique identifier for the order to replace.
+            order_data (dict): Dictionary containing the updated order parameters (qty, limit_price, stop_price, etc.).
+            as_models (bool, optional): Parse the response into a `core.models.Order` instead of a dict. Defaults to False.
+
+        Returns:
+            dict[str, any]: A dictionary containing the updated order details.
+        """,
+    )
+)
+
+delete_order_by_id, delete_order_by_id_async = define(
+    Endpoint(
+        name="delete_order_by_id",
+        method="DELETE",
+        path="/orders/{order_id}",
+        args=(path("order_id"),),
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/deleteorderbyid
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            order_id (str): The unique identifier for the order to cancel.
+
+        Returns:
+            dict[str, any]: A dictionary containing information about the cancelled order.
+        """,
+    )
+)
 
 
 if __name__ == "__main__":
@@ -1,259 +1,212 @@
 import os
 import sys
 
-import httpx
-
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from config import headers, paper_trading_base_url
-
-
-def get_all_watchlists(paper_trading: bool) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/getwatchlists
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-
-    Returns:
-        dict[str, any]: A dictionary containing a list of all watchlists with their IDs, names, and symbols.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/watchlists"
-    else:
-        pass
-
-    response_json = httpx.request(method="GET", url=url, headers=headers).json()
-
-    return response_json
-
-
-def create_watchlist(paper_trading: bool, name: str, symbols: list[str] = None) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/postwatchlist
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        name (str): The name of the watchlist to create.
-        symbols (list[str], optional): List of asset symbols to include in the watchlist. Defaults to None.
-
-    Returns:
-        dict[str, any]: A dictionary containing the created watchlist details including ID, name, and symbols.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/watchlists"
-    else:
-        pass
-
-    data = {"name": name}
-    if symbols:
-        data["symbols"] = symbols
-
-    response_json = httpx.request(method="POST", url=url, headers=headers, json=data).json()
-
-    return response_json
-
-
-def get_watchlist_by_id(paper_trading: bool, watchlist_id: str) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/getwatchlistbyid
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        watchlist_id (str): The unique identifier for the watchlist.
-
-    Returns:
-        dict[str, any]: A dictionary containing the watchlist details including ID, name, and list of symbols.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/watchlists/{watchlist_id}"
-    else:
-        pass
-
-    response_json = httpx.request(method="GET", url=url, headers=headers).json()
-
-    return response_json
-
-
-def update_watchlist_by_id(
-    paper_trading: bool, watchlist_id: str, name: str = None, symbols: list[str] = None
-) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/putwatchlistbyid
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        watchlist_id (str): The unique identifier for the watchlist to update.
-        name (str, optional): The new name for the watchlist. Defaults to None.
-        symbols (list[str], optional): The new list of symbols for the watchlist. Defaults to None.
-
-    Returns:
-        dict[str, any]: A dictionary containing the updated watchlist details.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/watchlists/{watchlist_id}"
-    else:
-        pass
-
-    data = {}
-    if name:
-        data["name"] = name
-    if symbols:
-        data["symbols"] = symbols
-
-    response_json = httpx.request(method="PUT", url=url, headers=headers, json=data).json()
-
-    return response_json
-
-
-def add_asset_to_watchlist(paper_trading: bool, watchlist_id: str, symbol: str) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/postwatchlistbyid
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        watchlist_id (str): The unique identifier for the watchlist.
-        symbol (str): The asset symbol to add to the watchlist.
-
-    Returns:
-        dict[str, any]: A dictionary containing the updated watchlist with the new symbol added.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/watchlists/{watchlist_id}"
-    else:
-        pass
-
-    data = {"symbol": symbol}
-    response_json = httpx.request(method="POST", url=url, headers=headers, json=data).json()
-
-    return response_json
-
-
-def delete_watchlist_by_id(paper_trading: bool, watchlist_id: str) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/deletewatchlistbyid
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        watchlist_id (str): The unique identifier for the watchlist to delete.
-
-    Returns:
-        dict[str, any]: A dictionary containing confirmation of the deleted watchlist.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/watchlists/{watchlist_id}"
-    else:
-        pass
-
-    response_json = httpx.request(method="DELETE", url=url, headers=headers).json()
-
-    return response_json
-
-
-def get_watchlist_by_name(paper_trading: bool, name: str) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/getwatchlistbyname
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        name (str): The name of the watchlist to retrieve.
-
-    Returns:
-        dict[str, any]: A dictionary containing the watchlist details including ID, name, and list of symbols.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/watchlists:by_name"
-    else:
-        pass
-
-    params = {"name": name}
-    response_json = httpx.request(method="GET", url=url, headers=headers, params=params).json()
-
-    return response_json
-
-
-def update_watchlist_by_name(paper_trading: bool, name: str, symbols: list[str] = None) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/putwatchlistbyname
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        name (str): The name of the watchlist to update.
-        symbols (list[str], optional): The new list of symbols for the watchlist. Defaults to None.
-
-    Returns:
-        dict[str, any]: A dictionary containing the updated watchlist details.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/watchlists:by_name"
-    else:
-        pass
-
-    data = {}
-    if symbols:
-        data["symbols"] = symbols
-
-    params = {"name": name}
-    response_json = httpx.request(method="PUT", url=url, headers=headers, params=params, json=data).json()
-
-    return response_json
-
-
-def add_asset_to_watchlist_by_name(paper_trading: bool, name: str, symbol: str) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/postwatchlistbyname
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        name (str): The name of the watchlist to add the symbol to.
-        symbol (str): The asset symbol to add to the watchlist.
-
-    Returns:
-        dict[str, any]: A dictionary containing the updated watchlist with the new symbol added.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/watchlists:by_name"
-    else:
-        pass
-
-    data = {"symbol": symbol}
-    params = {"name": name}
-    response_json = httpx.request(method="POST", url=url, headers=headers, params=params, json=data).json()
-
-    return response_json
-
-
-def delete_watchlist_by_name(paper_trading: bool, name: str) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/deletewatchlistbyname
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        name (str): The name of the watchlist to delete.
-
-    Returns:
-        dict[str, any]: A dictionary containing confirmation of the deleted watchlist.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/watchlists:by_name"
-    else:
-        pass
-
-    params = {"name": name}
-    response_json = httpx.request(method="DELETE", url=url, headers=headers, params=params).json()
-
-    return response_json
-
-
-def delete_symbol_from_watchlist(paper_trading: bool, watchlist_id: str, symbol: str) -> dict[str, any]:
-    """
-    Link to Documentation: https://docs.alpaca.markets/reference/deletesymbolfromwatchlist
-    Args:
-        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
-        watchlist_id (str): The unique identifier for the watchlist.
-        symbol (str): The asset symbol to remove from the watchlist.
-
-    Returns:
-        dict[str, any]: A dictionary containing confirmation of the symbol removal.
-    """
-    if paper_trading:
-        url = f"{paper_trading_base_url}/watchlists/{watchlist_id}/{symbol}"
-    else:
-        pass
-
-    response_json = httpx.request(method="DELETE", url=url, headers=headers).json()
-
-    return response_json
+from core.registry import Endpoint, body, define, path, query
+
+get_all_watchlists, get_all_watchlists_async = define(
+    Endpoint(
+        name="get_all_watchlists",
+        method="GET",
+        path="/watchlists",
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/getwatchlists
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+
+        Returns:
+            dict[str, any]: A dictionary containing a list of all watchlists with their IDs, names, and symbols.
+        """,
+    )
+)
+
+create_watchlist, create_watchlist_async = define(
+    Endpoint(
+        name="create_watchlist",
+        method="POST",
+        path="/watchlists",
+        args=(body("name", required=True), body("symbols", list[str])),
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/postwatchlist
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            name (str): The name of the watchlist to create.
+            symbols (list[str], optional): List of asset symbols to include in the watchlist. Defaults to None.
+
+        Returns:
+            dict[str, any]: A dictionary containing the created watchlist details including ID, name, and symbols.
+        """,
+    )
+)
+
+get_watchlist_by_id, get_watchlist_by_id_async = define(
+    Endpoint(
+        name="get_watchlist_by_id",
+        method="GET",
+        path="/watchlists/{watchlist_id}",
+        args=(path("watchlist_id"),),
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/getwatchlistbyid
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            watchlist_id (str): The unique identifier for the watchlist.
+
+        Returns:
+            dict[str, any]: A dictionary containing the watchlist details including ID, name, and list of symbols.
+        """,
+    )
+)
+
+update_watchlist_by_id, update_watchlist_by_id_async = define(
+    Endpoint(
+        name="update_watchlist_by_id",
+        method="PUT",
+        path="/watchlists/{watchlist_id}",
+        args=(path("watchlist_id"), body("name"), body("symbols", list[str])),
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/putwatchlistbyid
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            watchlist_id (str): The unique identifier for the watchlist to update.
+            name (str, optional): The new name for the watchlist. Defaults to None.
+            symbols (list[str], optional): The new list of symbols for the watchlist. Defaults to None.
+
+        Returns:
+            dict[str, any]: A dictionary containing the updated watchlist details.
+        """,
+    )
+)
+
+add_asset_to_watchlist, add_asset_to_watchlist_async = define(
+    Endpoint(
+        name="add_asset_to_watchlist",
+        method="POST",
+        path="/watchlists/{watchlist_id}",
+        args=(path("watchlist_id"), body("symbol", required=True)),
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/postwatchlistbyid
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            watchlist_id (str): The unique identifier for the watchlist.
+            symbol (str): The asset symbol to add to the watchlist.
+
+        Returns:
+            dict[str, any]: A dictionary containing the updated watchlist with the new symbol added.
+        """,
+    )
+)
+
+delete_watchlist_by_id, delete_watchlist_by_id_async = define(
+    Endpoint(
+        name="delete_watchlist_by_id",
+        method="DELETE",
+        path="/watchlists/{watchlist_id}",
+        args=(path("watchlist_id"),),
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/deletewatchlistbyid
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            watchlist_id (str): The unique identifier for the watchlist to delete.
+
+        Returns:
+            dict[str, any]: A dictionary containing confirmation of the deleted watchlist.
+        """,
+    )
+)
+
+get_watchlist_by_name, get_watchlist_by_name_async = define(
+    Endpoint(
+        name="get_watchlist_by_name",
+        method="GET",
+        path="/watchlists:by_name",
+        args=(query("name", required=True),),
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/getwatchlistbyname
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            name (str): The name of the watchlist to retrieve.
+
+        Returns:
+            dict[str, any]: A dictionary containing the watchlist details including ID, name, and list of symbols.
+        """,
+    )
+)
+
+update_watchlist_by_name, update_watchlist_by_name_async = define(
+    Endpoint(
+        name="update_watchlist_by_name",
+        method="PUT",
+        path="/watchlists:by_name",
+        args=(query("name", required=True), body("symbols", list[str])),
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/putwatchlistbyname
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            name (str): The name of the watchlist to update.
+            symbols (list[str], optional): The new list of symbols for the watchlist. Defaults to None.
+
+        Returns:
+            dict[str, any]: A dictionary containing the updated watchlist details.
+        """,
+    )
+)
+
+add_asset_to_watchlist_by_name, add_asset_to_watchlist_by_name_async = define(
+    Endpoint(
+        name="add_asset_to_watchlist_by_name",
+        method="POST",
+        path="/watchlists:by_name",
+        args=(query("name", required=True), body("symbol", required=True)),
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/postwatchlistbyname
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            name (str): The name of the watchlist to add the symbol to.
+            symbol (str): The asset symbol to add to the watchlist.
+
+        Returns:
+            dict[str, any]: A dictionary containing the updated watchlist with the new symbol added.
+        """,
+    )
+)
+
+delete_watchlist_by_name, delete_watchlist_by_name_async = define(
+    Endpoint(
+        name="delete_watchlist_by_name",
+        method="DELETE",
+        path="/watchlists:by_name",
+        args=(query("name", required=True),),
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/deletewatchlistbyname
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            name (str): The name of the watchlist to delete.
+
+        Returns:
+            dict[str, any]: A dictionary containing confirmation of the deleted watchlist.
+        """,
+    )
+)
+
+delete_symbol_from_watchlist, delete_symbol_from_watchlist_async = define(
+    Endpoint(
+        name="delete_symbol_from_watchlist",
+        method="DELETE",
+        path="/watchlists/{watchlist_id}/{symbol}",
+        args=(path("watchlist_id"), path("symbol")),
+        doc="""
+        Link to Documentation: https://docs.alpaca.markets/reference/deletesymbolfromwatchlist
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            watchlist_id (str): The unique identifier for the watchlist.
+            symbol (str): The asset symbol to remove from the watchlist.
+
+        Returns:
+            dict[str, any]: A dictionary containing confirmation of the symbol removal.
+        """,
+    )
+)
 
 
 if __name__ == "__main__":
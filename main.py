@@ -1,10 +1,9 @@
-import httpx
-
-from config import headers, paper_trading_base_url
+from config import paper_trading_base_url
+from core import http_client
 
 if __name__ == "__main__":
     print("start")
 
-    response = httpx.request(method="GET", url=f"{paper_trading_base_url}/account", headers=headers).json()
+    response = http_client.request(method="GET", url=f"{paper_trading_base_url}/account").json()
 
     print(f"Response = {response}")
@@ -0,0 +1,350 @@
+import datetime
+import json
+import os
+import sqlite3
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Iterable
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import snapshot_dir
+from core import codec
+from core.models import Activity, epoch_ns
+from endpoints.account_activities import iter_account_activities, iter_account_activities_async
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS activities (
+    id TEXT PRIMARY KEY,
+    activity_type TEXT NOT NULL,
+    date TEXT NOT NULL,
+    transaction_time INTEGER,
+    symbol TEXT,
+    side TEXT,
+    qty REAL,
+    price REAL,
+    net_amount REAL,
+    order_id TEXT,
+    raw TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS activities_by_symbol ON activities (symbol, date);
+CREATE INDEX IF NOT EXISTS activities_by_type ON activities (activity_type, date);
+CREATE INDEX IF NOT EXISTS activities_by_date ON activities (date);
+CREATE TABLE IF NOT EXISTS sync_state (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+# Group keys accepted by `ActivityLedger.net_amount_by`, as SQL expressions over the `activities` table.
+PERIODS = {
+    "day": "date",
+    "month": "substr(date, 1, 7)",
+    "year": "substr(date, 1, 4)",
+    "symbol": "symbol",
+    "activity_type": "activity_type",
+}
+
+
+@dataclass(slots=True)
+class FillSummary:
+    """
+    Fills of one symbol over a date range; notionals are qty * price summed per side.
+    """
+
+    fills: int
+    bought_qty: float
+    sold_qty: float
+    bought_notional: float
+    sold_notional: float
+
+    @property
+    def net_qty(self) -> float:
+        return self.bought_qty - self.sold_qty
+
+
+def default_ledger_path(paper_trading: bool) -> str:
+    """
+    Returns:
+        str: Where the ledger lives by default (`APCA_SNAPSHOT_DIR`, the temp dir unless configured).
+    """
+    return os.path.join(snapshot_dir, f"alpaca-activities-{'paper' if paper_trading else 'live'}.sqlite")
+
+
+def _float(value: any) -> float:
+    return None if value in (None, "") else float(value)
+
+
+def _row(activity: dict[str, any]) -> tuple:
+    transaction_time = activity.get("transaction_time")
+    return (
+        activity["id"],
+        activity.get("activity_type") or "",
+        # Trade activities carry a timestamp, non-trade ones a date; both index on the calendar day.
+        activity.get("date") or (transaction_time or "")[:10],
+        epoch_ns(transaction_time),
+        activity.get("symbol"),
+        activity.get("side"),
+        _float(activity.get("qty")),
+        _float(activity.get("price")),
+        _float(activity.get("net_amount")),
+        activity.get("order_id"),
+        json.dumps(activity, separators=(",", ":")),
+    )
+
+
+def _in(column: str, values: str | Iterable[str]) -> tuple[str, list]:
+    values = [values] if isinstance(values, str) else list(values)
+    return f"{column} IN ({','.join('?' * len(values))})", values
+
+
+class ActivityLedger:
+    """
+    Local, append-only copy of the account activities in SQLite, indexed by symbol, activity type and date.
+    `sync` only downloads activities newer than the ones already stored, so P&L, tax-lot and dividend reports can be
+    rebuilt from disk instead of paging the whole account history on every run. Activities are deduplicated by id.
+
+    Safe to share between threads; use as a context manager or call `close()` when done.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Args:
+            path (str): SQLite file to open or create (":memory:" for a throwaway ledger).
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def __enter__(self) -> "ActivityLedger":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def __len__(self) -> int:
+        return self._query("SELECT count(*) FROM activities")[0][0]
+
+    def _query(self, sql: str, params: Iterable = ()) -> list[tuple]:
+        with self._lock:
+            return self._db.execute(sql, list(params)).fetchall()
+
+    # Writing
+
+    def add(self, activities: Iterable[dict[str, any]]) -> int:
+        """
+        Args:
+            activities (Iterable[dict[str, any]]): Activities as returned by the account activities endpoints.
+
+        Returns:
+            int: The number of activities that were not already stored.
+        """
+        rows = [_row(activity) for activity in activities]
+        with self._lock, self._db:
+            before = self._db.total_changes
+            self._db.executemany("INSERT OR IGNORE INTO activities VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            return self._db.total_changes - before
+
+    def sync_cursor(self) -> str:
+        """
+        Returns:
+            str: The `after` value the next sync starts from: the day before the latest stored activity, so an
+                activity booked later on that day is not missed (the overlap is deduplicated). None when empty.
+        """
+        latest = self._query("SELECT max(date) FROM activities")[0][0]
+        if not latest:
+            return None
+        return (datetime.date.fromisoformat(latest) - datetime.timedelta(days=1)).isoformat()
+
+    def last_synced_at(self) -> str:
+        """
+        Returns:
+            str: ISO timestamp of the last completed sync, or None.
+        """
+        rows = self._query("SELECT value FROM sync_state WHERE key = 'last_synced_at'")
+        return rows[0][0] if rows else None
+
+    def _mark_synced(self) -> None:
+        now = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO sync_state VALUES ('last_synced_at', ?)", (now,))
+
+    def sync(self, paper_trading: bool, batch_size: int = 1000) -> int:
+        """
+        Downloads the activities newer than the stored ones (everything on the first run) and appends them.
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            batch_size (int, optional): Activities written per transaction, so an interrupted sync keeps its
+                progress. Defaults to 1000.
+
+        Returns:
+            int: The number of new activities.
+        """
+        added = 0
+        batch = []
+        for activity in iter_account_activities(paper_trading, after=self.sync_cursor(), direction="asc"):
+            batch.append(activity)
+            if len(batch) >= batch_size:
+                added += self.add(batch)
+                batch = []
+        added += self.add(batch)
+        self._mark_synced()
+        return added
+
+    async def sync_async(self, paper_trading: bool, batch_size: int = 1000) -> int:
+        """
+        Async twin of `sync`; takes the same arguments and returns the same value.
+        """
+        added = 0
+        batch = []
+        async for activity in iter_account_activities_async(paper_trading, after=self.sync_cursor(), direction="asc"):
+            batch.append(activity)
+            if len(batch) >= batch_size:
+                added += self.add(batch)
+                batch = []
+        added += self.add(batch)
+        self._mark_synced()
+        return added
+
+    # Queries
+
+    @staticmethod
+    def _where(
+        symbol: str | Iterable[str] = None,
+        activity_type: str | Iterable[str] = None,
+        start: str = None,
+        end: str = None,
+    ) -> tuple[str, list]:
+        clauses, params = [], []
+        for column, values in (("symbol", symbol), ("activity_type", activity_type)):
+            if values is not None:
+                clause, values = _in(column, values)
+                clauses.append(clause)
+                params.extend(values)
+        if start is not None:
+            clauses.append("date >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("date <= ?")
+            params.append(end)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def activities(
+        self,
+        symbol: str | Iterable[str] = None,
+        activity_type: str | Iterable[str] = None,
+        start: str = None,
+        end: str = None,
+        limit: int = None,
+    ) -> list[Activity]:
+        """
+        Args:
+            symbol (str | Iterable[str], optional): One symbol or several. Defaults to None (all).
+            activity_type (str | Iterable[str], optional): One activity type (e.g. 'FILL', 'DIV') or several.
+                Defaults to None (all).
+            start (str, optional): First day, inclusive (YYYY-MM-DD). Defaults to None.
+            end (str, optional): Last day, inclusive (YYYY-MM-DD). Defaults to None.
+            limit (int, optional): Maximum number of activities. Defaults to None.
+
+        Returns:
+            list[Activity]: Matching activities, oldest first.
+        """
+        where, params = self._where(symbol, activity_type, start, end)
+        sql = f"SELECT raw FROM activities{where} ORDER BY date, transaction_time, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [Activity.from_dict(codec.loads(raw.encode())) for (raw,) in self._query(sql, params)]
+
+    def fills_by_symbol(
+        self, symbol: str | Iterable[str] = None, start: str = None, end: str = None
+    ) -> dict[str, FillSummary]:
+        """
+        Args:
+            symbol (str | Iterable[str], optional): Restrict to these symbols. Defaults to None (all).
+            start (str, optional): First day, inclusive (YYYY-MM-DD). Defaults to None.
+            end (str, optional): Last day, inclusive (YYYY-MM-DD). Defaults to None.
+
+        Returns:
+            dict[str, FillSummary]: Fill counts, quantities and notionals per symbol.
+        """
+        where, params = self._where(symbol, "FILL", start, end)
+        rows = self._query(
+            "SELECT symbol, count(*),"
+            " total(CASE WHEN side = 'buy' THEN qty END),"
+            " total(CASE WHEN side != 'buy' THEN qty END),"
+            " total(CASE WHEN side = 'buy' THEN qty * price END),"
+            " total(CASE WHEN side != 'buy' THEN qty * price END)"
+            f" FROM activities{where} GROUP BY symbol ORDER BY symbol",
+            params,
+        )
+        return {row[0]: FillSummary(*row[1:]) for row in rows}
+
+    def net_amount_by(
+        self,
+        period: str = "month",
+        activity_type: str | Iterable[str] = None,
+        symbol: str | Iterable[str] = None,
+        start: str = None,
+        end: str = None,
+    ) -> dict[str, float]:
+        """
+        Sums `net_amount`, e.g. dividends per month: `net_amount_by("month", activity_type=("DIV", "DIVNRA"))`.
+        Args:
+            period (str, optional): Group key: 'day', 'month', 'year', 'symbol' or 'activity_type'. Defaults to
+                'month'.
+            activity_type, symbol, start, end: Same filters as `activities`.
+
+        Returns:
+            dict[str, float]: Net amount per group, in key order.
+        """
+        if period not in PERIODS:
+            raise ValueError(f"period must be one of {', '.join(PERIODS)}, not {period!r}")
+        where, params = self._where(symbol, activity_type, start, end)
+        key = PERIODS[period]
+        rows = self._query(
+            f"SELECT {key}, total(net_amount) FROM activities{where} GROUP BY {key} ORDER BY {key}", params
+        )
+        return dict(rows)
+
+    def counts_by(
+        self,
+        period: str = "activity_type",
+        activity_type: str | Iterable[str] = None,
+        symbol: str | Iterable[str] = None,
+        start: str = None,
+        end: str = None,
+    ) -> dict[str, int]:
+        """
+        Args:
+            period (str, optional): Group key, as for `net_amount_by`. Defaults to 'activity_type'.
+            activity_type, symbol, start, end: Same filters as `activities`.
+
+        Returns:
+            dict[str, int]: Number of activities per group, in key order.
+        """
+        if period not in PERIODS:
+            raise ValueError(f"period must be one of {', '.join(PERIODS)}, not {period!r}")
+        where, params = self._where(symbol, activity_type, start, end)
+        key = PERIODS[period]
+        return dict(self._query(f"SELECT {key}, count(*) FROM activities{where} GROUP BY {key} ORDER BY {key}", params))
+
+
+def open_ledger(paper_trading: bool, sync: bool = True, path: str = None) -> ActivityLedger:
+    """
+    Args:
+        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+        sync (bool, optional): Bring the ledger up to date before returning it. Defaults to True.
+        path (str, optional): Ledger file. Defaults to `default_ledger_path(paper_trading)`.
+
+    Returns:
+        ActivityLedger: The open ledger.
+    """
+    ledger = ActivityLedger(path or default_ledger_path(paper_trading))
+    if sync:
+        ledger.sync(paper_trading)
+    return ledger
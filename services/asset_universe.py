@@ -0,0 +1,356 @@
+import os
+import sys
+import time
+from dataclasses import dataclass
+from typing import Iterator
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.cache import response_cache
+from core.errors import error_from_body
+from endpoints.assets import get_assets
+
+FLAGS = ("tradable", "marginable", "shortable", "easy_to_borrow", "fractionable")
+CATEGORIES = ("exchange", "class", "status")
+
+
+@dataclass(frozen=True, slots=True)
+class Asset:
+    """
+    Lightweight view of one row of an `AssetUniverse`.
+    """
+
+    id: str
+    symbol: str
+    name: str
+    exchange: str
+    asset_class: str
+    status: str
+    tradable: bool
+    marginable: bool
+    shortable: bool
+    easy_to_borrow: bool
+    fractionable: bool
+
+
+def rows_bitmap(rows: list[int]) -> int:
+    """
+    Returns:
+        int: A bitmap with the bit of every row in `rows` set, built in one pass instead of one big-int OR per row.
+    """
+    if not rows:
+        return 0
+    buffer = bytearray(rows[-1] // 8 + 1)
+    for row in rows:
+        buffer[row >> 3] |= 1 << (row & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def bitmap_rows(bits: int) -> Iterator[int]:
+    """
+    Yields:
+        int: The index of every set bit in `bits`, lowest first; the inverse of `rows_bitmap`.
+    """
+    digits = bin(bits)[:1:-1]  # least significant bit first, without the "0b" prefix
+    row = digits.find("1")
+    while row != -1:
+        yield row
+        row = digits.find("1", row + 1)
+
+
+def _as_asset(asset: dict[str, any]) -> Asset:
+    return Asset(
+        asset["id"],
+        asset["symbol"],
+        asset.get("name") or "",
+        asset.get("exchange") or "",
+        asset.get("class") or "",
+        asset.get("status") or "",
+        *(bool(asset.get(flag)) for flag in FLAGS),
+    )
+
+
+class AssetUniverse:
+    """
+    Columnar, indexed copy of the `get_assets` response. Each asset is one row across parallel column lists;
+    symbols and asset ids map to rows through dicts (O(1) lookups), and every boolean flag and every exchange,
+    class and status value has a bitmap (a Python int, bit i = row i), so filters are a handful of integer ANDs
+    instead of a scan over 30k dicts.
+    """
+
+    def __init__(self, assets: list[dict[str, any]] = ()) -> None:
+        self._ids: list[str] = []
+        self._symbols: list[str] = []
+        self._names: list[str] = []
+        self._exchanges: list[str] = []
+        self._classes: list[str] = []
+        self._statuses: list[str] = []
+        self._row_by_symbol: dict[str, int] = {}
+        self._row_by_id: dict[str, int] = {}
+        self._flags: dict[str, int] = {flag: 0 for flag in FLAGS}
+        self._categories: dict[str, dict[str, int]] = {category: {} for category in CATEGORIES}
+        # Epoch seconds of the last `refresh` from the API (None when built from records you supplied).
+        self.fetched_at: float = None
+        self.apply(assets)
+
+    @classmethod
+    def from_api(cls, paper_trading: bool, asset_class: str = None, status: str = None) -> "AssetUniverse":
+        """
+        Loads the universe from one `get_assets` call.
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            asset_class (str, optional): Filter assets by asset class (e.g., 'us_equity', 'crypto'). Defaults to None.
+            status (str, optional): Filter assets by status (e.g., 'active', 'inactive'). Defaults to None.
+
+        Returns:
+            AssetUniverse: The indexed universe.
+        """
+        universe = cls()
+        universe.refresh(paper_trading, asset_class, status)
+        return universe
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def __contains__(self, symbol_or_asset_id: str) -> bool:
+        return symbol_or_asset_id in self._row_by_symbol or symbol_or_asset_id in self._row_by_id
+
+    def _row(self, symbol_or_asset_id: str) -> int:
+        row = self._row_by_symbol.get(symbol_or_asset_id)
+        if row is None:
+            row = self._row_by_id.get(symbol_or_asset_id)
+        return row
+
+    def _set_bit(self, index: dict[str, int], key: str, bit: int, value: bool) -> None:
+        if value:
+            index[key] = index.get(key, 0) | bit
+        elif index.get(key, 0) & bit:
+            index[key] ^= bit
+
+    def _write_row(self, row: int, asset: dict[str, any]) -> None:
+        bit = 1 << row
+        for flag in FLAGS:
+            self._set_bit(self._flags, flag, bit, bool(asset.get(flag)))
+        for category, column in zip(CATEGORIES, (self._exchanges, self._classes, self._statuses)):
+            value = sys.intern(asset.get(category) or "")
+            if column[row] != value:
+                self._set_bit(self._categories[category], column[row], bit, False)
+                column[row] = value
+            self._set_bit(self._categories[category], value, bit, True)
+        self._names[row] = asset.get("name") or ""
+
+    def apply(self, assets: list[dict[str, any]]) -> int:
+        """
+        Inserts new assets and updates known ones in place (matched by asset id), touching only their rows.
+        Args:
+            assets (list[dict[str, any]]): Asset records as returned by `get_assets` or `get_asset_by_id_or_symbol`.
+
+        Returns:
+            int: Number of rows inserted or changed.
+        """
+        changed = 0
+        new_flag_rows: dict[str, list[int]] = {flag: [] for flag in FLAGS}
+        new_category_rows: dict[str, dict[str, list[int]]] = {category: {} for category in CATEGORIES}
+        for asset in assets:
+            row = self._row_by_id.get(asset["id"])
+            if row is None:
+                row = self._append(asset)
+                for flag in FLAGS:
+                    if asset.get(flag):
+                        new_flag_rows[flag].append(row)
+                for category, column in zip(CATEGORIES, (self._exchanges, self._classes, self._statuses)):
+                    new_category_rows[category].setdefault(column[row], []).append(row)
+                changed += 1
+                continue
+            if self._asset_at(row) == _as_asset(asset):
+                continue
+            if self._symbols[row] != asset["symbol"]:
+                # Symbol change (e.g. a ticker rename): move the symbol index to the new name.
+                if self._row_by_symbol.get(self._symbols[row]) == row:
+                    del self._row_by_symbol[self._symbols[row]]
+                self._symbols[row] = sys.intern(asset["symbol"])
+                self._row_by_symbol[self._symbols[row]] = row
+            self._write_row(row, asset)
+            changed += 1
+        for flag, rows in new_flag_rows.items():
+            self._flags[flag] |= rows_bitmap(rows)
+        for category, values in new_category_rows.items():
+            index = self._categories[category]
+            for value, rows in values.items():
+                index[value] = index.get(value, 0) | rows_bitmap(rows)
+        return changed
+
+    def _append(self, asset: dict[str, any]) -> int:
+        row = len(self._symbols)
+        symbol = sys.intern(asset["symbol"])
+        self._ids.append(asset["id"])
+        self._symbols.append(symbol)
+        self._names.append(asset.get("name") or "")
+        self._exchanges.append(sys.intern(asset.get("exchange") or ""))
+        self._classes.append(sys.intern(asset.get("class") or ""))
+        self._statuses.append(sys.intern(asset.get("status") or ""))
+        self._row_by_id[asset["id"]] = row
+        self._index_symbol(row)
+        return row
+
+    def _index_symbol(self, row: int) -> None:
+        # Delisted assets can share a symbol with the live listing: never let them shadow an active one.
+        symbol = self._symbols[row]
+        current = self._row_by_symbol.get(symbol)
+        if current is None or self._statuses[current] != "active" or self._statuses[row] == "active":
+            self._row_by_symbol[symbol] = row
+
+    def refresh(self, paper_trading: bool, asset_class: str = None, status: str = None) -> int:
+        """
+        Re-downloads the asset list, bypassing the response cache, and applies the differences. Assets that are no
+        longer listed stay in the universe with their last known state.
+
+        Returns:
+            int: Number of rows inserted or changed.
+        """
+        response_cache.invalidate("get_assets")
+        fetched_at = time.time()
+        response_json = get_assets(paper_trading, asset_class, status)
+        error = error_from_body(response_json)
+        if error is not None:
+            raise error
+        changed = self.apply(response_json)
+        self.fetched_at = fetched_at
+        return changed
+
+    def to_columns(self) -> dict[str, any]:
+        """
+        Returns:
+            dict[str, any]: The universe as named columns: a list per text field, a bitmap per boolean flag and a
+                bitmap per exchange/class/status value (named e.g. 'exchange=NASDAQ').
+        """
+        columns = {
+            "id": self._ids,
+            "symbol": self._symbols,
+            "name": self._names,
+            "exchange": self._exchanges,
+            "class": self._classes,
+            "status": self._statuses,
+        }
+        columns.update(self._flags)
+        for category, index in self._categories.items():
+            columns.update({f"{category}={value}": bits for value, bits in index.items()})
+        return columns
+
+    @classmethod
+    def from_columns(cls, columns: dict[str, any], fetched_at: float = None) -> "AssetUniverse":
+        """
+        Rebuilds a universe from `to_columns` output (e.g. a snapshot) without going through per-asset dicts.
+        Args:
+            columns (dict[str, any]): Columns as produced by `to_columns`.
+            fetched_at (float, optional): Epoch seconds at which the data was fetched. Defaults to None.
+
+        Returns:
+            AssetUniverse: The indexed universe.
+        """
+        universe = cls()
+        universe._ids = list(columns["id"])
+        universe._symbols = list(map(sys.intern, columns["symbol"]))
+        universe._names = list(columns["name"])
+        universe._exchanges = list(map(sys.intern, columns["exchange"]))
+        universe._classes = list(map(sys.intern, columns["class"]))
+        universe._statuses = list(map(sys.intern, columns["status"]))
+        universe._row_by_id = dict(zip(universe._ids, range(len(universe._ids))))
+        universe._row_by_symbol = dict(zip(universe._symbols, range(len(universe._symbols))))
+        if len(universe._row_by_symbol) != len(universe._symbols):
+            # Shared symbols: re-index row by row so delisted duplicates do not shadow active listings.
+            universe._row_by_symbol = {}
+            for row in range(len(universe._symbols)):
+                universe._index_symbol(row)
+        universe._flags = {flag: columns[flag] for flag in FLAGS}
+        for category, column in zip(CATEGORIES, (universe._exchanges, universe._classes, universe._statuses)):
+            prefix = f"{category}="
+            index = {name[len(prefix) :]: bits for name, bits in columns.items() if name.startswith(prefix)}
+            if not index:
+                rows_by_value: dict[str, list[int]] = {}
+                for row, value in enumerate(column):
+                    rows_by_value.setdefault(value, []).append(row)
+                index = {value: rows_bitmap(rows) for value, rows in rows_by_value.items()}
+            universe._categories[category] = index
+        universe.fetched_at = fetched_at
+        return universe
+
+    def _asset_at(self, row: int) -> Asset:
+        bit = 1 << row
+        return Asset(
+            self._ids[row],
+            self._symbols[row],
+            self._names[row],
+            self._exchanges[row],
+            self._classes[row],
+            self._statuses[row],
+            *(bool(self._flags[flag] & bit) for flag in FLAGS),
+        )
+
+    def get(self, symbol_or_asset_id: str) -> Asset:
+        """
+        Returns:
+            Asset: The asset with this symbol or asset id, or None if unknown.
+        """
+        row = self._row(symbol_or_asset_id)
+        return None if row is None else self._asset_at(row)
+
+    def has_flag(self, symbol_or_asset_id: str, flag: str) -> bool:
+        """
+        Args:
+            symbol_or_asset_id (str): The asset symbol (e.g., 'AAPL') or asset ID.
+            flag (str): One of 'tradable', 'marginable', 'shortable', 'easy_to_borrow', 'fractionable'.
+
+        Returns:
+            bool: Whether the asset has the flag set (False for unknown assets).
+        """
+        row = self._row(symbol_or_asset_id)
+        return row is not None and bool(self._flags[flag] >> row & 1)
+
+    def is_tradable(self, symbol_or_asset_id: str) -> bool:
+        return self.has_flag(symbol_or_asset_id, "tradable")
+
+    def is_fractionable(self, symbol_or_asset_id: str) -> bool:
+        return self.has_flag(symbol_or_asset_id, "fractionable")
+
+    def is_shortable(self, symbol_or_asset_id: str) -> bool:
+        return self.has_flag(symbol_or_asset_id, "shortable")
+
+    def mask(self, exchange: str = None, asset_class: str = None, status: str = None, **flags: bool) -> int:
+        """
+        Builds the bitmap of rows matching every given filter.
+        Args:
+            exchange (str, optional): Exchange code (e.g., 'NASDAQ'). Defaults to None.
+            asset_class (str, optional): Asset class (e.g., 'us_equity'). Defaults to None.
+            status (str, optional): Asset status (e.g., 'active'). Defaults to None.
+            **flags (bool): Required value of any boolean flag, e.g. `tradable=True, shortable=False`.
+
+        Returns:
+            int: Bit i is set when row i matches.
+        """
+        bits = (1 << len(self._symbols)) - 1
+        for category, value in (("exchange", exchange), ("class", asset_class), ("status", status)):
+            if value is not None:
+                bits &= self._categories[category].get(value, 0)
+        for flag, wanted in flags.items():
+            bits &= self._flags[flag] if wanted else ~self._flags[flag]
+        return bits
+
+    def select(self, exchange: str = None, asset_class: str = None, status: str = None, **flags: bool) -> list[str]:
+        """
+        Takes the same filters as `mask`.
+
+        Returns:
+            list[str]: Symbols of every asset matching all filters, in load order.
+        """
+        symbols = self._symbols
+        return [symbols[row] for row in bitmap_rows(self.mask(exchange, asset_class, status, **flags))]
+
+    def count(self, exchange: str = None, asset_class: str = None, status: str = None, **flags: bool) -> int:
+        """
+        Takes the same filters as `mask`.
+
+        Returns:
+            int: Number of assets matching all filters.
+        """
+        return self.mask(exchange, asset_class, status, **flags).bit_count()
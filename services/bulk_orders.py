@@ -0,0 +1,107 @@
+import asyncio
+import os
+import sys
+from dataclasses import dataclass
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core import http_client
+from core.errors import AlpacaAPIError, error_from_body
+from core.rate_limiter import TokenBucket
+from endpoints.orders import create_order_async, get_order_by_client_order_id_async, with_client_order_id
+
+
+@dataclass(slots=True)
+class OrderSubmission:
+    """
+    Outcome of one order in a batch. Exactly one of `order` and `error` is set.
+    """
+
+    index: int
+    client_order_id: str
+    order: dict = None
+    error: Exception = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# What Alpaca answers when an order reuses a known client_order_id. The code alone also covers other invalid requests.
+DUPLICATE_CLIENT_ORDER_ID_CODE = 40010001
+DUPLICATE_CLIENT_ORDER_ID_MESSAGE = "client_order_id must be unique"
+
+
+def _is_duplicate_client_order_id(error: AlpacaAPIError) -> bool:
+    return error.code == DUPLICATE_CLIENT_ORDER_ID_CODE and error.message == DUPLICATE_CLIENT_ORDER_ID_MESSAGE
+
+
+async def _submit_one(
+    paper_trading: bool, index: int, order_data: dict, semaphore: asyncio.Semaphore, pacer: TokenBucket
+) -> OrderSubmission:
+    order_data = with_client_order_id(order_data)
+    client_order_id = order_data["client_order_id"]
+    async with semaphore:
+        try:
+            if pacer is not None:
+                await pacer.acquire_async()
+            response_json = await create_order_async(paper_trading, order_data)
+            error = error_from_body(response_json)
+            if error is not None and _is_duplicate_client_order_id(error):
+                # The order already reached Alpaca (e.g. a resubmitted batch): report the existing order instead.
+                response_json = await get_order_by_client_order_id_async(paper_trading, client_order_id)
+                error = error_from_body(response_json)
+        except Exception as exc:
+            return OrderSubmission(index=index, client_order_id=client_order_id, error=exc)
+    if error is not None:
+        return OrderSubmission(index=index, client_order_id=client_order_id, error=error)
+    return OrderSubmission(index=index, client_order_id=client_order_id, order=response_json)
+
+
+async def submit_orders_async(
+    paper_trading: bool, orders: list[dict], concurrency: int = 10, max_per_second: float = None
+) -> list[OrderSubmission]:
+    """
+    Submits many orders concurrently through `create_order_async`.
+    Args:
+        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+        orders (list[dict]): Order parameters, one dict per order, as accepted by `create_order`. Orders without a
+            `client_order_id` get a random one; pass your own to make resubmitting a batch idempotent, since an
+            order whose `client_order_id` Alpaca already knows is reported as the existing order.
+        concurrency (int, optional): Maximum number of orders in flight at once. Defaults to 10.
+        max_per_second (float, optional): Cap on order submissions started per second for this batch, on top of the
+            shared account-wide limiter. Defaults to None (no extra cap).
+
+    Returns:
+        list[OrderSubmission]: One result per input order, in input order. Failures are reported in `error`
+            instead of being raised, so one rejected order never hides the others.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    pacer = TokenBucket(capacity=1, refill_per_second=max_per_second) if max_per_second else None
+    return list(
+        await asyncio.gather(
+            *(
+                _submit_one(paper_trading, index, order_data, semaphore, pacer)
+                for index, order_data in enumerate(orders)
+            )
+        )
+    )
+
+
+def submit_orders(
+    paper_trading: bool, orders: list[dict], concurrency: int = 10, max_per_second: float = None
+) -> list[OrderSubmission]:
+    """
+    Blocking wrapper around `submit_orders_async` for callers without an event loop; takes the same arguments.
+
+    Returns:
+        list[OrderSubmission]: One result per input order, in input order.
+    """
+
+    async def run() -> list[OrderSubmission]:
+        try:
+            return await submit_orders_async(paper_trading, orders, concurrency, max_per_second)
+        finally:
+            await http_client.close_async_client()
+
+    return asyncio.run(run())
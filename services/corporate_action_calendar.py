@@ -0,0 +1,305 @@
+import asyncio
+import bisect
+import datetime
+import os
+import sys
+from typing import Iterable
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core import http_client
+from core.errors import error_from_body
+from endpoints.corporate_actions import get_announcements_async
+
+CA_TYPES = ("dividend", "merger", "spinoff", "split")
+DATE_TYPES = ("declaration_date", "ex_date", "record_date", "payable_date")
+# The announcements endpoint rejects since/until ranges longer than 90 days.
+MAX_WINDOW_DAYS = 90
+# Symbols per request; keeps the query string well under common URL length limits.
+SYMBOLS_PER_REQUEST = 100
+
+
+def date_windows(since: str, until: str, days: int = MAX_WINDOW_DAYS) -> list[tuple[str, str]]:
+    """
+    Args:
+        since (str): First day, inclusive (YYYY-MM-DD).
+        until (str): Last day, inclusive (YYYY-MM-DD).
+        days (int, optional): Longest window. Defaults to MAX_WINDOW_DAYS.
+
+    Returns:
+        list[tuple[str, str]]: Consecutive, non-overlapping (since, until) windows covering the range.
+    """
+    start = datetime.date.fromisoformat(since)
+    end = datetime.date.fromisoformat(until)
+    windows = []
+    while start <= end:
+        stop = min(end, start + datetime.timedelta(days=days - 1))
+        windows.append((start.isoformat(), stop.isoformat()))
+        start = stop + datetime.timedelta(days=1)
+    return windows
+
+
+def _checked(response_json: any) -> any:
+    error = error_from_body(response_json)
+    if error is not None:
+        raise error
+    return response_json
+
+
+async def fetch_announcements_async(
+    paper_trading: bool,
+    since: str,
+    until: str,
+    symbols: Iterable[str] = None,
+    ca_types: Iterable[str] = CA_TYPES,
+    date_type: str = None,
+    concurrency: int = 8,
+    symbols_per_request: int = SYMBOLS_PER_REQUEST,
+    window_days: int = MAX_WINDOW_DAYS,
+) -> list[dict[str, any]]:
+    """
+    Splits a long date range and a long symbol list into requests `get_announcements` accepts, runs them concurrently
+    and merges the results, dropping announcements returned by more than one request.
+    Args:
+        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+        since (str): First day, inclusive (YYYY-MM-DD).
+        until (str): Last day, inclusive (YYYY-MM-DD).
+        symbols (Iterable[str], optional): Symbols to filter by. Defaults to None (all symbols).
+        ca_types (Iterable[str], optional): Corporate action types. Defaults to CA_TYPES (all of them).
+        date_type (str, optional): Which date `since`/`until` apply to (see DATE_TYPES). Defaults to None (the API's
+            default).
+        concurrency (int, optional): Requests in flight at once. Defaults to 8.
+        symbols_per_request (int, optional): Symbols per request. Defaults to SYMBOLS_PER_REQUEST.
+        window_days (int, optional): Longest date window per request. Defaults to MAX_WINDOW_DAYS.
+
+    Returns:
+        list[dict[str, any]]: The announcements, one per id, in no particular order.
+    """
+    symbols = sorted(set(symbols)) if symbols is not None else None
+    symbol_batches = (
+        [None]
+        if symbols is None
+        else [
+            ",".join(symbols[start : start + symbols_per_request])
+            for start in range(0, len(symbols), symbols_per_request)
+        ]
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+    ca_types = ",".join(ca_types)
+
+    async def fetch(batch: str, window: tuple[str, str]) -> list[dict[str, any]]:
+        async with semaphore:
+            return _checked(
+                await get_announcements_async(paper_trading, ca_types, batch, window[0], window[1], date_type=date_type)
+            )
+
+    pages = await asyncio.gather(
+        *(fetch(batch, window) for batch in symbol_batches for window in date_windows(since, until, window_days))
+    )
+    announcements = {}
+    for page in pages:
+        for announcement in page:
+            announcements.setdefault(announcement["id"], announcement)
+    return list(announcements.values())
+
+
+def fetch_announcements(paper_trading: bool, since: str, until: str, **options: any) -> list[dict[str, any]]:
+    """
+    Blocking wrapper around `fetch_announcements_async` for callers without an event loop; takes the same arguments.
+    """
+
+    async def run() -> list[dict[str, any]]:
+        try:
+            return await fetch_announcements_async(paper_trading, since, until, **options)
+        finally:
+            await http_client.close_async_client()
+
+    return asyncio.run(run())
+
+
+class CorporateActionCalendar:
+    """
+    Corporate action announcements indexed by symbol and, for every date type, by date: per symbol, the dates are
+    kept sorted next to the announcement ids, so "which of these holdings has an ex-date in the next N days" is one
+    bisect per holding. Both the initiating and the target symbol of an announcement are indexed.
+    """
+
+    def __init__(self, announcements: Iterable[dict[str, any]] = ()) -> None:
+        self._by_id: dict[str, dict[str, any]] = {}
+        # date type -> symbol -> (sorted dates, announcement ids in the same order)
+        self._by_symbol_date: dict[str, dict[str, tuple[list[str], list[str]]]] = {name: {} for name in DATE_TYPES}
+        # date type -> (sorted dates, announcement ids in the same order), across all symbols
+        self._by_date: dict[str, tuple[list[str], list[str]]] = {name: ([], []) for name in DATE_TYPES}
+        self._by_type: dict[str, set[str]] = {}
+        self.add(announcements)
+
+    @classmethod
+    async def from_api_async(
+        cls, paper_trading: bool, since: str, until: str, symbols: Iterable[str] = None, **options: any
+    ) -> "CorporateActionCalendar":
+        """
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            since (str): First day, inclusive (YYYY-MM-DD).
+            until (str): Last day, inclusive (YYYY-MM-DD).
+            symbols (Iterable[str], optional): Symbols to load. Defaults to None (all symbols).
+            **options (any): Other arguments of `fetch_announcements_async` (ca_types, date_type, concurrency...).
+
+        Returns:
+            CorporateActionCalendar: The indexed announcements.
+        """
+        return cls(await fetch_announcements_async(paper_trading, since, until, symbols, **options))
+
+    @classmethod
+    def from_api(
+        cls, paper_trading: bool, since: str, until: str, symbols: Iterable[str] = None, **options: any
+    ) -> "CorporateActionCalendar":
+        """
+        Blocking wrapper around `from_api_async`; takes the same arguments.
+        """
+        return cls(fetch_announcements(paper_trading, since, until, symbols=symbols, **options))
+
+    def add(self, announcements: Iterable[dict[str, any]]) -> int:
+        """
+        Args:
+            announcements (Iterable[dict[str, any]]): Announcements as returned by `get_announcements`; a known id
+                replaces the stored announcement.
+
+        Returns:
+            int: The number of announcements that were new.
+        """
+        added = 0
+        for announcement in announcements:
+            announcement_id = announcement["id"]
+            if announcement_id in self._by_id:
+                self._remove(announcement_id)
+            else:
+                added += 1
+            self._by_id[announcement_id] = announcement
+            self._by_type.setdefault(announcement.get("ca_type"), set()).add(announcement_id)
+            for date_type in DATE_TYPES:
+                date = announcement.get(date_type)
+                if not date:
+                    continue
+                _insert(self._by_date[date_type], date, announcement_id)
+                for symbol in _symbols(announcement):
+                    _insert(self._by_symbol_date[date_type].setdefault(symbol, ([], [])), date, announcement_id)
+        return added
+
+    def _remove(self, announcement_id: str) -> None:
+        announcement = self._by_id.pop(announcement_id)
+        self._by_type.get(announcement.get("ca_type"), set()).discard(announcement_id)
+        for date_type in DATE_TYPES:
+            date = announcement.get(date_type)
+            if not date:
+                continue
+            _delete(self._by_date[date_type], date, announcement_id)
+            for symbol in _symbols(announcement):
+                _delete(self._by_symbol_date[date_type][symbol], date, announcement_id)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def get(self, announcement_id: str) -> dict[str, any]:
+        return self._by_id.get(announcement_id)
+
+    def between(
+        self,
+        start: str,
+        end: str,
+        date_type: str = "ex_date",
+        ca_types: Iterable[str] = None,
+        symbols: Iterable[str] = None,
+    ) -> list[dict[str, any]]:
+        """
+        Args:
+            start (str): First day, inclusive (YYYY-MM-DD).
+            end (str): Last day, inclusive (YYYY-MM-DD).
+            date_type (str, optional): The date to range over (see DATE_TYPES). Defaults to 'ex_date'.
+            ca_types (Iterable[str], optional): Keep only these corporate action types. Defaults to None (all).
+            symbols (Iterable[str], optional): Keep only these symbols. Defaults to None (all).
+
+        Returns:
+            list[dict[str, any]]: Matching announcements, by date.
+        """
+        if symbols is None:
+            ids = _range(self._by_date[date_type], start, end)
+        else:
+            by_symbol = self._by_symbol_date[date_type]
+            ids = sorted(
+                {
+                    announcement_id
+                    for symbol in symbols
+                    if symbol in by_symbol
+                    for announcement_id in _range(by_symbol[symbol], start, end)
+                },
+                key=lambda announcement_id: (self._by_id[announcement_id][date_type], announcement_id),
+            )
+        allowed = None if ca_types is None else set().union(*(self._by_type.get(name, ()) for name in ca_types))
+        return [
+            self._by_id[announcement_id] for announcement_id in ids if allowed is None or announcement_id in allowed
+        ]
+
+    def upcoming(
+        self,
+        symbols: Iterable[str],
+        days: int,
+        date_type: str = "ex_date",
+        ca_types: Iterable[str] = None,
+        today: str = None,
+    ) -> dict[str, list[dict[str, any]]]:
+        """
+        Pre-open check: which of `symbols` have a `date_type` within the next `days` days.
+        Args:
+            symbols (Iterable[str]): Symbols to check, e.g. the open positions.
+            days (int): Days ahead, counting today.
+            date_type (str, optional): The date to check (see DATE_TYPES). Defaults to 'ex_date'.
+            ca_types (Iterable[str], optional): Keep only these corporate action types. Defaults to None (all).
+            today (str, optional): First day of the window (YYYY-MM-DD). Defaults to today's date.
+
+        Returns:
+            dict[str, list[dict[str, any]]]: For each symbol with at least one match, its announcements by date.
+        """
+        start = datetime.date.fromisoformat(today) if today else datetime.date.today()
+        end = (start + datetime.timedelta(days=days - 1)).isoformat()
+        start = start.isoformat()
+        by_symbol = self._by_symbol_date[date_type]
+        ca_types = None if ca_types is None else set(ca_types)
+        matches = {}
+        for symbol in symbols:
+            series = by_symbol.get(symbol)
+            if series is None:
+                continue
+            announcements = [
+                self._by_id[announcement_id]
+                for announcement_id in _range(series, start, end)
+                if ca_types is None or self._by_id[announcement_id].get("ca_type") in ca_types
+            ]
+            if announcements:
+                matches[symbol] = announcements
+        return matches
+
+
+def _symbols(announcement: dict[str, any]) -> set[str]:
+    return {symbol for symbol in (announcement.get("initiating_symbol"), announcement.get("target_symbol")) if symbol}
+
+
+def _insert(series: tuple[list[str], list[str]], date: str, announcement_id: str) -> None:
+    dates, ids = series
+    position = bisect.bisect_right(dates, date)
+    dates.insert(position, date)
+    ids.insert(position, announcement_id)
+
+
+def _delete(series: tuple[list[str], list[str]], date: str, announcement_id: str) -> None:
+    dates, ids = series
+    position = bisect.bisect_left(dates, date)
+    while ids[position] != announcement_id:
+        position += 1
+    del dates[position]
+    del ids[position]
+
+
+def _range(series: tuple[list[str], list[str]], start: str, end: str) -> list[str]:
+    dates, ids = series
+    return ids[bisect.bisect_left(dates, start) : bisect.bisect_right(dates, end)]
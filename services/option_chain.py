@@ -0,0 +1,456 @@
+import asyncio
+import bisect
+import os
+import sys
+import time
+from array import array
+from dataclasses import dataclass
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core import http_client
+from endpoints.option_contracts import iter_option_contracts_async
+from services.asset_universe import bitmap_rows, rows_bitmap
+from services.snapshots import (
+    OPTION_CONTRACT_FLOAT_FIELDS,
+    OPTION_CONTRACT_TEXT_FIELDS,
+    OPTION_CONTRACTS_KIND,
+    Snapshot,
+    write_snapshot,
+)
+
+OPTION_TYPES = ("call", "put")
+# Low-cardinality columns; interning makes them one shared string per value.
+_INTERNED_FIELDS = (
+    "status",
+    "root_symbol",
+    "underlying_symbol",
+    "underlying_asset_id",
+    "type",
+    "style",
+    "expiration_date",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class OptionContract:
+    """
+    Lightweight view of one row of an `OptionChain`.
+    """
+
+    id: str
+    symbol: str
+    underlying_symbol: str
+    type: str
+    style: str
+    expiration_date: str
+    strike_price: float
+    multiplier: float
+    size: float
+    open_interest: float
+    close_price: float
+    tradable: bool
+
+
+def _float(value: any) -> float:
+    return float(value) if value not in (None, "") else float("nan")
+
+
+class OptionChain:
+    """
+    Columnar, indexed option chains for a set of underlyings. Contracts are rows across parallel columns (strikes
+    and other numbers in `array('d')`), and every (underlying, expiration, type) series keeps its strikes sorted
+    next to the matching rows, so "strikes around spot" and "expirations in a window" are a couple of bisects instead
+    of a scan over every contract.
+
+    Build it with `from_api` (pages several underlyings concurrently), or `load_snapshot` for a cold start, and keep
+    it current with `refresh`, which only rewrites the rows that changed.
+    """
+
+    def __init__(self, contracts: list[dict[str, any]] = ()) -> None:
+        # Every snapshot column is kept; the ones queried most get their own attribute (same list objects).
+        self._text: dict[str, list[str]] = {name: [] for name in OPTION_CONTRACT_TEXT_FIELDS}
+        self._floats: dict[str, array] = {name: array("d") for name in OPTION_CONTRACT_FLOAT_FIELDS}
+        self._ids = self._text["id"]
+        self._symbols = self._text["symbol"]
+        self._underlyings = self._text["underlying_symbol"]
+        self._types = self._text["type"]
+        self._expirations = self._text["expiration_date"]
+        self._strikes = self._floats["strike_price"]
+        self._tradable = bytearray()
+        # Rows replaced by a refresh stay in the columns but leave every index.
+        self._live = bytearray()
+        self._row_by_id: dict[str, int] = {}
+        self._row_by_symbol: dict[str, int] = {}
+        self._rows_by_underlying: dict[str, set[int]] = {}
+        self._expirations_by_underlying: dict[str, list[str]] = {}
+        # underlying -> (expiration, type) -> (sorted strikes, rows in the same order)
+        self._series: dict[str, dict[tuple[str, str], tuple[array, list[int]]]] = {}
+        # Epoch seconds of the last fetch from the API (None when built from records you supplied).
+        self.fetched_at: float = None
+        self.apply(contracts)
+
+    # Building
+
+    @classmethod
+    async def from_api_async(
+        cls, paper_trading: bool, underlyings: list[str], concurrency: int = 8, batch_size: int = 10, **filters: any
+    ) -> "OptionChain":
+        """
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            underlyings (list[str]): Underlying symbols whose chains to load.
+            concurrency (int, optional): Batches paged at the same time. Defaults to 8.
+            batch_size (int, optional): Underlyings per `get_option_contracts` call (`underlying_symbols`). Defaults
+                to 10.
+            **filters (any): Other filters accepted by `iter_option_contracts` (e.g. `expiration_date_lte`).
+
+        Returns:
+            OptionChain: The indexed chains.
+        """
+        chain = cls()
+        await chain.refresh_async(paper_trading, underlyings, concurrency, batch_size, **filters)
+        return chain
+
+    @classmethod
+    def from_api(
+        cls, paper_trading: bool, underlyings: list[str], concurrency: int = 8, batch_size: int = 10, **filters: any
+    ) -> "OptionChain":
+        """
+        Blocking wrapper around `from_api_async` for callers without an event loop; takes the same arguments.
+        """
+
+        async def run() -> "OptionChain":
+            try:
+                return await cls.from_api_async(paper_trading, underlyings, concurrency, batch_size, **filters)
+            finally:
+                await http_client.close_async_client()
+
+        return asyncio.run(run())
+
+    async def refresh_async(
+        self,
+        paper_trading: bool,
+        underlyings: list[str] = None,
+        concurrency: int = 8,
+        batch_size: int = 10,
+        **filters: any,
+    ) -> tuple[int, int, int]:
+        """
+        Re-downloads the chains of `underlyings` (default: every underlying already loaded) and applies the
+        differences; contracts no longer listed for those underlyings are dropped.
+
+        Returns:
+            tuple[int, int, int]: Contracts added, changed and removed.
+        """
+        underlyings = sorted(self._rows_by_underlying) if underlyings is None else list(underlyings)
+        fetched_at = time.time()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(batch: list[str]) -> list[dict[str, any]]:
+            async with semaphore:
+                return [
+                    contract
+                    async for contract in iter_option_contracts_async(
+                        paper_trading, underlying_symbols=",".join(batch), limit=10000, prefetch=0, **filters
+                    )
+                ]
+
+        pages = await asyncio.gather(
+            *(fetch(underlyings[start : start + batch_size]) for start in range(0, len(underlyings), batch_size))
+        )
+        changes = self.apply([contract for page in pages for contract in page], underlyings)
+        self.fetched_at = fetched_at
+        return changes
+
+    def refresh(
+        self,
+        paper_trading: bool,
+        underlyings: list[str] = None,
+        concurrency: int = 8,
+        batch_size: int = 10,
+        **filters: any,
+    ) -> tuple[int, int, int]:
+        """
+        Blocking wrapper around `refresh_async`; takes the same arguments.
+        """
+
+        async def run() -> tuple[int, int, int]:
+            try:
+                return await self.refresh_async(paper_trading, underlyings, concurrency, batch_size, **filters)
+            finally:
+                await http_client.close_async_client()
+
+        return asyncio.run(run())
+
+    def apply(self, contracts: list[dict[str, any]], underlyings: list[str] = None) -> tuple[int, int, int]:
+        """
+        Inserts new contracts and rewrites changed ones; only the series of the underlyings involved are re-indexed.
+        Args:
+            contracts (list[dict[str, any]]): Option contracts as returned by `get_option_contracts`.
+            underlyings (list[str], optional): Underlyings `contracts` is the complete listing for; their contracts
+                missing from `contracts` are removed. Defaults to None (remove nothing).
+
+        Returns:
+            tuple[int, int, int]: Contracts added, changed and removed.
+        """
+        added = changed = removed = 0
+        touched = set(underlyings or ())
+        seen = set()
+        for contract in contracts:
+            row = self._row_by_id.get(contract["id"])
+            if row is None:
+                row = self._append(contract)
+                added += 1
+            elif self._differs(row, contract):
+                self._remove_row(row)
+                row = self._append(contract)
+                changed += 1
+            seen.add(row)
+            touched.add(self._underlyings[row])
+        for underlying in underlyings or ():
+            for row in list(self._rows_by_underlying.get(underlying, ())):
+                if row not in seen:
+                    self._remove_row(row)
+                    removed += 1
+        self._reindex(touched)
+        if len(self._live) > 2 * len(self._row_by_id) + 1024:
+            # Mostly superseded rows: rebuild the columns from the live ones.
+            vars(self).update(vars(OptionChain.from_columns(self.to_columns(), self.fetched_at)))
+        return added, changed, removed
+
+    def _append(self, contract: dict[str, any]) -> int:
+        row = len(self._ids)
+        underlying = contract.get("underlying_symbol") or contract.get("root_symbol") or ""
+        for name, column in self._text.items():
+            value = underlying if name == "underlying_symbol" else contract.get(name) or ""
+            column.append(sys.intern(value) if name in _INTERNED_FIELDS else value)
+        for name, column in self._floats.items():
+            column.append(_float(contract.get(name)))
+        self._tradable.append(bool(contract.get("tradable")))
+        self._live.append(1)
+        self._row_by_id[contract["id"]] = row
+        self._row_by_symbol[contract["symbol"]] = row
+        self._rows_by_underlying.setdefault(underlying, set()).add(row)
+        return row
+
+    def _differs(self, row: int, contract: dict[str, any]) -> bool:
+        return (
+            bool(self._tradable[row]) != bool(contract.get("tradable"))
+            or any(not _same(column[row], _float(contract.get(name))) for name, column in self._floats.items())
+            or any(
+                column[row] != (contract.get(name) or "")
+                for name, column in self._text.items()
+                if name != "underlying_symbol"
+            )
+        )
+
+    def _remove_row(self, row: int) -> None:
+        self._live[row] = 0
+        self._row_by_id.pop(self._ids[row], None)
+        if self._row_by_symbol.get(self._symbols[row]) == row:
+            del self._row_by_symbol[self._symbols[row]]
+        rows = self._rows_by_underlying.get(self._underlyings[row])
+        if rows is not None:
+            rows.discard(row)
+
+    def _reindex(self, underlyings: set[str]) -> None:
+        for underlying in underlyings:
+            rows_by_series: dict[tuple[str, str], list[int]] = {}
+            for row in self._rows_by_underlying.get(underlying, ()):
+                rows_by_series.setdefault((self._expirations[row], self._types[row]), []).append(row)
+            if not rows_by_series:
+                self._series.pop(underlying, None)
+                self._expirations_by_underlying.pop(underlying, None)
+                self._rows_by_underlying.pop(underlying, None)
+                continue
+            series = self._series[underlying] = {}
+            for key, rows in rows_by_series.items():
+                rows.sort(key=self._strikes.__getitem__)
+                series[key] = (array("d", (self._strikes[row] for row in rows)), rows)
+            self._expirations_by_underlying[underlying] = sorted({expiration for expiration, _ in rows_by_series})
+
+    # Snapshots
+
+    def to_columns(self) -> dict[str, any]:
+        """
+        Returns:
+            dict[str, any]: The live contracts in the option-contract snapshot layout of `services.snapshots`.
+        """
+        rows = [row for row in range(len(self._ids)) if self._live[row]]
+        columns: dict[str, any] = {name: [column[row] for row in rows] for name, column in self._text.items()}
+        for name, column in self._floats.items():
+            columns[name] = array("d", (column[row] for row in rows))
+        columns["tradable"] = rows_bitmap([index for index, row in enumerate(rows) if self._tradable[row]])
+        return columns
+
+    def save_snapshot(self, path: str) -> None:
+        """
+        Writes the chains as an option-contract snapshot (readable with `load_option_contracts` too).
+        """
+        write_snapshot(path, OPTION_CONTRACTS_KIND, self.to_columns(), self.fetched_at or time.time())
+
+    @classmethod
+    def from_columns(cls, columns: dict[str, any], fetched_at: float = None) -> "OptionChain":
+        """
+        Args:
+            columns (dict[str, any]): Columns in the layout produced by `to_columns` (missing ones are left empty).
+            fetched_at (float, optional): Epoch seconds at which the data was fetched. Defaults to None.
+
+        Returns:
+            OptionChain: The indexed chains.
+        """
+        chain = cls()
+        count = len(columns["id"])
+        for name, column in chain._text.items():
+            values = columns.get(name) or [""] * count
+            column.extend(map(sys.intern, values) if name in _INTERNED_FIELDS else values)
+        for name, column in chain._floats.items():
+            column.extend(columns.get(name) or array("d", [float("nan")]) * count)
+        chain._tradable = bytearray(count)
+        for row in bitmap_rows(columns.get("tradable", 0)):
+            chain._tradable[row] = 1
+        chain._live = bytearray(b"\1" * count)
+        chain._row_by_id = dict(zip(chain._ids, range(count)))
+        chain._row_by_symbol = dict(zip(chain._symbols, range(count)))
+        for row, underlying in enumerate(chain._underlyings):
+            chain._rows_by_underlying.setdefault(underlying, set()).add(row)
+        chain._reindex(set(chain._rows_by_underlying))
+        chain.fetched_at = fetched_at
+        return chain
+
+    @classmethod
+    def load_snapshot(cls, path: str) -> "OptionChain":
+        """
+        Args:
+            path (str): A snapshot written by `save_snapshot` or `services.snapshots.save_option_contracts`.
+
+        Returns:
+            OptionChain: The indexed chains, with `fetched_at` taken from the snapshot.
+        """
+        with Snapshot(path, OPTION_CONTRACTS_KIND) as snapshot:
+            columns = {name: snapshot.column(name) for name in snapshot.column_names}
+            return cls.from_columns(columns, snapshot.fetched_at)
+
+    # Queries
+
+    def __len__(self) -> int:
+        return len(self._row_by_id)
+
+    def __contains__(self, symbol_or_contract_id: str) -> bool:
+        return symbol_or_contract_id in self._row_by_symbol or symbol_or_contract_id in self._row_by_id
+
+    def _contract_at(self, row: int) -> OptionContract:
+        return OptionContract(
+            self._ids[row],
+            self._symbols[row],
+            self._underlyings[row],
+            self._types[row],
+            self._text["style"][row],
+            self._expirations[row],
+            self._strikes[row],
+            self._floats["multiplier"][row],
+            self._floats["size"][row],
+            self._floats["open_interest"][row],
+            self._floats["close_price"][row],
+            bool(self._tradable[row]),
+        )
+
+    def get(self, symbol_or_contract_id: str) -> OptionContract:
+        """
+        Returns:
+            OptionContract: The contract, or None if it is not in the chain.
+        """
+        row = self._row_by_symbol.get(symbol_or_contract_id, self._row_by_id.get(symbol_or_contract_id))
+        return None if row is None else self._contract_at(row)
+
+    def underlyings(self) -> list[str]:
+        return sorted(self._expirations_by_underlying)
+
+    def expirations(self, underlying: str, start: str = None, end: str = None) -> list[str]:
+        """
+        Args:
+            underlying (str): Underlying symbol.
+            start (str, optional): Earliest expiration, inclusive (YYYY-MM-DD). Defaults to None.
+            end (str, optional): Latest expiration, inclusive (YYYY-MM-DD). Defaults to None.
+
+        Returns:
+            list[str]: Expiration dates in the window, ascending.
+        """
+        expirations = self._expirations_by_underlying.get(underlying, [])
+        low = 0 if start is None else bisect.bisect_left(expirations, start)
+        high = len(expirations) if end is None else bisect.bisect_right(expirations, end)
+        return expirations[low:high]
+
+    def strikes(self, underlying: str, expiration: str, type: str = "call") -> list[float]:
+        """
+        Returns:
+            list[float]: Strikes of the series, ascending.
+        """
+        series = self._series.get(underlying, {}).get((expiration, type))
+        return [] if series is None else series[0].tolist()
+
+    def select(
+        self,
+        underlying: str,
+        expiration_start: str = None,
+        expiration_end: str = None,
+        type: str = None,
+        strike_min: float = None,
+        strike_max: float = None,
+    ) -> list[OptionContract]:
+        """
+        Args:
+            underlying (str): Underlying symbol.
+            expiration_start, expiration_end (str, optional): Expiration window, inclusive. Defaults to None.
+            type (str, optional): 'call' or 'put'. Defaults to None (both).
+            strike_min, strike_max (float, optional): Strike range, inclusive. Defaults to None.
+
+        Returns:
+            list[OptionContract]: Matching contracts, by expiration, then type, then strike.
+        """
+        contracts = []
+        by_key = self._series.get(underlying, {})
+        for expiration in self.expirations(underlying, expiration_start, expiration_end):
+            for option_type in OPTION_TYPES if type is None else (type,):
+                series = by_key.get((expiration, option_type))
+                if series is None:
+                    continue
+                strikes, rows = series
+                low = 0 if strike_min is None else bisect.bisect_left(strikes, strike_min)
+                high = len(rows) if strike_max is None else bisect.bisect_right(strikes, strike_max)
+                contracts.extend(self._contract_at(row) for row in rows[low:high])
+        return contracts
+
+    def nearest(
+        self, underlying: str, expiration: str, spot: float, count: int = 5, type: str = "call"
+    ) -> list[OptionContract]:
+        """
+        Args:
+            underlying (str): Underlying symbol.
+            expiration (str): Expiration date (YYYY-MM-DD).
+            spot (float): Price to center on, e.g. the underlying's last trade.
+            count (int, optional): Number of contracts. Defaults to 5.
+            type (str, optional): 'call' or 'put'. Defaults to 'call'.
+
+        Returns:
+            list[OptionContract]: The `count` contracts whose strikes are closest to `spot`, ascending by strike.
+        """
+        series = self._series.get(underlying, {}).get((expiration, type))
+        if series is None:
+            return []
+        strikes, rows = series
+        high = bisect.bisect_left(strikes, spot)
+        low = high - 1
+        picked = 0
+        while picked < count and (low >= 0 or high < len(rows)):
+            if high >= len(rows) or (low >= 0 and spot - strikes[low] <= strikes[high] - spot):
+                low -= 1
+            else:
+                high += 1
+            picked += 1
+        return [self._contract_at(row) for row in rows[low + 1 : high]]
+
+
+def _same(left: float, right: float) -> bool:
+    return left == right or (left != left and right != right)  # NaN == NaN for missing values
@@ -0,0 +1,359 @@
+import asyncio
+import math
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core import http_client
+from core.errors import error_from_body
+from core.models import CLOSED_ORDER_STATUSES, Order
+from endpoints.orders import (
+    create_order_async,
+    delete_order_by_id_async,
+    get_order_by_id_async,
+    iter_all_orders_async,
+    replace_order_by_id_async,
+)
+
+# Fields `replace_order_by_id` can change; anything else (symbol, side, type) needs a new order.
+REPLACEABLE_FIELDS = ("qty", "limit_price", "stop_price", "time_in_force")
+
+# How long a cancel + new order fallback waits for the old order to reach a final status before giving up.
+CANCEL_CONFIRM_TIMEOUT = 5.0
+CANCEL_POLL_INTERVAL = 0.1
+
+
+@dataclass(slots=True)
+class ReconcilePlan:
+    """
+    Minimal set of operations that turns the open orders into the desired book.
+    """
+
+    keep: list[Order] = field(default_factory=list)
+    # (working order, desired order, fields to change)
+    replace: list[tuple[Order, dict, dict]] = field(default_factory=list)
+    cancel: list[Order] = field(default_factory=list)
+    create: list[dict] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ReconcileOutcome:
+    """
+    Outcome of one operation. `action` is what was finally done: "replace", "cancel", "create", "cancel_create"
+    (a rejected replace fell back to cancel + new order for the quantity the old order had not filled) or "filled"
+    (the working order filled before it could be changed, so nothing was sent in its place).
+    """
+
+    action: str
+    order_id: str = None
+    desired: dict = None
+    order: dict = None
+    error: Exception = None
+    latency: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(slots=True)
+class ReconcileResult:
+    plan: ReconcilePlan
+    outcomes: list[ReconcileOutcome] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(outcome.ok for outcome in self.outcomes)
+
+    def latency_percentiles(self) -> dict[str, dict[str, float]]:
+        """
+        Returns:
+            dict[str, dict[str, float]]: Per action, the count and the p50/p90/p99/max latency in seconds.
+        """
+        samples: dict[str, list[float]] = {}
+        for outcome in self.outcomes:
+            samples.setdefault(outcome.action, []).append(outcome.latency)
+        return {action: percentiles(latencies) for action, latencies in samples.items()}
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """
+    Returns:
+        dict[str, float]: Count, p50, p90, p99 and max of `samples` (nearest-rank).
+    """
+    ordered = sorted(samples)
+    count = len(ordered)
+
+    def rank(fraction: float) -> float:
+        return ordered[max(0, math.ceil(count * fraction) - 1)] if ordered else 0.0
+
+    return {
+        "count": count,
+        "p50": rank(0.5),
+        "p90": rank(0.9),
+        "p99": rank(0.99),
+        "max": ordered[-1] if ordered else 0.0,
+    }
+
+
+def _decimal(value: any) -> Decimal:
+    return None if value is None else Decimal(str(value))
+
+
+def _changes(order: Order, desired: dict) -> dict:
+    """
+    Returns:
+        dict: The replaceable fields whose desired value differs from the working order, as `replace_order_by_id`
+            expects them.
+    """
+    changes = {}
+    for name in REPLACEABLE_FIELDS:
+        if name not in desired:
+            continue
+        current = getattr(order, name)
+        wanted = desired[name] if name == "time_in_force" else _decimal(desired[name])
+        if current != wanted:
+            changes[name] = desired[name] if name == "time_in_force" else str(desired[name])
+    return changes
+
+
+def _group_key(symbol: str, side: str, order_type: str) -> tuple:
+    return (symbol, side, order_type)
+
+
+def _price(value: any) -> Decimal:
+    price = _decimal(value)
+    return Decimal(0) if price is None else price
+
+
+def diff_orders(desired: list[dict], open_orders: list[Order], cancel_unlisted: bool = False) -> ReconcilePlan:
+    """
+    Pairs each desired order with a working order of the same symbol, side and type (or the same `client_order_id`,
+    when given), keeping exact matches, replacing the rest in price order, cancelling leftover working orders and
+    creating leftover desired ones.
+    Args:
+        desired (list[dict]): The desired book, one dict per order as accepted by `create_order`.
+        open_orders (list[Order]): The working orders.
+        cancel_unlisted (bool, optional): Cancel working orders for symbols absent from `desired` too, i.e. treat
+            `desired` as the whole book. Defaults to False (only the listed symbols are reconciled).
+
+    Returns:
+        ReconcilePlan: The operations to perform.
+    """
+    plan = ReconcilePlan()
+    symbols = {order_data["symbol"] for order_data in desired}
+    working = [order for order in open_orders if cancel_unlisted or order.symbol in symbols]
+    by_client_order_id = {order.client_order_id: order for order in working if order.client_order_id}
+    paired_ids = set()
+    unpaired_desired: dict[tuple, list[dict]] = {}
+
+    for order_data in desired:
+        order = by_client_order_id.get(order_data.get("client_order_id"))
+        if order is not None and _group_key(order.symbol, order.side, order.type) == _group_key(
+            order_data["symbol"], order_data["side"], order_data["type"]
+        ):
+            paired_ids.add(order.id)
+            changes = _changes(order, order_data)
+            if changes:
+                plan.replace.append((order, order_data, changes))
+            else:
+                plan.keep.append(order)
+            continue
+        key = _group_key(order_data["symbol"], order_data["side"], order_data["type"])
+        unpaired_desired.setdefault(key, []).append(order_data)
+
+    unpaired_working: dict[tuple, list[Order]] = {}
+    for order in working:
+        if order.id not in paired_ids:
+            unpaired_working.setdefault(_group_key(order.symbol, order.side, order.type), []).append(order)
+
+    for key in [*unpaired_desired, *(key for key in unpaired_working if key not in unpaired_desired)]:
+        wanted = unpaired_desired.get(key, [])
+        existing = unpaired_working.get(key, [])
+        # Exact matches stay untouched.
+        remaining = []
+        for order_data in wanted:
+            match = next((order for order in existing if not _changes(order, order_data)), None)
+            if match is None:
+                remaining.append(order_data)
+            else:
+                existing.remove(match)
+                plan.keep.append(match)
+        # Pair the rest by price rank, so requoting a ladder shifts each level instead of crossing them.
+        remaining.sort(key=lambda order_data: _price(order_data.get("limit_price", order_data.get("stop_price"))))
+        existing.sort(key=lambda order: order.limit_price or order.stop_price or Decimal(0))
+        for order, order_data in zip(existing, remaining):
+            plan.replace.append((order, order_data, _changes(order, order_data)))
+        plan.cancel.extend(existing[len(remaining) :])
+        plan.create.extend(remaining[len(existing) :])
+    return plan
+
+
+def _checked(response_json: any) -> any:
+    error = error_from_body(response_json)
+    if error is not None:
+        raise error
+    return response_json
+
+
+async def _status(paper_trading: bool, order_id: str) -> str:
+    return _checked(await get_order_by_id_async(paper_trading, order_id))["status"]
+
+
+async def _settled(paper_trading: bool, order_id: str) -> dict:
+    """
+    Polls a cancelled order until it reaches a final status, so a fill racing the cancel is seen before anything is
+    sent in its place.
+
+    Returns:
+        dict: The order in its final status (`canceled`, `filled`, ...).
+    """
+    deadline = time.monotonic() + CANCEL_CONFIRM_TIMEOUT
+    while True:
+        order = _checked(await get_order_by_id_async(paper_trading, order_id))
+        if order["status"] in CLOSED_ORDER_STATUSES:
+            return order
+        if time.monotonic() >= deadline:
+            raise TimeoutError(
+                f"order {order_id} is still {order['status']} {CANCEL_CONFIRM_TIMEOUT}s after the cancel"
+            )
+        await asyncio.sleep(CANCEL_POLL_INTERVAL)
+
+
+async def _create(paper_trading: bool, order_data: dict) -> ReconcileOutcome:
+    start = time.perf_counter()
+    try:
+        order = _checked(await create_order_async(paper_trading, order_data))
+        return ReconcileOutcome("create", desired=order_data, order=order, latency=time.perf_counter() - start)
+    except Exception as exc:
+        return ReconcileOutcome("create", desired=order_data, error=exc, latency=time.perf_counter() - start)
+
+
+async def _cancel(paper_trading: bool, order: Order) -> ReconcileOutcome:
+    start = time.perf_counter()
+    try:
+        error = error_from_body(await delete_order_by_id_async(paper_trading, order.id))
+        if error is not None:
+            if await _status(paper_trading, order.id) == "filled":
+                return ReconcileOutcome("filled", order_id=order.id, latency=time.perf_counter() - start)
+            raise error
+        return ReconcileOutcome("cancel", order_id=order.id, latency=time.perf_counter() - start)
+    except Exception as exc:
+        return ReconcileOutcome("cancel", order_id=order.id, error=exc, latency=time.perf_counter() - start)
+
+
+async def _replace(paper_trading: bool, order: Order, order_data: dict, changes: dict) -> ReconcileOutcome:
+    start = time.perf_counter()
+    try:
+        response_json = await replace_order_by_id_async(paper_trading, order.id, changes)
+        error = error_from_body(response_json)
+        if error is None:
+            return ReconcileOutcome(
+                "replace",
+                order_id=order.id,
+                desired=order_data,
+                order=response_json,
+                latency=time.perf_counter() - start,
+            )
+        # The replace was rejected, usually because the order filled or is already being changed. A filled order is
+        # left alone; anything still open is cancelled and sent again as a new order.
+        status = await _status(paper_trading, order.id)
+        if status == "filled":
+            return ReconcileOutcome(
+                "filled", order_id=order.id, desired=order_data, latency=time.perf_counter() - start
+            )
+        cancelled = await _cancel(paper_trading, order)
+        if cancelled.action == "filled" or not cancelled.ok:
+            cancelled.desired = order_data
+            cancelled.latency = time.perf_counter() - start
+            return cancelled
+        # Only send the new order once the old one is final: a fill landing during the cancel must not be doubled.
+        settled = await _settled(paper_trading, order.id)
+        if settled["status"] == "replaced":
+            raise RuntimeError(f"order {order.id} was replaced by {settled.get('replaced_by')} while being cancelled")
+        filled_qty = _decimal(settled.get("filled_qty")) or Decimal(0)
+        if settled["status"] == "filled":
+            return ReconcileOutcome(
+                "filled", order_id=order.id, desired=order_data, latency=time.perf_counter() - start
+            )
+        if filled_qty and order_data.get("qty") is not None:
+            remaining = _decimal(order_data["qty"]) - filled_qty
+            if remaining <= 0:
+                return ReconcileOutcome(
+                    "filled", order_id=order.id, desired=order_data, latency=time.perf_counter() - start
+                )
+            order_data = {**order_data, "qty": str(remaining)}
+        if order_data.get("client_order_id") == order.client_order_id:
+            # Alpaca never reuses a client_order_id, even for a cancelled order.
+            order_data = {name: value for name, value in order_data.items() if name != "client_order_id"}
+        created = _checked(await create_order_async(paper_trading, order_data))
+        return ReconcileOutcome(
+            "cancel_create", order_id=order.id, desired=order_data, order=created, latency=time.perf_counter() - start
+        )
+    except Exception as exc:
+        return ReconcileOutcome(
+            "replace", order_id=order.id, desired=order_data, error=exc, latency=time.perf_counter() - start
+        )
+
+
+async def _limited(semaphore: asyncio.Semaphore, operation: any) -> ReconcileOutcome:
+    async with semaphore:
+        return await operation
+
+
+async def reconcile_orders_async(
+    paper_trading: bool, desired: list[dict], cancel_unlisted: bool = False, concurrency: int = 10
+) -> ReconcileResult:
+    """
+    Requotes working orders in bulk: fetches the open orders, computes the minimal replaces, cancels and new orders
+    with `diff_orders`, and runs them concurrently. A replace rejected because the order filled meanwhile is reported
+    as "filled" and not resent; one rejected for another reason falls back to cancel + new order.
+    Args:
+        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+        desired (list[dict]): The desired book, one dict per order as accepted by `create_order`.
+        cancel_unlisted (bool, optional): Treat `desired` as the whole book and cancel working orders of other
+            symbols too. Defaults to False.
+        concurrency (int, optional): Maximum number of operations in flight at once; every request still waits for
+            the shared rate limiter. Defaults to 10.
+
+    Returns:
+        ReconcileResult: The plan, one outcome per operation (kept orders need none) and the elapsed seconds; use
+            `latency_percentiles()` for per-operation latency. Failures are reported, not raised.
+    """
+    start = time.perf_counter()
+    open_orders = [
+        Order.from_dict(order) async for order in iter_all_orders_async(paper_trading, status="open", prefetch=0)
+    ]
+    plan = diff_orders(desired, open_orders, cancel_unlisted)
+    semaphore = asyncio.Semaphore(concurrency)
+    operations = [
+        *(_replace(paper_trading, order, order_data, changes) for order, order_data, changes in plan.replace),
+        *(_cancel(paper_trading, order) for order in plan.cancel),
+        *(_create(paper_trading, order_data) for order_data in plan.create),
+    ]
+    outcomes = await asyncio.gather(*(_limited(semaphore, operation) for operation in operations))
+    return ReconcileResult(plan, list(outcomes), time.perf_counter() - start)
+
+
+def reconcile_orders(
+    paper_trading: bool, desired: list[dict], cancel_unlisted: bool = False, concurrency: int = 10
+) -> ReconcileResult:
+    """
+    Blocking wrapper around `reconcile_orders_async` for callers without an event loop; takes the same arguments.
+
+    Returns:
+        ReconcileResult: The plan, one outcome per operation and the elapsed seconds.
+    """
+
+    async def run() -> ReconcileResult:
+        try:
+            return await reconcile_orders_async(paper_trading, desired, cancel_unlisted, concurrency)
+        finally:
+            await http_client.close_async_client()
+
+    return asyncio.run(run())
@@ -0,0 +1,298 @@
+import asyncio
+import datetime
+import os
+import re
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core import http_client
+from core.errors import error_from_body
+from endpoints.portfolio_history import get_account_portfolio_history, get_account_portfolio_history_async
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, see requirements-optional.txt
+    np = None
+
+_TIMEFRAME_UNITS = {"Min": 60, "T": 60, "H": 3600, "D": 86400}
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("The columnar portfolio history needs NumPy: pip install numpy")
+
+
+def timeframe_seconds(timeframe: str) -> int:
+    """
+    Args:
+        timeframe (str): An Alpaca timeframe such as '1Min', '5Min', '15Min', '1H' or '1D'.
+
+    Returns:
+        int: The bar width in seconds.
+    """
+    match = re.fullmatch(r"(\d+)(Min|T|H|D)", timeframe)
+    if match is None:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    return int(match.group(1)) * _TIMEFRAME_UNITS[match.group(2)]
+
+
+class PortfolioHistory:
+    """
+    Columnar portfolio history: `timestamp` (int64 epoch seconds), `equity`, `profit_loss` and `profit_loss_pct`
+    (float64, NaN where Alpaca returned null) as aligned NumPy arrays, with vectorized analytics on top.
+    """
+
+    def __init__(
+        self,
+        timestamp: "np.ndarray",
+        equity: "np.ndarray",
+        profit_loss: "np.ndarray",
+        profit_loss_pct: "np.ndarray",
+        base_value: float = None,
+        timeframe: str = None,
+    ) -> None:
+        _require_numpy()
+        self.timestamp = np.asarray(timestamp, dtype=np.int64)
+        self.equity = np.asarray(equity, dtype=np.float64)
+        self.profit_loss = np.asarray(profit_loss, dtype=np.float64)
+        self.profit_loss_pct = np.asarray(profit_loss_pct, dtype=np.float64)
+        self.base_value = base_value
+        self.timeframe = timeframe
+
+    @classmethod
+    def from_response(cls, response_json: dict[str, any]) -> "PortfolioHistory":
+        """
+        Args:
+            response_json (dict[str, any]): The body returned by `get_account_portfolio_history`.
+
+        Returns:
+            PortfolioHistory: The same data as NumPy arrays.
+        """
+        error = error_from_body(response_json)
+        if error is not None:
+            raise error
+        _require_numpy()
+        return cls(
+            np.array(response_json.get("timestamp") or [], dtype=np.int64),
+            np.array(response_json.get("equity") or [], dtype=np.float64),
+            np.array(response_json.get("profit_loss") or [], dtype=np.float64),
+            np.array(response_json.get("profit_loss_pct") or [], dtype=np.float64),
+            response_json.get("base_value"),
+            response_json.get("timeframe"),
+        )
+
+    @classmethod
+    def concatenate(cls, histories: list["PortfolioHistory"]) -> "PortfolioHistory":
+        """
+        Stitches consecutive windows into one history. Rows are ordered by timestamp and overlapping timestamps keep
+        the later window's value. Profit/loss is re-based on the earliest window's `base_value`, so it stays
+        cumulative across the seams (deposits and withdrawals inside the range are not adjusted for).
+        Args:
+            histories (list[PortfolioHistory]): Windows in any order.
+
+        Returns:
+            PortfolioHistory: The stitched history.
+        """
+        _require_numpy()
+        histories = sorted((history for history in histories if len(history)), key=lambda h: h.timestamp[0])
+        if not histories:
+            return cls([], [], [], [])
+        base_value = histories[0].base_value
+        profit_loss = [
+            history.profit_loss + ((history.base_value or 0.0) - (base_value or 0.0)) for history in histories
+        ]
+        timestamp = np.concatenate([history.timestamp for history in histories])
+        # Reverse so np.unique's "first occurrence" is the latest window's row for duplicated timestamps.
+        _, reversed_index = np.unique(timestamp[::-1], return_index=True)
+        keep = len(timestamp) - 1 - reversed_index
+        equity = np.concatenate([history.equity for history in histories])[keep]
+        profit_loss = np.concatenate(profit_loss)[keep]
+        profit_loss_pct = profit_loss / base_value if base_value else np.full(len(keep), np.nan)
+        return cls(timestamp[keep], equity, profit_loss, profit_loss_pct, base_value, histories[0].timeframe)
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def returns(self) -> "np.ndarray":
+        """
+        Returns:
+            np.ndarray: Simple return of each period versus the previous one (length `len(self) - 1`).
+        """
+        return self.equity[1:] / self.equity[:-1] - 1.0
+
+    def cumulative_returns(self) -> "np.ndarray":
+        """
+        Returns:
+            np.ndarray: Growth of equity since the first non-NaN point, for every point.
+        """
+        valid = np.flatnonzero(~np.isnan(self.equity))
+        if not len(valid):
+            return np.full(len(self), np.nan)
+        return self.equity / self.equity[valid[0]] - 1.0
+
+    def rolling_volatility(self, window: int, periods_per_year: float = None) -> "np.ndarray":
+        """
+        Args:
+            window (int): Number of returns per window.
+            periods_per_year (float, optional): Annualizes the result when given (e.g. 252 for daily bars).
+                Defaults to None.
+
+        Returns:
+            np.ndarray: Standard deviation of returns over each trailing window, aligned to the window's last return.
+        """
+        returns = self.returns()
+        if len(returns) < window:
+            return np.empty(0)
+        volatility = np.lib.stride_tricks.sliding_window_view(returns, window).std(axis=1, ddof=1)
+        return volatility * np.sqrt(periods_per_year) if periods_per_year else volatility
+
+    def drawdown(self) -> "np.ndarray":
+        """
+        Returns:
+            np.ndarray: Distance of equity below its running peak at each point (0 at new highs, negative below).
+        """
+        peak = np.fmax.accumulate(self.equity)
+        return self.equity / peak - 1.0
+
+    def max_drawdown(self) -> float:
+        """
+        Returns:
+            float: The deepest drawdown over the whole history (e.g. -0.12 for a 12% peak-to-trough loss).
+        """
+        drawdown = self.drawdown()
+        return float(np.nanmin(drawdown)) if len(drawdown) else 0.0
+
+    def sharpe_ratio(self, periods_per_year: float, risk_free_rate: float = 0.0) -> float:
+        """
+        Args:
+            periods_per_year (float): Number of bars per year (e.g. 252 for daily bars).
+            risk_free_rate (float, optional): Annual risk-free rate. Defaults to 0.
+
+        Returns:
+            float: Annualized Sharpe ratio of the per-period returns.
+        """
+        excess = self.returns() - risk_free_rate / periods_per_year
+        return float(np.nanmean(excess) / np.nanstd(excess, ddof=1) * np.sqrt(periods_per_year))
+
+    def resample(self, timeframe: str) -> "PortfolioHistory":
+        """
+        Downsamples to a coarser bar: each bucket keeps its last equity and profit/loss values, like a close price.
+        Args:
+            timeframe (str): Target timeframe such as '15Min', '1H' or '1D' (UTC buckets).
+
+        Returns:
+            PortfolioHistory: The resampled history.
+        """
+        width = timeframe_seconds(timeframe)
+        buckets = self.timestamp // width
+        last = np.flatnonzero(np.append(buckets[1:] != buckets[:-1], True)) if len(buckets) else buckets
+        return PortfolioHistory(
+            buckets[last] * width,
+            self.equity[last],
+            self.profit_loss[last],
+            self.profit_loss_pct[last],
+            self.base_value,
+            timeframe,
+        )
+
+
+def fetch_portfolio_history(
+    paper_trading: bool, period: str = None, timeframe: str = None, end_date: str = None, extended_hours: bool = None
+) -> PortfolioHistory:
+    """
+    Columnar version of `get_account_portfolio_history`; takes the same arguments.
+
+    Returns:
+        PortfolioHistory: The history as NumPy arrays.
+    """
+    return PortfolioHistory.from_response(
+        get_account_portfolio_history(paper_trading, period, timeframe, end_date, extended_hours)
+    )
+
+
+def _chunk_end_dates(start_date: datetime.date, end_date: datetime.date, chunk_days: int) -> list[datetime.date]:
+    ends = []
+    end = end_date
+    while end >= start_date:
+        ends.append(end)
+        end -= datetime.timedelta(days=chunk_days)
+    return ends
+
+
+async def fetch_portfolio_history_chunked_async(
+    paper_trading: bool,
+    start_date: str,
+    end_date: str,
+    timeframe: str,
+    chunk_days: int = 7,
+    extended_hours: bool = None,
+    concurrency: int = 4,
+) -> PortfolioHistory:
+    """
+    Fetches a long history as `chunk_days`-day windows in parallel and stitches them (see
+    `PortfolioHistory.concatenate`), instead of one huge request. Use small chunks for minute bars, which Alpaca
+    only serves for short periods.
+    Args:
+        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+        start_date (str): First day to cover (YYYY-MM-DD format).
+        end_date (str): Last day to cover (YYYY-MM-DD format).
+        timeframe (str): The resolution of time window (e.g., '1Min', '5Min', '15Min', '1H', '1D').
+        chunk_days (int, optional): Days per request. Defaults to 7.
+        extended_hours (bool, optional): Whether to include extended hours data. Defaults to None.
+        concurrency (int, optional): Maximum number of windows fetched at once. Defaults to 4.
+
+    Returns:
+        PortfolioHistory: The stitched history, trimmed to `start_date`..`end_date`.
+    """
+    first = datetime.date.fromisoformat(start_date)
+    last = datetime.date.fromisoformat(end_date)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(chunk_end: datetime.date) -> PortfolioHistory:
+        async with semaphore:
+            response_json = await get_account_portfolio_history_async(
+                paper_trading, f"{chunk_days}D", timeframe, chunk_end.isoformat(), extended_hours
+            )
+        return PortfolioHistory.from_response(response_json)
+
+    chunks = await asyncio.gather(*(fetch(end) for end in _chunk_end_dates(first, last, chunk_days)))
+    history = PortfolioHistory.concatenate(chunks)
+    start_ts = datetime.datetime.combine(first, datetime.time(), datetime.timezone.utc).timestamp()
+    end_ts = datetime.datetime.combine(last + datetime.timedelta(days=1), datetime.time(), datetime.timezone.utc)
+    keep = (history.timestamp >= start_ts) & (history.timestamp < end_ts.timestamp())
+    return PortfolioHistory(
+        history.timestamp[keep],
+        history.equity[keep],
+        history.profit_loss[keep],
+        history.profit_loss_pct[keep],
+        history.base_value,
+        timeframe,
+    )
+
+
+def fetch_portfolio_history_chunked(
+    paper_trading: bool,
+    start_date: str,
+    end_date: str,
+    timeframe: str,
+    chunk_days: int = 7,
+    extended_hours: bool = None,
+    concurrency: int = 4,
+) -> PortfolioHistory:
+    """
+    Blocking wrapper around `fetch_portfolio_history_chunked_async`; takes the same arguments.
+
+    Returns:
+        PortfolioHistory: The stitched history.
+    """
+
+    async def run() -> PortfolioHistory:
+        try:
+            return await fetch_portfolio_history_chunked_async(
+                paper_trading, start_date, end_date, timeframe, chunk_days, extended_hours, concurrency
+            )
+        finally:
+            await http_client.close_async_client()
+
+    return asyncio.run(run())
@@ -0,0 +1,307 @@
+import datetime
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import portfolio_resync_interval
+from core.errors import error_from_body
+from core.models import CLOSED_ORDER_STATUSES, Activity, Order, Position
+from endpoints.account_activities import iter_account_activities
+from endpoints.orders import create_order, delete_order_by_id, iter_all_orders, replace_order_by_id
+from endpoints.positions import close_position, get_all_open_positions
+
+_ZERO = Decimal(0)
+
+
+@dataclass(slots=True)
+class PortfolioDrift:
+    """
+    Differences between the local state and a full resync, i.e. changes the incremental updates missed.
+    """
+
+    # symbol -> (local signed qty, broker signed qty)
+    positions: dict[str, tuple[Decimal, Decimal]] = field(default_factory=dict)
+    # Open at the broker but unknown locally.
+    missing_orders: list[str] = field(default_factory=list)
+    # Open locally but no longer open at the broker.
+    stale_orders: list[str] = field(default_factory=list)
+
+    @property
+    def detected(self) -> bool:
+        return bool(self.positions or self.missing_orders or self.stale_orders)
+
+
+def _checked(response_json: any) -> any:
+    error = error_from_body(response_json)
+    if error is not None:
+        raise error
+    return response_json
+
+
+def _now_iso() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+
+def _iso(epoch_ns: int) -> str:
+    return datetime.datetime.fromtimestamp(epoch_ns / 1e9, datetime.timezone.utc).isoformat()
+
+
+def signed_qty(position: Position) -> Decimal:
+    """
+    Returns:
+        Decimal: The position size, negative for short positions.
+    """
+    return -abs(position.qty) if position.side == "short" else position.qty
+
+
+class PortfolioState:
+    """
+    Local copy of the open positions and open orders, so risk checks read memory instead of making two REST round
+    trips per decision. Load it once with `resync()`, then keep it current with the order methods below (which apply
+    each response as it arrives) and periodic `sync()` calls, which fetch the open orders and the fills since the
+    last sync and fall back to a full resync every `resync_interval` seconds to detect and repair drift.
+
+    Between resyncs a position's `qty`, `side` and `avg_entry_price` follow the fills; market values and P/L are
+    as of the last resync.
+    """
+
+    def __init__(self, paper_trading: bool, resync_interval: float = portfolio_resync_interval) -> None:
+        self.paper_trading = paper_trading
+        self.resync_interval = resync_interval
+        self.last_drift: PortfolioDrift = None
+        self._lock = threading.RLock()
+        self._positions: dict[str, Position] = {}
+        self._orders: dict[str, Order] = {}
+        self._order_ids_by_client_order_id: dict[str, str] = {}
+        self._order_ids_by_symbol: dict[str, set[str]] = {}
+        self._applied_fills: set[str] = set()
+        self._fills_cursor: str = None
+        self._resynced_at: float = None
+
+    @classmethod
+    def load(cls, paper_trading: bool, resync_interval: float = portfolio_resync_interval) -> "PortfolioState":
+        """
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            resync_interval (float, optional): Seconds between full resyncs done by `sync()`. Defaults to
+                `APCA_PORTFOLIO_RESYNC_INTERVAL` (300).
+
+        Returns:
+            PortfolioState: A state loaded from a full snapshot.
+        """
+        state = cls(paper_trading, resync_interval)
+        state.resync()
+        return state
+
+    # Lookups
+
+    def position(self, symbol: str) -> Position:
+        return self._positions.get(symbol)
+
+    def positions(self) -> list[Position]:
+        return list(self._positions.values())
+
+    def order(self, order_id: str) -> Order:
+        return self._orders.get(order_id)
+
+    def order_by_client_order_id(self, client_order_id: str) -> Order:
+        order_id = self._order_ids_by_client_order_id.get(client_order_id)
+        return None if order_id is None else self._orders.get(order_id)
+
+    def open_orders(self, symbol: str = None) -> list[Order]:
+        """
+        Args:
+            symbol (str, optional): Only orders for this symbol. Defaults to None (all open orders).
+
+        Returns:
+            list[Order]: The open orders.
+        """
+        with self._lock:
+            if symbol is None:
+                return list(self._orders.values())
+            return [self._orders[order_id] for order_id in self._order_ids_by_symbol.get(symbol, ())]
+
+    # Incremental updates
+
+    def apply_order(self, order: Order | dict) -> Order:
+        """
+        Records an order returned by the API: open orders are added or updated, closed ones dropped, and an order
+        that replaces another one removes the original.
+        Args:
+            order (Order | dict): The order, as a record or as returned by the orders endpoints.
+
+        Returns:
+            Order: The order as a record.
+        """
+        if isinstance(order, dict):
+            order = Order.from_dict(order)
+        with self._lock:
+            if order.replaces:
+                self.remove_order(order.replaces)
+            if order.status in CLOSED_ORDER_STATUSES:
+                self.remove_order(order.id)
+                return order
+            self.remove_order(order.id)
+            self._orders[order.id] = order
+            if order.client_order_id:
+                self._order_ids_by_client_order_id[order.client_order_id] = order.id
+            self._order_ids_by_symbol.setdefault(order.symbol, set()).add(order.id)
+        return order
+
+    def remove_order(self, order_id: str) -> None:
+        with self._lock:
+            order = self._orders.pop(order_id, None)
+            if order is None:
+                return
+            self._order_ids_by_client_order_id.pop(order.client_order_id, None)
+            ids = self._order_ids_by_symbol.get(order.symbol)
+            if ids is not None:
+                ids.discard(order_id)
+                if not ids:
+                    del self._order_ids_by_symbol[order.symbol]
+
+    def apply_fill(self, fill: Activity | dict) -> None:
+        """
+        Applies a FILL activity to the position and to the order it belongs to. Each fill is applied at most once.
+        Args:
+            fill (Activity | dict): The fill, as a record or as returned by the account activities endpoints.
+        """
+        if isinstance(fill, dict):
+            fill = Activity.from_dict(fill)
+        with self._lock:
+            if fill.id in self._applied_fills:
+                return
+            self._applied_fills.add(fill.id)
+            self._apply_position_fill(fill)
+            order = self._orders.get(fill.order_id)
+            if order is not None:
+                if fill.order_status in CLOSED_ORDER_STATUSES:
+                    self.remove_order(order.id)
+                else:
+                    self._orders[order.id] = order._replace(status=fill.order_status, filled_qty=fill.cum_qty)
+
+    def _apply_position_fill(self, fill: Activity) -> None:
+        delta = fill.qty if fill.side == "buy" else -fill.qty
+        position = self._positions.get(fill.symbol)
+        before = _ZERO if position is None else signed_qty(position)
+        after = before + delta
+        if after == 0:
+            self._positions.pop(fill.symbol, None)
+            return
+        if position is None or before * after < 0:
+            # New position, or a fill that flipped it from long to short (or back).
+            entry_price = fill.price
+        elif abs(after) > abs(before):
+            entry_price = (position.avg_entry_price * abs(before) + fill.price * fill.qty) / abs(after)
+        else:
+            entry_price = position.avg_entry_price
+        side = "long" if after > 0 else "short"
+        if position is None:
+            position = Position(None, fill.symbol, None, None, side, False, *([None] * 12))
+        self._positions[fill.symbol] = position._replace(
+            side=side, qty=after, qty_available=after, avg_entry_price=entry_price
+        )
+
+    # Order methods that keep the state current
+
+    def submit_order(self, order_data: dict) -> Order:
+        """
+        `create_order`, recorded in the state. Raises `AlpacaAPIError` if the order is rejected.
+        """
+        return self.apply_order(_checked(create_order(self.paper_trading, order_data, as_models=True)))
+
+    def replace_order(self, order_id: str, order_data: dict) -> Order:
+        """
+        `replace_order_by_id`, recorded in the state. Raises `AlpacaAPIError` if the replacement is rejected.
+        """
+        return self.apply_order(_checked(replace_order_by_id(self.paper_trading, order_id, order_data, as_models=True)))
+
+    def cancel_order(self, order_id: str) -> None:
+        """
+        `delete_order_by_id`, recorded in the state. Raises `AlpacaAPIError` if the cancel is rejected.
+        """
+        _checked(delete_order_by_id(self.paper_trading, order_id))
+        self.remove_order(order_id)
+
+    def close_position(self, symbol: str, qty: float = None, percentage: float = None) -> Order:
+        """
+        `close_position`, recorded in the state: the closing order is tracked and the position shrinks as it fills.
+        """
+        return self.apply_order(_checked(close_position(self.paper_trading, symbol, qty, percentage, as_models=True)))
+
+    # Synchronisation
+
+    def sync(self) -> PortfolioDrift:
+        """
+        Brings the state up to date: a full `resync()` if the last one is older than `resync_interval`, otherwise a
+        fetch of the open orders (so orders canceled, expired or filled since the previous sync are dropped, however
+        old they are) and of the fills executed since the previous sync (using `after`).
+
+        Returns:
+            PortfolioDrift: The drift found by the resync, or None when only a delta fetch was done.
+        """
+        if self._resynced_at is None or time.monotonic() - self._resynced_at >= self.resync_interval:
+            return self.resync()
+        # Orders submitted while the list is being fetched may be missing from it; only the ones known before are
+        # dropped when absent.
+        known_ids = set(self._orders)
+        orders = [Order.from_dict(order) for order in iter_all_orders(self.paper_trading, status="open", prefetch=0)]
+        fills = [
+            Activity.from_dict(fill)
+            for fill in iter_account_activities(
+                self.paper_trading, activity_type="FILL", after=self._fills_cursor, direction="asc", prefetch=0
+            )
+        ]
+        with self._lock:
+            for order in orders:
+                self.apply_order(order)
+            for order_id in known_ids - {order.id for order in orders}:
+                self.remove_order(order_id)
+            for fill in fills:
+                self.apply_fill(fill)
+            if fills:
+                self._fills_cursor = _iso(fills[-1].transaction_time)
+        return None
+
+    def resync(self) -> PortfolioDrift:
+        """
+        Replaces the state with a full snapshot of open positions and open orders and reports what had drifted.
+
+        Returns:
+            PortfolioDrift: Differences between the previous local state and the snapshot (also kept in `last_drift`).
+        """
+        # A fill re-applied on top of a snapshot that already includes it would double count, so the fill cursor
+        # starts after it.
+        positions = {
+            position.symbol: position
+            for position in _checked(get_all_open_positions(self.paper_trading, as_models=True))
+        }
+        fills_cursor = _now_iso()
+        orders = [Order.from_dict(order) for order in iter_all_orders(self.paper_trading, status="open", prefetch=0)]
+        with self._lock:
+            drift = PortfolioDrift()
+            if self._resynced_at is not None:
+                for symbol in self._positions.keys() | positions.keys():
+                    local = signed_qty(self._positions[symbol]) if symbol in self._positions else _ZERO
+                    remote = signed_qty(positions[symbol]) if symbol in positions else _ZERO
+                    if local != remote:
+                        drift.positions[symbol] = (local, remote)
+                remote_ids = {order.id for order in orders}
+                drift.missing_orders = sorted(remote_ids - self._orders.keys())
+                drift.stale_orders = sorted(self._orders.keys() - remote_ids)
+            self._positions = positions
+            self._orders.clear()
+            self._order_ids_by_client_order_id.clear()
+            self._order_ids_by_symbol.clear()
+            for order in orders:
+                self.apply_order(order)
+            self._applied_fills.clear()
+            self._fills_cursor = fills_cursor
+            self._resynced_at = time.monotonic()
+            self.last_drift = drift
+        return drift
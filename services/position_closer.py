@@ -0,0 +1,214 @@
+import asyncio
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from decimal import ROUND_DOWN, Decimal
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core import http_client
+from core.errors import error_from_body
+from core.models import Order, Position
+from endpoints.orders import delete_order_by_id_async, iter_all_orders_async
+from endpoints.positions import close_position_async, get_all_open_positions_async
+
+_ZERO = Decimal(0)
+_HUNDRED = Decimal(100)
+
+
+@dataclass(slots=True)
+class CloseOutcome:
+    """
+    Outcome of closing or trimming one symbol. `order` is the closing order when one was sent; `skipped` explains
+    why none was needed (no position, or open orders already cover the request); `error` is set on failure.
+    """
+
+    symbol: str
+    position_qty: Decimal = _ZERO
+    requested_qty: Decimal = _ZERO
+    # Part of the request already covered by open orders on the closing side.
+    netted_qty: Decimal = _ZERO
+    close_qty: Decimal = _ZERO
+    order: dict = None
+    skipped: str = None
+    error: Exception = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass(slots=True)
+class BatchCloseResult:
+    outcomes: list[CloseOutcome] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return all(outcome.ok for outcome in self.outcomes)
+
+    @property
+    def failed(self) -> list[CloseOutcome]:
+        return [outcome for outcome in self.outcomes if not outcome.ok]
+
+
+def _percentage(amount: float | str | None) -> Decimal | None:
+    if isinstance(amount, str) and amount.endswith("%"):
+        return min(max(Decimal(amount[:-1]), _ZERO), _HUNDRED)
+    return None
+
+
+def requested_qty(position: Position, amount: float | str | None) -> Decimal:
+    """
+    Args:
+        position (Position): The open position.
+        amount (float | str | None): Shares to close, a percentage of the position such as "50%" (capped at 100%),
+            or None for all.
+
+    Returns:
+        Decimal: Shares to close, at most the whole position. A percentage of a whole-share position is rounded down
+            to whole shares, since only a fractionable asset can hold a fractional position.
+    """
+    size = abs(position.qty)
+    if amount is None:
+        return size
+    percentage = _percentage(amount)
+    if percentage is not None:
+        qty = size * percentage / _HUNDRED
+        return qty.to_integral_value(rounding=ROUND_DOWN) if size == size.to_integral_value() else qty
+    return min(Decimal(str(amount)), size)
+
+
+def _closing_side(position: Position) -> str:
+    return "buy" if position.side == "short" else "sell"
+
+
+def pending_closing_qty(position: Position, open_orders: list[Order]) -> Decimal:
+    """
+    Returns:
+        Decimal: Unfilled quantity of open orders that already reduce `position`.
+    """
+    side = _closing_side(position)
+    return sum(
+        (order.qty - (order.filled_qty or _ZERO) for order in open_orders if order.side == side and order.qty),
+        _ZERO,
+    )
+
+
+def _checked(response_json: any) -> any:
+    error = error_from_body(response_json)
+    if error is not None:
+        raise error
+    return response_json
+
+
+async def _close_one(
+    paper_trading: bool,
+    symbol: str,
+    amount: float | str | None,
+    position: Position,
+    open_orders: list[Order],
+    cancel_orders: bool,
+    semaphore: asyncio.Semaphore,
+) -> CloseOutcome:
+    if position is None:
+        return CloseOutcome(symbol, skipped="no open position")
+    outcome = CloseOutcome(symbol, position_qty=position.qty, requested_qty=requested_qty(position, amount))
+    async with semaphore:
+        try:
+            if cancel_orders:
+                for order in open_orders:
+                    _checked(await delete_order_by_id_async(paper_trading, order.id))
+                open_orders = []
+            outcome.netted_qty = min(pending_closing_qty(position, open_orders), outcome.requested_qty)
+            outcome.close_qty = outcome.requested_qty - outcome.netted_qty
+            if outcome.close_qty <= 0:
+                outcome.skipped = "covered by open orders" if outcome.netted_qty else "less than one share requested"
+                return outcome
+            percentage = _percentage(amount)
+            if not open_orders and outcome.close_qty == abs(position.qty):
+                # Closing the whole position without a qty also handles fractional remainders exactly.
+                outcome.order = _checked(await close_position_async(paper_trading, symbol))
+            elif percentage is not None and outcome.netted_qty == 0:
+                # Nothing to net, so let Alpaca size the close and round it for the asset.
+                outcome.order = _checked(
+                    await close_position_async(paper_trading, symbol, percentage=float(percentage))
+                )
+            else:
+                outcome.order = _checked(await close_position_async(paper_trading, symbol, qty=str(outcome.close_qty)))
+        except Exception as exc:
+            outcome.error = exc
+    return outcome
+
+
+async def _open_orders(paper_trading: bool) -> list[Order]:
+    return [Order.from_dict(order) async for order in iter_all_orders_async(paper_trading, status="open", prefetch=0)]
+
+
+async def close_positions_async(
+    paper_trading: bool, targets: dict[str, float | str | None], cancel_orders: bool = False, concurrency: int = 10
+) -> BatchCloseResult:
+    """
+    Closes or trims many positions concurrently through `close_position_async`, after netting each request against
+    the symbol's open orders: shares already being sold (bought back, for a short) by an open order are not sent
+    again, so a flattening run can be repeated safely.
+    Args:
+        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+        targets (dict[str, float | str | None]): Symbol -> shares to close (e.g. 10), a percentage of the position
+            (e.g. "25%", capped at 100%), or None to close it entirely. A percentage with no open orders to net
+            against is sent as Alpaca's `percentage` parameter.
+        cancel_orders (bool, optional): Cancel each symbol's open orders first and close the full requested amount,
+            instead of netting against them. Defaults to False.
+        concurrency (int, optional): Maximum number of symbols processed at once; every request still waits for the
+            shared rate limiter. Defaults to 10.
+
+    Returns:
+        BatchCloseResult: One `CloseOutcome` per symbol, in `targets` order, and the total elapsed seconds. Failures
+            are reported per symbol instead of being raised.
+    """
+    start = time.perf_counter()
+    positions_json, open_orders = await asyncio.gather(
+        get_all_open_positions_async(paper_trading, as_models=True),
+        _open_orders(paper_trading),
+    )
+    positions = {position.symbol: position for position in _checked(positions_json)}
+    orders_by_symbol: dict[str, list[Order]] = {}
+    for order in open_orders:
+        orders_by_symbol.setdefault(order.symbol, []).append(order)
+
+    semaphore = asyncio.Semaphore(concurrency)
+    outcomes = await asyncio.gather(
+        *(
+            _close_one(
+                paper_trading,
+                symbol,
+                amount,
+                positions.get(symbol),
+                orders_by_symbol.get(symbol, []),
+                cancel_orders,
+                semaphore,
+            )
+            for symbol, amount in targets.items()
+        )
+    )
+    return BatchCloseResult(list(outcomes), time.perf_counter() - start)
+
+
+def close_positions(
+    paper_trading: bool, targets: dict[str, float | str | None], cancel_orders: bool = False, concurrency: int = 10
+) -> BatchCloseResult:
+    """
+    Blocking wrapper around `close_positions_async` for callers without an event loop; takes the same arguments.
+
+    Returns:
+        BatchCloseResult: One `CloseOutcome` per symbol and the total elapsed seconds.
+    """
+
+    async def run() -> BatchCloseResult:
+        try:
+            return await close_positions_async(paper_trading, targets, cancel_orders, concurrency)
+        finally:
+            await http_client.close_async_client()
+
+    return asyncio.run(run())
@@ -0,0 +1,248 @@
+import os
+import sys
+import threading
+import time
+from typing import Callable
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import pre_trade_max_age
+from core import pre_trade
+from core.errors import error_from_body
+from core.models import CLOSED_ORDER_STATUSES, TradeUpdate
+from endpoints.account_configurations import get_account_configurations
+from endpoints.accounts import get_the_account
+from endpoints.positions import get_all_open_positions
+from services.asset_universe import AssetUniverse
+
+# Alpaca's error codes for the same rejections, so callers handle local and server-side ones alike.
+FORBIDDEN = 40310000
+UNPROCESSABLE = 42210000
+
+
+def _float(value: any) -> float:
+    return None if value in (None, "") else float(value)
+
+
+def _checked(response_json: any) -> any:
+    error = error_from_body(response_json)
+    if error is not None:
+        raise error
+    return response_json
+
+
+class PreTradeValidator:
+    """
+    Local pre-trade checks for `create_order`: account status, buying power (including DTBP for pattern day traders
+    when `dtbp_check` covers entries), asset flags (`tradable`, `fractionable`, `shortable`, `easy_to_borrow`) and
+    `no_shorting`, all against cached data, so an order that would be rejected costs microseconds instead of a round
+    trip. Buying power and positions are adjusted locally for every submitted order and, via `apply_trade_update`,
+    every fill and cancel; `refresh()` resets them from the API.
+
+    The checks fail open: an order is only rejected when the cached data proves it invalid, and nothing is checked
+    while the data is older than `max_age` or was never loaded. Install it with `install()`; from then on
+    `create_order` returns the Alpaca-style error body of a rejected order without sending it.
+    """
+
+    def __init__(
+        self,
+        paper_trading: bool,
+        universe: AssetUniverse = None,
+        max_age: float = pre_trade_max_age,
+        price_of: Callable[[str], float] = None,
+    ) -> None:
+        """
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            universe (AssetUniverse, optional): Asset flags; assets it does not list are not flag-checked. Defaults to
+                None (no asset checks).
+            max_age (float, optional): Seconds after a refresh during which the cached account is trusted. Defaults to
+                `APCA_PRE_TRADE_MAX_AGE`.
+            price_of (Callable[[str], float], optional): Reference price of a symbol, used to estimate the cost of
+                market orders. Defaults to None (market buys without `notional` skip the buying power check).
+        """
+        self.paper_trading = paper_trading
+        self.universe = universe
+        self.max_age = max_age
+        self.price_of = price_of
+        self.checked = 0
+        self.rejected: dict[str, int] = {}
+        self._account: dict[str, any] = {}
+        self._configuration: dict[str, any] = {}
+        self._positions: dict[str, float] = {}
+        self._buying_power = 0.0
+        self._non_marginable_buying_power = 0.0
+        self._daytrading_buying_power = 0.0
+        # client_order_id -> [symbol, side, remaining qty, reserved price]
+        self._orders: dict[str, list] = {}
+        self._pending_sells: dict[str, float] = {}
+        self._refreshed_at: float = None
+        self._lock = threading.Lock()
+
+    def install(self) -> "PreTradeValidator":
+        pre_trade.install(self.paper_trading, self)
+        return self
+
+    def uninstall(self) -> None:
+        pre_trade.uninstall(self.paper_trading)
+
+    def refresh(self) -> None:
+        """
+        Reloads the account, its configuration and the open positions (three requests) and drops the local
+        adjustments, which the fresh buying power already reflects. Call it periodically, e.g. with
+        `services.snapshots.start_background_refresh(validator.refresh, 60)`.
+        """
+        account = _checked(get_the_account(self.paper_trading))
+        configuration = _checked(get_account_configurations(self.paper_trading))
+        positions = _checked(get_all_open_positions(self.paper_trading))
+        with self._lock:
+            self._account = account
+            self._configuration = configuration
+            self._positions = {position["symbol"]: float(position["qty"]) for position in positions}
+            self._buying_power = _float(account.get("buying_power")) or 0.0
+            self._non_marginable_buying_power = _float(account.get("non_marginable_buying_power")) or 0.0
+            self._daytrading_buying_power = _float(account.get("daytrading_buying_power")) or 0.0
+            self._orders.clear()
+            self._pending_sells.clear()
+            self._refreshed_at = time.monotonic()
+
+    @property
+    def fresh(self) -> bool:
+        refreshed_at = self._refreshed_at
+        return refreshed_at is not None and time.monotonic() - refreshed_at <= self.max_age
+
+    def available_buying_power(self, marginable: bool = True) -> float:
+        """
+        Returns:
+            float: Buying power left for a new buy, after local adjustments.
+        """
+        buying_power = self._buying_power if marginable else self._non_marginable_buying_power
+        if self._account.get("pattern_day_trader") and self._configuration.get("dtbp_check") in ("entry", "both"):
+            buying_power = min(buying_power, self._daytrading_buying_power)
+        return buying_power
+
+    def _reject(self, reason: str, code: int, message: str) -> dict[str, any]:
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        return pre_trade.rejection(code, message)
+
+    def check(self, order_data: dict) -> dict[str, any]:
+        """
+        Args:
+            order_data (dict): The order as passed to `create_order`.
+
+        Returns:
+            dict[str, any]: An Alpaca-style error body if the order is invalid, otherwise None.
+        """
+        self.checked += 1
+        if not self.fresh:
+            return None
+        account = self._account
+        if account.get("trading_blocked") or account.get("account_blocked"):
+            return self._reject("blocked", FORBIDDEN, "account is not authorized to trade")
+
+        symbol = order_data.get("symbol")
+        side = order_data.get("side")
+        qty = _float(order_data.get("qty"))
+        notional = _float(order_data.get("notional"))
+        asset = self.universe.get(symbol) if self.universe is not None and symbol else None
+        if asset is not None:
+            if not asset.tradable:
+                return self._reject("not_tradable", UNPROCESSABLE, f"asset {symbol} is not tradable")
+            if notional is not None or (qty is not None and not qty.is_integer()):
+                if not asset.fractionable or self._configuration.get("fractional_trading") is False:
+                    return self._reject("not_fractionable", UNPROCESSABLE, f"asset {symbol} is not fractionable")
+
+        if side == "sell" and qty is not None:
+            available = self._positions.get(symbol, 0.0) - self._pending_sells.get(symbol, 0.0)
+            if qty > max(available, 0.0):
+                if self._configuration.get("no_shorting") or account.get("shorting_enabled") is False:
+                    return self._reject("no_shorting", FORBIDDEN, "account is not allowed to short")
+                if asset is not None and not (asset.shortable and asset.easy_to_borrow):
+                    return self._reject("not_shortable", UNPROCESSABLE, f"asset {symbol} cannot be sold short")
+        elif side == "buy":
+            cost = notional
+            if cost is None and qty is not None:
+                price = self._price(order_data)
+                cost = None if price is None else qty * price
+            marginable = asset is None or asset.marginable
+            if cost is not None and cost > self.available_buying_power(marginable):
+                return self._reject("buying_power", FORBIDDEN, "insufficient buying power")
+        return None
+
+    def _price(self, order_data: dict) -> float:
+        price = _float(order_data.get("limit_price")) or _float(order_data.get("stop_price"))
+        if price is None and self.price_of is not None:
+            price = self.price_of(order_data["symbol"])
+        return price
+
+    def record(self, order_data: dict, response_json: any) -> None:
+        """
+        Reserves buying power for an accepted buy and marks the shares of an accepted sell as pending.
+        Args:
+            order_data (dict): The order as sent.
+            response_json (any): What `create_order` returned; error bodies are ignored.
+        """
+        if error_from_body(response_json) is not None:
+            return
+        side = order_data.get("side")
+        qty = _float(order_data.get("qty"))
+        symbol = order_data.get("symbol")
+        with self._lock:
+            if side == "buy":
+                notional = _float(order_data.get("notional"))
+                price = self._price(order_data)
+                if qty is None and notional is not None and price:
+                    qty = notional / price
+                if qty is not None and price is not None:
+                    self._reserve(-qty * price, symbol)
+                    self._orders[order_data["client_order_id"]] = [symbol, side, qty, price]
+                elif notional is not None:
+                    # Without a price the fills cannot be matched to the reservation; the next refresh settles it.
+                    self._reserve(-notional, symbol)
+            elif side == "sell" and qty is not None:
+                self._pending_sells[symbol] = self._pending_sells.get(symbol, 0.0) + qty
+                self._orders[order_data["client_order_id"]] = [symbol, side, qty, None]
+
+    def _reserve(self, amount: float, symbol: str) -> None:
+        asset = self.universe.get(symbol) if self.universe is not None else None
+        if asset is None or asset.marginable:
+            self._buying_power += amount
+            self._daytrading_buying_power += amount
+        self._non_marginable_buying_power += amount
+
+    def apply_trade_update(self, update: TradeUpdate) -> None:
+        """
+        Keeps buying power and positions current between refreshes; feed it from `services.trade_stream`.
+        Args:
+            update (TradeUpdate): A trade_updates event.
+        """
+        order = update.order
+        with self._lock:
+            tracked = self._orders.get(order.client_order_id)
+            if update.event in ("fill", "partial_fill") and update.qty is not None and update.price is not None:
+                qty, price = float(update.qty), float(update.price)
+                if order.side == "buy":
+                    self._positions[order.symbol] = self._positions.get(order.symbol, 0.0) + qty
+                    # The reservation at the order price becomes a cost at the fill price. Untracked buys (open at
+                    # the last refresh, or notional buys reserved without a price) are already counted in the
+                    # buying power, so their fills must not be charged again.
+                    if tracked is not None:
+                        self._reserve(qty * (tracked[3] - price), order.symbol)
+                else:
+                    self._positions[order.symbol] = self._positions.get(order.symbol, 0.0) - qty
+                    self._reserve(qty * price, order.symbol)
+                    if tracked is not None:
+                        self._pending_sells[order.symbol] = self._pending_sells.get(order.symbol, 0.0) - qty
+                if tracked is not None:
+                    tracked[2] -= qty
+            if tracked is not None and (order.status in CLOSED_ORDER_STATUSES or tracked[2] <= 0):
+                self._release(order.client_order_id)
+
+    def _release(self, client_order_id: str) -> None:
+        symbol, side, remaining, price = self._orders.pop(client_order_id)
+        if remaining <= 0:
+            return
+        if side == "buy":
+            self._reserve(remaining * price, symbol)
+        else:
+            self._pending_sells[symbol] = self._pending_sells.get(symbol, 0.0) - remaining
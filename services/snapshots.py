@@ -0,0 +1,288 @@
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+from typing import Callable
+
+import httpx
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import snapshot_dir
+from core.errors import AlpacaAPIError
+from endpoints.option_contracts import iter_option_contracts
+from services.asset_universe import AssetUniverse, rows_bitmap
+
+MAGIC = b"APSN"
+FORMAT_VERSION = 1
+
+# magic, format version, column count, kind, fetched_at (epoch seconds), row count
+_HEADER = struct.Struct("<4sHH16sdI")
+# column name, column type, data offset, data length
+_COLUMN = struct.Struct("<32sB3xQQ")
+MAX_COLUMN_NAME = 32
+
+COLUMN_TEXT = 1
+COLUMN_FLOAT = 2
+COLUMN_BITMAP = 3
+
+ASSETS_KIND = "assets"
+OPTION_CONTRACTS_KIND = "option_contracts"
+
+OPTION_CONTRACT_TEXT_FIELDS = (
+    "id",
+    "symbol",
+    "name",
+    "status",
+    "root_symbol",
+    "underlying_symbol",
+    "underlying_asset_id",
+    "type",
+    "style",
+    "expiration_date",
+)
+OPTION_CONTRACT_FLOAT_FIELDS = ("strike_price", "multiplier", "size", "open_interest", "close_price")
+
+
+class SnapshotError(ValueError):
+    """
+    Raised when a file is not a snapshot, was written by an incompatible format version, or has the wrong kind, and
+    when a column name does not fit the column directory.
+    """
+
+
+def default_path(kind: str, paper_trading: bool) -> str:
+    """
+    Returns:
+        str: Where snapshots of `kind` live by default (`APCA_SNAPSHOT_DIR`, the temp dir unless configured).
+    """
+    return os.path.join(snapshot_dir, f"alpaca-{kind}-{'paper' if paper_trading else 'live'}.snapshot")
+
+
+def write_snapshot(path: str, kind: str, columns: dict[str, any], fetched_at: float) -> None:
+    """
+    Writes named columns to `path` atomically (temp file + rename), so readers never see a partial snapshot.
+    Args:
+        path (str): Destination file.
+        kind (str): What the snapshot holds, checked on load (e.g. 'assets').
+        columns (dict[str, any]): Column name to a list of str, an array/list of float, or an int bitmap.
+        fetched_at (float): Epoch seconds at which the data was fetched from the API.
+    """
+    row_count = 0
+    encoded = []
+    for name, column in columns.items():
+        if isinstance(column, int):
+            encoded.append((name, COLUMN_BITMAP, column.to_bytes((column.bit_length() + 7) // 8, "little")))
+        elif isinstance(column, array) or (column and isinstance(column[0], float)):
+            values = column if isinstance(column, array) else array("d", column)
+            encoded.append((name, COLUMN_FLOAT, values.tobytes()))
+            row_count = len(values)
+        else:
+            encoded.append((name, COLUMN_TEXT, "\0".join(column).encode()))
+            row_count = len(column)
+
+    offset = _HEADER.size + _COLUMN.size * len(encoded)
+    directory = []
+    for name, column_type, data in encoded:
+        if len(name.encode()) > MAX_COLUMN_NAME:
+            raise SnapshotError(f"column name {name!r} is longer than {MAX_COLUMN_NAME} bytes")
+        directory.append(_COLUMN.pack(name.encode(), column_type, offset, len(data)))
+        offset += len(data)
+
+    temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(encoded), kind.encode(), fetched_at, row_count))
+        file.writelines(directory)
+        file.writelines(data for _, _, data in encoded)
+    os.replace(temporary_path, path)
+
+
+class Snapshot:
+    """
+    Memory-mapped view of a snapshot file. Opening only parses the fixed-size header and column directory;
+    each column is decoded from the mapping the first time it is requested.
+    """
+
+    def __init__(self, path: str, kind: str = None) -> None:
+        with open(path, "rb") as file:
+            try:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as exc:
+                raise SnapshotError(f"{path} is empty") from exc
+        try:
+            magic, version, column_count, file_kind, self.fetched_at, self.row_count = _HEADER.unpack_from(self._map)
+        except struct.error as exc:
+            self.close()
+            raise SnapshotError(f"{path} is not a snapshot") from exc
+        self.kind = file_kind.rstrip(b"\0").decode()
+        if magic != MAGIC or version != FORMAT_VERSION or (kind is not None and self.kind != kind):
+            self.close()
+            raise SnapshotError(f"{path} is not a version {FORMAT_VERSION} '{kind}' snapshot")
+        self._directory: dict[str, tuple[int, int, int]] = {}
+        for index in range(column_count):
+            name, column_type, offset, length = _COLUMN.unpack_from(self._map, _HEADER.size + index * _COLUMN.size)
+            self._directory[name.rstrip(b"\0").decode()] = (column_type, offset, length)
+        self._decoded: dict[str, any] = {}
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._map.close()
+
+    @property
+    def age(self) -> float:
+        """
+        Returns:
+            float: Seconds since the data was fetched from the API.
+        """
+        return time.time() - self.fetched_at
+
+    @property
+    def column_names(self) -> list[str]:
+        return list(self._directory)
+
+    def column(self, name: str) -> any:
+        """
+        Returns:
+            any: A list of str for text columns, an array('d') for float columns, or an int bitmap.
+        """
+        if name not in self._decoded:
+            column_type, offset, length = self._directory[name]
+            data = self._map[offset : offset + length]
+            if column_type == COLUMN_BITMAP:
+                value = int.from_bytes(data, "little")
+            elif column_type == COLUMN_FLOAT:
+                value = array("d")
+                value.frombytes(data)
+            else:
+                value = data.decode().split("\0") if self.row_count else []
+            self._decoded[name] = value
+        return self._decoded[name]
+
+
+def save_asset_universe(universe: AssetUniverse, path: str) -> None:
+    """
+    Args:
+        universe (AssetUniverse): The universe to persist.
+        path (str): Destination file.
+    """
+    write_snapshot(path, ASSETS_KIND, universe.to_columns(), universe.fetched_at or time.time())
+
+
+def load_asset_universe(path: str) -> AssetUniverse:
+    """
+    Args:
+        path (str): A snapshot written by `save_asset_universe`.
+
+    Returns:
+        AssetUniverse: The universe, with `fetched_at` taken from the snapshot.
+    """
+    with Snapshot(path, ASSETS_KIND) as snapshot:
+        columns = {name: snapshot.column(name) for name in snapshot.column_names}
+        return AssetUniverse.from_columns(columns, snapshot.fetched_at)
+
+
+def open_asset_universe(paper_trading: bool, max_age: float = 86400.0, path: str = None) -> AssetUniverse:
+    """
+    Cold-start entry point: loads the asset snapshot if it is younger than `max_age`, otherwise (or if it is missing
+    or unreadable) downloads the universe and writes a new snapshot. A stale snapshot is returned as is when the
+    refresh fails with an HTTP or API error.
+    Args:
+        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+        max_age (float, optional): Oldest acceptable snapshot, in seconds. Defaults to one day.
+        path (str, optional): Snapshot file. Defaults to `default_path('assets', paper_trading)`.
+
+    Returns:
+        AssetUniverse: The universe.
+    """
+    path = path or default_path(ASSETS_KIND, paper_trading)
+    try:
+        universe = load_asset_universe(path)
+    except (OSError, SnapshotError):
+        universe = AssetUniverse.from_api(paper_trading)
+    else:
+        if time.time() - universe.fetched_at <= max_age:
+            return universe
+        try:
+            universe.refresh(paper_trading)
+        except (httpx.HTTPError, AlpacaAPIError):
+            # Keep serving the stale snapshot while the API is unreachable; the next call tries again.
+            return universe
+    save_asset_universe(universe, path)
+    return universe
+
+
+def save_option_contracts(contracts: list[dict[str, any]], path: str, fetched_at: float = None) -> None:
+    """
+    Args:
+        contracts (list[dict[str, any]]): Option contracts as returned by `get_option_contracts`.
+        path (str): Destination file.
+        fetched_at (float, optional): Epoch seconds at which the contracts were fetched. Defaults to now.
+    """
+    columns: dict[str, any] = {
+        field: [contract.get(field) or "" for contract in contracts] for field in OPTION_CONTRACT_TEXT_FIELDS
+    }
+    for field in OPTION_CONTRACT_FLOAT_FIELDS:
+        columns[field] = array("d", (float(contract.get(field) or "nan") for contract in contracts))
+    columns["tradable"] = rows_bitmap([row for row, contract in enumerate(contracts) if contract.get("tradable")])
+    write_snapshot(path, OPTION_CONTRACTS_KIND, columns, fetched_at or time.time())
+
+
+def load_option_contracts(path: str) -> Snapshot:
+    """
+    Args:
+        path (str): A snapshot written by `save_option_contracts`.
+
+    Returns:
+        Snapshot: The open snapshot; read fields with `column(name)` and close it when done.
+    """
+    return Snapshot(path, OPTION_CONTRACTS_KIND)
+
+
+def refresh_option_contracts(paper_trading: bool, path: str, **filters: any) -> int:
+    """
+    Pages through `get_option_contracts` and rewrites the option-contract snapshot.
+    Args:
+        paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+        path (str): Snapshot file.
+        **filters (any): Any filter accepted by `iter_option_contracts` (e.g. `underlying_symbols`).
+
+    Returns:
+        int: Number of contracts written.
+    """
+    fetched_at = time.time()
+    contracts = list(iter_option_contracts(paper_trading, limit=10000, **filters))
+    save_option_contracts(contracts, path, fetched_at)
+    return len(contracts)
+
+
+def start_background_refresh(refresh: Callable[[], any], interval: float) -> threading.Event:
+    """
+    Calls `refresh()` every `interval` seconds on a daemon thread, e.g.
+    `lambda: save_asset_universe(universe, path) if universe.refresh(True) else None`.
+    Args:
+        refresh (Callable[[], any]): Rebuilds and rewrites a snapshot. Exceptions are swallowed so one failed refresh
+            never stops the loop.
+        interval (float): Seconds between refreshes.
+
+    Returns:
+        threading.Event: Set it to stop the refresh loop.
+    """
+    stopped = threading.Event()
+
+    def loop() -> None:
+        while not stopped.wait(interval):
+            try:
+                refresh()
+            except Exception:
+                pass
+
+    threading.Thread(target=loop, daemon=True).start()
+    return stopped
@@ -0,0 +1,270 @@
+import asyncio
+import datetime
+import inspect
+import json
+import logging
+import os
+import sys
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Callable
+
+import httpx
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import (
+    headers,
+    live_trading_stream_url,
+    paper_trading_stream_url,
+    stream_reconnect_base_delay,
+    stream_reconnect_max_delay,
+)
+from core import codec
+from core.errors import AlpacaAPIError
+from core.models import CLOSED_ORDER_STATUSES, Order, TradeUpdate
+from core.retry import RetryPolicy
+from endpoints.orders import iter_all_orders_async
+
+try:
+    import websockets
+except ImportError:  # optional dependency, see requirements-optional.txt
+    websockets = None
+
+HANDSHAKE_TIMEOUT = 10.0
+# How many orders' last known status is remembered for deduplication and backfill.
+MAX_TRACKED_ORDERS = 10000
+
+# trade_updates event name for an order found in a given status while backfilling.
+_BACKFILL_EVENTS = {"filled": "fill", "partially_filled": "partial_fill"}
+_CLOSED = object()
+
+logger = logging.getLogger(__name__)
+
+
+class StreamError(Exception):
+    """
+    Raised when the stream rejects the credentials or the subscription; these are not retried.
+    """
+
+
+def _require_websockets() -> None:
+    if websockets is None:
+        raise ImportError("The trade-updates stream needs websockets: pip install websockets")
+
+
+def _iso(epoch_ns: int) -> str:
+    return datetime.datetime.fromtimestamp(epoch_ns / 1e9, datetime.timezone.utc).isoformat()
+
+
+class TradeUpdateStream:
+    """
+    Consumes Alpaca's trade_updates websocket stream, so order fills and cancels arrive as they happen instead of by
+    polling. Each event is decoded into a `TradeUpdate` carrying the order's status before and after, and delivered
+    to every callback registered with `on_update` and to every `async for update in stream` consumer.
+
+    Dropped connections are reopened with jittered exponential backoff. After a reconnect, orders that changed while
+    the stream was down are fetched with `get_all_orders(after=...)` and delivered as backfilled updates, and any
+    event already seen (same order, event, status, filled quantity, timestamp and execution id) is delivered only once.
+    A backfilled update is skipped when the stream already delivered the order in that status and filled quantity.
+    """
+
+    def __init__(
+        self,
+        paper_trading: bool,
+        url: str = None,
+        backfill: bool = True,
+        reconnect: RetryPolicy = RetryPolicy(
+            base_delay=stream_reconnect_base_delay, max_delay=stream_reconnect_max_delay
+        ),
+    ) -> None:
+        if url is None:
+            url = paper_trading_stream_url if paper_trading else live_trading_stream_url
+
+        self.paper_trading = paper_trading
+        self.url = url
+        self.backfill = backfill
+        self.reconnect = reconnect
+        self.connected = False
+        self.reconnects = 0
+        self.last_callback_error: Exception = None
+        self.last_error: Exception = None
+        self._callbacks: list[Callable[[TradeUpdate], any]] = []
+        self._queues: list[asyncio.Queue] = []
+        # order id -> (status, filled_qty, submitted_at, (event, timestamp, execution_id)), most recently updated last
+        self._orders: OrderedDict[str, tuple] = OrderedDict()
+        self._disconnected_at: int = None
+        self._closed = False
+        self._task: asyncio.Task = None
+        self._socket = None
+
+    def on_update(self, callback: Callable[[TradeUpdate], any]) -> Callable[[TradeUpdate], any]:
+        """
+        Registers a callback (a plain function or a coroutine function) for every update; usable as a decorator.
+        Exceptions raised by a callback are kept in `last_callback_error` and never stop the stream.
+        """
+        self._callbacks.append(callback)
+        return callback
+
+    def __aiter__(self) -> AsyncIterator[TradeUpdate]:
+        return self.updates()
+
+    async def updates(self, max_queued: int = 10000) -> AsyncIterator[TradeUpdate]:
+        """
+        Yields every update from now on, starting the stream in a background task if `run()` is not already running.
+        Args:
+            max_queued (int, optional): Updates buffered for a slow consumer before the stream waits for it.
+                Defaults to 10000.
+
+        Yields:
+            TradeUpdate: Each update, in arrival order, until `close()` is called.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self._queues.append(queue)
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+        try:
+            while (update := await queue.get()) is not _CLOSED:
+                yield update
+            if self._task is not None and self._task.done() and not self._task.cancelled() and self._task.exception():
+                raise self._task.exception()
+        finally:
+            self._queues.remove(queue)
+
+    async def run(self) -> None:
+        """
+        Connects, subscribes and dispatches updates until `close()` is called, reconnecting whenever the connection
+        drops. Raises `StreamError` if Alpaca rejects the credentials.
+        """
+        _require_websockets()
+        attempt = 0
+        try:
+            while not self._closed:
+                try:
+                    async with websockets.connect(self.url, open_timeout=HANDSHAKE_TIMEOUT) as socket:
+                        self._socket = socket
+                        await self._handshake(socket)
+                        # Until the backfill succeeds the gap still starts at the original disconnect.
+                        if self._disconnected_at is not None and self.backfill:
+                            await self._backfill(self._disconnected_at)
+                        attempt = 0
+                        self.connected = True
+                        async for message in socket:
+                            await self._handle_message(message)
+                except StreamError:
+                    raise
+                except (OSError, asyncio.TimeoutError, websockets.ConnectionClosed, websockets.InvalidHandshake):
+                    pass
+                except (AlpacaAPIError, httpx.HTTPError) as exc:
+                    # The backfill request failed; reconnecting retries it from the same disconnect time.
+                    self.last_error = exc
+                    logger.warning("Trade-updates backfill failed, reconnecting: %r", exc)
+                finally:
+                    self._socket = None
+                    if self.connected:
+                        self.connected = False
+                        self._disconnected_at = time.time_ns()
+                if self._closed:
+                    break
+                self.reconnects += 1
+                await asyncio.sleep(self.reconnect.backoff(attempt))
+                attempt += 1
+        finally:
+            self._end_updates()
+
+    async def close(self) -> None:
+        """
+        Stops the stream and ends every `updates()` iterator.
+        """
+        self._closed = True
+        if self._socket is not None:
+            await self._socket.close()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._end_updates()
+
+    def _end_updates(self) -> None:
+        for queue in self._queues:
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(_CLOSED)
+
+    async def _handshake(self, socket: any) -> None:
+        await socket.send(
+            json.dumps({"action": "auth", "key": headers["APCA-API-KEY-ID"], "secret": headers["APCA-API-SECRET-KEY"]})
+        )
+        reply = codec.loads(await asyncio.wait_for(socket.recv(), HANDSHAKE_TIMEOUT))
+        if reply.get("stream") != "authorization" or reply.get("data", {}).get("status") != "authorized":
+            raise StreamError(f"Trade-updates stream rejected the credentials: {reply}")
+        await socket.send(json.dumps({"action": "listen", "data": {"streams": ["trade_updates"]}}))
+        reply = codec.loads(await asyncio.wait_for(socket.recv(), HANDSHAKE_TIMEOUT))
+        if reply.get("stream") != "listening" or "trade_updates" not in reply.get("data", {}).get("streams", ()):
+            raise StreamError(f"Trade-updates stream rejected the subscription: {reply}")
+
+    async def _handle_message(self, message: str | bytes) -> None:
+        try:
+            body = codec.loads(message)
+            if body.get("stream") != "trade_updates":
+                return
+            update = TradeUpdate.from_dict(body["data"])
+        except (KeyError, TypeError, ValueError, AttributeError) as exc:
+            self.last_error = exc
+            logger.warning("Skipping malformed trade-updates message %r: %r", message, exc)
+            return
+        previous = self._track(update.order, (update.event, update.timestamp, update.execution_id))
+        if previous is _CLOSED:
+            return
+        await self._dispatch(update._replace(previous_status=previous))
+
+    def _track(self, order: Order, event: tuple = None) -> any:
+        """
+        Records the order's latest state.
+        Args:
+            order (Order): The order as carried by the update.
+            event (tuple, optional): (event, timestamp, execution_id) of a streamed update, or None for a backfilled
+                one. Only the status and filled quantity are compared when either side was backfilled. Defaults to None.
+
+        Returns:
+            any: The previous status, or `_CLOSED` if this exact update was already delivered.
+        """
+        known = self._orders.get(order.id)
+        state = (order.status, order.filled_qty, order.submitted_at)
+        if known is not None and known[:3] == state and (event is None or known[3] is None or known[3] == event):
+            return _CLOSED
+        self._orders[order.id] = (*state, event)
+        self._orders.move_to_end(order.id)
+        while len(self._orders) > MAX_TRACKED_ORDERS:
+            self._orders.popitem(last=False)
+        return None if known is None else known[0]
+
+    async def _backfill(self, disconnected_at: int) -> None:
+        # `after` filters on submission time, so start early enough to cover both the orders submitted during the
+        # gap and the ones that were still open when it began.
+        open_submitted = [state[2] for state in self._orders.values() if state[0] not in CLOSED_ORDER_STATUSES]
+        after = min([disconnected_at, *filter(None, open_submitted)])
+        async for order_json in iter_all_orders_async(
+            self.paper_trading, status="all", after=_iso(after - 1_000_000_000), direction="asc", prefetch=0
+        ):
+            order = Order.from_dict(order_json)
+            if order.updated_at is not None and order.updated_at < disconnected_at:
+                continue
+            previous = self._track(order)
+            if previous is _CLOSED:
+                continue
+            event = _BACKFILL_EVENTS.get(order.status, order.status)
+            await self._dispatch(TradeUpdate(event, order, order.updated_at, None, None, None, None, previous, True))
+
+    async def _dispatch(self, update: TradeUpdate) -> None:
+        for callback in self._callbacks:
+            try:
+                result = callback(update)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as exc:
+                self.last_callback_error = exc
+        for queue in self._queues:
+            await queue.put(update)
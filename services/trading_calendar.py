@@ -0,0 +1,271 @@
+import bisect
+import datetime
+import os
+import sys
+import threading
+import time
+from array import array
+from zoneinfo import ZoneInfo
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from config import clock_sync_interval
+from core.cache import response_cache
+from core.errors import error_from_body
+from core.models import epoch_ns
+from endpoints.calendar import get_market_calendar
+from endpoints.clock import get_market_clock
+
+MARKET_TIMEZONE = ZoneInfo("America/New_York")
+
+
+def _epoch(day: str, hhmm: str) -> int:
+    """
+    Args:
+        day (str): Trading day (YYYY-MM-DD).
+        hhmm (str): New York wall-clock time, 'HH:MM' or 'HHMM'.
+
+    Returns:
+        int: Epoch seconds.
+    """
+    hhmm = hhmm.replace(":", "")
+    moment = datetime.datetime.combine(
+        datetime.date.fromisoformat(day), datetime.time(int(hhmm[:2]), int(hhmm[2:4])), MARKET_TIMEZONE
+    )
+    return int(moment.timestamp())
+
+
+def _seconds(moment: float | datetime.datetime) -> float:
+    return moment.timestamp() if isinstance(moment, datetime.datetime) else moment
+
+
+class TradingCalendar:
+    """
+    Trading sessions for a range of days, fetched once from `get_market_calendar` and kept as sorted arrays of epoch
+    seconds (regular open/close and extended session open/close per day). Every question is a binary search over those
+    arrays, so checking whether the market is open costs no request.
+
+    Times are epoch seconds (`time.time()`) or aware datetimes; days are 'YYYY-MM-DD'. Asking about a moment outside
+    the loaded range raises ValueError rather than guessing.
+    """
+
+    def __init__(self, days: list[dict[str, any]], start: str = None, end: str = None) -> None:
+        """
+        Args:
+            days (list[dict[str, any]]): Trading days as returned by `get_market_calendar`.
+            start (str, optional): First day the calendar covers (YYYY-MM-DD). Defaults to the first trading day.
+            end (str, optional): Last day the calendar covers (YYYY-MM-DD). Defaults to the last trading day.
+        """
+        days = sorted(days, key=lambda day: day["date"])
+        self.start = start or (days[0]["date"] if days else None)
+        self.end = end or (days[-1]["date"] if days else None)
+        # Covered moments: from New York midnight of `start` to the end of `end`.
+        self._first = _epoch(self.start, "0000") if self.start else 0
+        self._last = _epoch(self.end, "2359") + 60 if self.end else 0
+        self.dates: list[str] = [day["date"] for day in days]
+        self.opens = array("q", (_epoch(day["date"], day["open"]) for day in days))
+        self.closes = array("q", (_epoch(day["date"], day["close"]) for day in days))
+        self.session_opens = array("q", (_epoch(day["date"], day.get("session_open") or day["open"]) for day in days))
+        self.session_closes = array(
+            "q", (_epoch(day["date"], day.get("session_close") or day["close"]) for day in days)
+        )
+
+    @classmethod
+    def from_api(cls, paper_trading: bool, start: str = None, end: str = None) -> "TradingCalendar":
+        """
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            start (str, optional): First day (YYYY-MM-DD). Defaults to one year ago.
+            end (str, optional): Last day (YYYY-MM-DD). Defaults to two years ahead.
+
+        Returns:
+            TradingCalendar: The sessions of the range, from a single request.
+        """
+        today = datetime.date.today()
+        start = start or (today - datetime.timedelta(days=366)).isoformat()
+        end = end or (today + datetime.timedelta(days=2 * 366)).isoformat()
+        response_json = get_market_calendar(paper_trading, start, end)
+        error = error_from_body(response_json)
+        if error is not None:
+            raise error
+        return cls(response_json, start, end)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def _check(self, moment: float) -> None:
+        if not self._first <= moment < self._last:
+            raise ValueError(f"{moment} is outside the loaded calendar ({self.start}..{self.end})")
+
+    def _opens_closes(self, extended: bool) -> tuple[array, array]:
+        return (self.session_opens, self.session_closes) if extended else (self.opens, self.closes)
+
+    def is_open(self, moment: float | datetime.datetime, extended: bool = False) -> bool:
+        """
+        Args:
+            moment (float | datetime.datetime): The moment to check.
+            extended (bool, optional): Count pre- and post-market sessions as open. Defaults to False.
+
+        Returns:
+            bool: Whether a session is in progress at `moment`.
+        """
+        moment = _seconds(moment)
+        self._check(moment)
+        opens, closes = self._opens_closes(extended)
+        index = bisect.bisect_right(opens, moment) - 1
+        return index >= 0 and moment < closes[index]
+
+    def next_open(self, moment: float | datetime.datetime, extended: bool = False) -> int:
+        """
+        Returns:
+            int: Epoch seconds of the first session open strictly after `moment`.
+        """
+        moment = _seconds(moment)
+        self._check(moment)
+        opens, _ = self._opens_closes(extended)
+        index = bisect.bisect_right(opens, moment)
+        if index == len(opens):
+            raise ValueError(f"no session opens after {moment} in the loaded calendar")
+        return opens[index]
+
+    def next_close(self, moment: float | datetime.datetime, extended: bool = False) -> int:
+        """
+        Returns:
+            int: Epoch seconds of the close of the session in progress at `moment`, or of the next session.
+        """
+        moment = _seconds(moment)
+        self._check(moment)
+        _, closes = self._opens_closes(extended)
+        index = bisect.bisect_right(closes, moment)
+        if index == len(closes):
+            raise ValueError(f"no session closes after {moment} in the loaded calendar")
+        return closes[index]
+
+    def is_trading_day(self, day: str) -> bool:
+        index = bisect.bisect_left(self.dates, day)
+        return index < len(self.dates) and self.dates[index] == day
+
+    def session(self, day: str, extended: bool = False) -> tuple[int, int]:
+        """
+        Returns:
+            tuple[int, int]: Epoch seconds of the open and close of `day`, or None if it is not a trading day.
+        """
+        index = bisect.bisect_left(self.dates, day)
+        if index == len(self.dates) or self.dates[index] != day:
+            return None
+        opens, closes = self._opens_closes(extended)
+        return opens[index], closes[index]
+
+    def trading_days(self, start: str, end: str) -> int:
+        """
+        Returns:
+            int: Number of trading days from `start` to `end`, both inclusive.
+        """
+        return max(0, bisect.bisect_right(self.dates, end) - bisect.bisect_left(self.dates, start))
+
+    def next_trading_day(self, day: str) -> str:
+        """
+        Returns:
+            str: The first trading day strictly after `day`, or None past the loaded range.
+        """
+        index = bisect.bisect_right(self.dates, day)
+        return self.dates[index] if index < len(self.dates) else None
+
+    def previous_trading_day(self, day: str) -> str:
+        """
+        Returns:
+            str: The last trading day strictly before `day`, or None before the loaded range.
+        """
+        index = bisect.bisect_left(self.dates, day)
+        return self.dates[index - 1] if index > 0 else None
+
+
+class MarketClock:
+    """
+    Local model of the market clock: answers "is the market open" and "when is the next open/close" from a
+    `TradingCalendar` and the local clock, calling `get_market_clock` only every `sync_interval` seconds to measure
+    the offset between the local clock and Alpaca's. When the server's answer disagrees with the calendar (an
+    unscheduled closure, say) the server wins until the transition it reports.
+
+    Safe to share between threads.
+    """
+
+    def __init__(
+        self, paper_trading: bool, calendar: TradingCalendar = None, sync_interval: float = clock_sync_interval
+    ) -> None:
+        """
+        Args:
+            paper_trading (bool): Whether to use paper trading endpoint (True) or live trading endpoint (False).
+            calendar (TradingCalendar, optional): Sessions to use. Defaults to `TradingCalendar.from_api`.
+            sync_interval (float, optional): Seconds between clock syncs. Defaults to `APCA_CLOCK_SYNC_INTERVAL`.
+        """
+        self.paper_trading = paper_trading
+        self.calendar = calendar or TradingCalendar.from_api(paper_trading)
+        self.sync_interval = sync_interval
+        # Server time minus local time, in seconds.
+        self.offset = 0.0
+        self._synced_at: float = None
+        # (epoch seconds until which it applies, is_open) when the server contradicted the calendar
+        self._override: tuple[float, bool] = None
+        self._lock = threading.Lock()
+
+    def sync(self) -> float:
+        """
+        Calls `get_market_clock` and re-estimates the offset, assuming the server stamped its reply halfway through
+        the round trip.
+
+        Returns:
+            float: The new offset in seconds (server minus local).
+        """
+        response_cache.invalidate("get_market_clock")  # a cached reply would carry an old timestamp
+        sent = time.time()
+        response_json = get_market_clock(self.paper_trading)
+        received = time.time()
+        error = error_from_body(response_json)
+        if error is not None:
+            raise error
+        offset = epoch_ns(response_json["timestamp"]) / 1e9 - (sent + received) / 2
+        now = received + offset
+        override = None
+        if bool(response_json["is_open"]) != self.calendar.is_open(now):
+            until = response_json["next_close" if response_json["is_open"] else "next_open"]
+            override = (epoch_ns(until) / 1e9, bool(response_json["is_open"]))
+        with self._lock:
+            self.offset = offset
+            self._override = override
+            self._synced_at = time.monotonic()
+        return offset
+
+    def _maybe_sync(self) -> None:
+        synced_at = self._synced_at
+        if synced_at is None or time.monotonic() - synced_at >= self.sync_interval:
+            self.sync()
+
+    def now(self) -> float:
+        """
+        Returns:
+            float: Current Alpaca server time estimate, in epoch seconds.
+        """
+        self._maybe_sync()
+        return time.time() + self.offset
+
+    def is_open(self, extended: bool = False) -> bool:
+        now = self.now()
+        override = self._override
+        if override is not None and not extended and now < override[0]:
+            return override[1]
+        return self.calendar.is_open(now, extended)
+
+    def next_open(self, extended: bool = False) -> int:
+        now = self.now()
+        override = self._override
+        if override is not None and not extended and now < override[0] and not override[1]:
+            return int(override[0])
+        return self.calendar.next_open(now, extended)
+
+    def next_close(self, extended: bool = False) -> int:
+        now = self.now()
+        override = self._override
+        if override is not None and not extended and now < override[0] and override[1]:
+            return int(override[0])
+        return self.calendar.next_close(now, extended)
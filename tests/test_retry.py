@@ -0,0 +1,51 @@
+import os
+import sys
+
+import httpx
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core import http_client, rate_limiter, retry
+from endpoints.orders import get_order_by_id
+from endpoints.positions import close_all_positions, close_position
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """
+    Routes every call through a mock transport that times out once and then answers 200; yields the sent requests.
+    """
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if len(requests) == 1:
+            raise httpx.ReadTimeout("timed out", request=request)
+        return httpx.Response(200, json={"id": "order", "symbol": "AAPL"})
+
+    monkeypatch.setattr(rate_limiter, "rate_limit_enabled", False)
+    monkeypatch.setattr(retry, "DEFAULT_POLICY", retry.RetryPolicy(base_delay=0.0, max_delay=0.0))
+    monkeypatch.setattr(retry, "_budgets", {})
+    http_client.set_client(httpx.Client(transport=httpx.MockTransport(handler)))
+    yield requests
+    http_client.set_client(None)
+
+
+def test_timed_out_close_position_is_sent_once(sent):
+    with pytest.raises(httpx.ReadTimeout):
+        close_position(True, "AAPL", qty=10)
+    assert [(request.method, request.url.path, request.url.query) for request in sent] == [
+        ("DELETE", "/v2/positions/AAPL", b"qty=10")
+    ]
+
+
+def test_timed_out_close_all_positions_is_sent_once(sent):
+    with pytest.raises(httpx.ReadTimeout):
+        close_all_positions(True)
+    assert len(sent) == 1
+
+
+def test_timed_out_read_is_replayed(sent):
+    assert get_order_by_id(True, "order")["id"] == "order"
+    assert len(sent) == 2